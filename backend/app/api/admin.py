@@ -0,0 +1,49 @@
+from __future__ import annotations
+import os
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from app.models.user import User
+from app.schemas.admin import ProfileArmRequest, SlowThresholdUpdate, ProfilingState, ProfileInfo
+from app.utils.profiler import control, store
+from app.api.deps import get_admin_user
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/profiling", response_model=ProfilingState)
+def get_profiling(_: User = Depends(get_admin_user)):
+    return control.state()
+
+
+@router.post("/profiling/arm", response_model=ProfilingState)
+def arm_profiling(request: ProfileArmRequest, _: User = Depends(get_admin_user)):
+    """Profile the next `count` requests to `path`. Captures include concurrent requests' work; see `scope`."""
+    control.arm(request.path, request.count, request.mode)
+    return control.state()
+
+
+@router.put("/profiling/slow-threshold", response_model=ProfilingState)
+def set_slow_threshold(update: SlowThresholdUpdate, _: User = Depends(get_admin_user)):
+    control.slow_request_ms = update.slow_request_ms
+    return control.state()
+
+
+@router.get("/profiles", response_model=list[ProfileInfo])
+def list_profiles(_: User = Depends(get_admin_user)):
+    return store.list()
+
+
+@router.get("/profiles/{name}")
+def download_profile(name: str, _: User = Depends(get_admin_user)):
+    path = store.path_for(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
+
+@router.delete("/profiles/{name}", status_code=204)
+def delete_profile(name: str, _: User = Depends(get_admin_user)):
+    path = store.path_for(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    os.remove(path)
@@ -1,25 +1,62 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_async_read_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, TokenResponse, UserResponse
-from app.utils.security import verify_password, create_access_token
-from app.api.deps import get_current_user
+from app.utils.security import HashingBusyError, verify_password_async, create_access_token
+from app.utils.throttle import login_throttle
+from app.utils.token_cache import token_cache
+from app.utils.cache_versions import cache_versions
+from app.services.write_coordinator import write_coordinator
+from app.api.deps import get_current_user, get_token
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.username == request.username).first()
-    if not user or not verify_password(request.password, user.password_hash):
+async def login(
+    request: LoginRequest,
+    response: Response,
+    client_request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    client = client_request.client.host if client_request.client else "unknown"
+    retry_after = login_throttle.retry_after(client, request.username)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    user = await db.scalar(select(User).where(User.username == request.username))
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_password_async(request.password, user.password_hash)
+        except HashingBusyError:
+            raise HTTPException(status_code=503, detail="Login is busy, try again shortly", headers={"Retry-After": "1"})
+    if not valid:
+        login_throttle.record_failure(client, request.username)
         raise HTTPException(status_code=401, detail="Incorrect username or password")
+    login_throttle.reset(client, request.username)
 
     token = create_access_token(user.id)
 
-    user.last_login = datetime.now(timezone.utc)
-    db.commit()
+    user_id = user.id
+
+    def record_login(session: Session):
+        u = session.get(User, user_id)
+        if new_hash:
+            u.password_hash = new_hash
+        u.last_login = datetime.now(timezone.utc)
+        # Every worker drops its cached copy of the user, not just this one
+        cache_versions.bump(session, "auth")
+
+    await write_coordinator.run(record_login)
 
     response.set_cookie(
         key="access_token",
@@ -35,7 +72,11 @@ def login(request: LoginRequest, response: Response, db: Session = Depends(get_d
 
 
 @router.post("/logout")
-def logout(response: Response):
+async def logout(request: Request, response: Response):
+    token = get_token(request)
+    if token:
+        token_cache.invalidate_token(token)
+        await write_coordinator.run(lambda session: cache_versions.bump(session, "auth"))
     response.delete_cookie("access_token")
     return {"message": "Logged out"}
 
@@ -43,3 +84,8 @@ def logout(response: Response):
 @router.get("/me", response_model=UserResponse)
 def get_me(current_user: User = Depends(get_current_user)):
     return UserResponse(id=current_user.id, username=current_user.username)
+
+
+@router.get("/cache-stats")
+def cache_stats(_: User = Depends(get_current_user)):
+    return token_cache.stats()
@@ -1,79 +1,89 @@
 from __future__ import annotations
 from datetime import date
 from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from dateutil.relativedelta import relativedelta
-from app.database import get_db
-from app.models.transaction import Transaction
-from app.models.loan import Loan
-from app.models.plan import PlanPhase, BudgetTarget, FinancialPlan
+from app.models.transaction import Transaction, TransactionSource
+from app.models.loan import Loan, LoanPayment
+from app.models.plan import BudgetTarget
 from app.models.user import User
-from app.schemas.plan import DashboardResponse
-from app.utils.date_utils import get_current_plan_week, get_phase_for_week
-from app.api.deps import get_current_user
+from app.schemas.plan import DashboardResponse, SpendingTrendPoint, AccountBalance
+from app.services.ledger import LedgerService
+from app.services.periods import spending_by
+from app.services.plan_calendar import PlanCalendar, yyyymm
+from app.api.deps import get_current_user, get_household_read_db, get_plan_calendar
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 
-@router.get("", response_model=DashboardResponse)
-def get_dashboard(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    current_week = get_current_plan_week()
-    phase_num = get_phase_for_week(max(current_week, 1))
+# Monthly spending target in cents when the current phase has no budget targets
+DEFAULT_MONTH_TARGET = 1_300_000
+
 
-    plan = db.query(FinancialPlan).filter(FinancialPlan.is_active == True).first()
-    phase = None
-    if plan:
-        phase = db.query(PlanPhase).filter(
-            PlanPhase.plan_id == plan.id, PlanPhase.phase_number == phase_num
-        ).first()
+def _account_balances(db: Session, on: date) -> list[AccountBalance]:
+    sources = db.query(TransactionSource).filter(TransactionSource.active == True).all()
+    balances = LedgerService(db).balances_on(sources, on)
+    return [
+        AccountBalance(source_id=s.id, name=s.name, type=s.type, balance=balances[s.id])
+        for s in sources
+    ]
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+    calendar: PlanCalendar = Depends(get_plan_calendar),
+):
+    current_week = calendar.current_week()
+    phase_num = calendar.phase_for_week(current_week)
 
     # Debt totals
-    active_loans = db.query(Loan).filter(Loan.is_active == True).all()
+    active_loans = (await db.scalars(select(Loan).where(Loan.is_active == True))).all()
     total_debt = sum(l.current_balance for l in active_loans)
     non_mortgage = sum(l.current_balance for l in active_loans if l.loan_type != "mortgage")
 
-    # This month spending
+    # Spending for the last six months in one grouped query; the current month is the last
     today = date.today()
     month_start = today.replace(day=1)
-    month_spent = db.query(func.sum(Transaction.amount)).filter(
-        Transaction.transaction_date >= month_start,
-        Transaction.is_debit == True,
-        Transaction.is_excluded == False,
-    ).scalar() or 0
+    months = [month_start - relativedelta(months=i) for i in range(5, -1, -1)]
+    spent_by_month = dict((await db.execute(
+        spending_by(Transaction.yyyymm, Transaction.yyyymm.between(yyyymm(months[0]), yyyymm(today)))
+    )).all())
+    month_spent = spent_by_month.get(yyyymm(today), 0)
+
+    debt_paid = await db.scalar(select(func.sum(LoanPayment.principal_amount)).where(
+        LoanPayment.is_projected == False,
+        LoanPayment.payment_date >= month_start,
+    )) or 0
+
+    # Account balances from the running-balance ledger
+    account_balances = await db.run_sync(_account_balances, today)
+    emergency_fund = sum(a.balance for a in account_balances if a.type == "savings")
 
     # Budget target for current phase
-    budget_targets = db.query(BudgetTarget).filter(BudgetTarget.phase_number == phase_num).all()
-    month_target = sum(bt.monthly_target for bt in budget_targets) if budget_targets else 13000
+    budget_targets = (await db.scalars(select(BudgetTarget).where(BudgetTarget.phase_number == phase_num))).all()
+    month_target = sum(bt.monthly_target for bt in budget_targets) if budget_targets else DEFAULT_MONTH_TARGET
 
-    # Spending trend (last 6 months)
-    trend = []
-    for i in range(5, -1, -1):
-        m_start = (today - relativedelta(months=i)).replace(day=1)
-        m_end = (m_start + relativedelta(months=1)) - relativedelta(days=1)
-        spent = db.query(func.sum(Transaction.amount)).filter(
-            Transaction.transaction_date >= m_start,
-            Transaction.transaction_date <= m_end,
-            Transaction.is_debit == True,
-            Transaction.is_excluded == False,
-        ).scalar() or 0
-        trend.append({
-            "month": m_start.strftime("%b %Y"),
-            "spent": round(float(spent), 2),
-            "target": month_target,
-        })
+    trend = [
+        SpendingTrendPoint(month=m.strftime("%b %Y"), spent=spent_by_month.get(yyyymm(m), 0), target=month_target)
+        for m in months
+    ]
 
     return DashboardResponse(
         current_week=current_week,
         current_phase=phase_num,
-        current_phase_name=phase.name if phase else f"Phase {phase_num}",
-        progress_pct=round((current_week / 252) * 100, 1),
-        total_debt=round(total_debt, 2),
-        non_mortgage_debt=round(non_mortgage, 2),
-        month_spent=round(float(month_spent), 2),
+        current_phase_name=calendar.phase_names.get(phase_num, f"Phase {phase_num}"),
+        progress_pct=calendar.progress_pct(current_week),
+        total_debt=total_debt,
+        non_mortgage_debt=non_mortgage,
+        month_spent=month_spent,
         month_budget_target=month_target,
-        month_variance=round(month_target - float(month_spent), 2),
-        emergency_fund=0,  # Updated manually or via milestone
-        debt_paid_this_month=0,  # Calculated from loan payments
+        month_variance=month_target - month_spent,
+        emergency_fund=emergency_fund,
+        debt_paid_this_month=debt_paid,
         spending_trend=trend,
+        account_balances=account_balances,
     )
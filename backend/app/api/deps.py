@@ -1,26 +1,111 @@
 from fastapi import Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_async_read_db
+from app.services.households import Household, household_key, households, shared_household
+from app.services.plan_calendar import PlanCalendar, plan_calendars
 from app.utils.security import decode_access_token
+from app.utils.token_cache import token_cache
+from app.utils.cache_versions import cache_versions
 from app.models.user import User
+from app.config import get_settings
 
 
-def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+def get_token(request: Request) -> str | None:
     token = request.cookies.get("access_token")
+    # Strip "Bearer " prefix if present
+    if token and token.startswith("Bearer "):
+        token = token[7:]
+    return token
+
+
+async def get_current_user(request: Request, db: AsyncSession = Depends(get_async_read_db)) -> User:
+    token = get_token(request)
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    # Strip "Bearer " prefix if present
-    if token.startswith("Bearer "):
-        token = token[7:]
+    await cache_versions.refresh(db)
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
 
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
     user_id = int(payload.get("sub"))
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
 
+    # Detach so the cached instance outlives this request's session
+    db.expunge(user)
+    token_cache.put(token, user, payload["exp"])
     return user
+
+
+async def get_household(current_user: User = Depends(get_current_user)):
+    """The database holding the current user's data, leased from the pool for this request."""
+    if households is None:
+        yield shared_household
+        return
+    household = households.acquire(household_key(current_user))
+    try:
+        if not household.migrated:
+            await run_in_threadpool(households.ensure_migrated, household)
+        yield household
+    finally:
+        for cold in households.release(household):
+            await cold.close()
+
+
+async def get_household_read_db(
+    household: Household = Depends(get_household),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    # In single tenancy the user lookup's session already reads the right database
+    if household is shared_household:
+        yield db
+        return
+    async with household.AsyncReadSessionLocal() as household_db:
+        yield household_db
+
+
+async def get_household_db(household: Household = Depends(get_household)):
+    async with household.AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_household_sync_db(household: Household = Depends(get_household)):
+    db: Session = household.SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_household_sync_read_db(household: Household = Depends(get_household)):
+    db: Session = household.ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_plan_calendar(
+    household: Household = Depends(get_household),
+    db: AsyncSession = Depends(get_household_read_db),
+) -> PlanCalendar:
+    # get_household depends on get_current_user, which refreshed the shared database's cache versions;
+    # a household database keeps its own
+    if household is not shared_household:
+        await cache_versions.refresh(db, scope=household.key)
+    return plan_calendars.cached(household.database) or await db.run_sync(plan_calendars.get)
+
+
+async def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.username != get_settings().ADMIN_USERNAME:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -3,13 +3,14 @@ import os
 import uuid
 import hashlib
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
 from app.models.transaction import ImportBatch
 from app.models.user import User
 from app.services.import_service import ImportService
+from app.services.plan_calendar import PlanCalendar
 from app.schemas.transaction import ImportResponse
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_household_sync_db, get_household_sync_read_db, get_plan_calendar
 from app.config import get_settings
 
 router = APIRouter(prefix="/api/imports", tags=["imports"])
@@ -19,7 +20,8 @@ settings = get_settings()
 @router.post("/upload", response_model=ImportResponse)
 async def upload_csv(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_household_sync_db),
+    calendar: PlanCalendar = Depends(get_plan_calendar),
     _: User = Depends(get_current_user),
 ):
     if not file.filename.endswith((".csv", ".CSV")):
@@ -41,8 +43,9 @@ async def upload_csv(
         raise HTTPException(status_code=409, detail=f"This file was already imported on {existing.imported_at}")
 
     try:
-        service = ImportService(db)
-        result = service.import_csv(file_path, file_hash, file.filename)
+        service = ImportService(db, calendar)
+        # Parsing and inserting are blocking; keep them off the event loop
+        result = await run_in_threadpool(service.import_csv, file_path, file_hash, file.filename)
         return result
     except ValueError as e:
         os.remove(file_path)
@@ -53,8 +56,8 @@ async def upload_csv(
 
 
 @router.get("/history")
-def import_history(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    batches = db.query(ImportBatch).order_by(ImportBatch.imported_at.desc()).limit(50).all()
+def import_history(db: Session = Depends(get_household_sync_read_db), _: User = Depends(get_current_user)):
+    batches = db.query(ImportBatch).options(joinedload(ImportBatch.source)).order_by(ImportBatch.imported_at.desc()).limit(50).all()
     return [
         {
             "batch_id": b.batch_id,
@@ -1,126 +1,313 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, or_, select
 from datetime import date
 from dateutil.relativedelta import relativedelta
-from app.database import get_db
-from app.models.loan import Loan
+import numpy as np
+from app.models.loan import Loan, LoanPayment
 from app.models.user import User
-from app.schemas.loan import LoanResponse, LoanCreate, LoanUpdate, LoanPayoffProjection
-from app.api.deps import get_current_user
+from app.schemas.loan import (
+    LoanResponse, LoanCreate, LoanUpdate, LoanSummary, LoanPayoffProjection, LoanSchedule, LoanScheduleRow,
+    LoanPayoffDate, PayoffStrategyResult, PayoffStrategyComparison, ScenarioSweepResponse,
+    LoanPaymentCreate, LoanPaymentResponse, PaymentTimelineMonth,
+)
+from app.services.amortization import MAX_MONTHS, project_loans, amortization_schedule
+from app.services.payoff_strategy import STRATEGIES, compare_strategies
+from app.services.scenario_sweep import sweep
+from app.services.loan_projection import regenerate_projection, record_payment
+from app.services.households import Household
+from app.services.write_coordinator import write_coordinator
+from app.utils.money import MAX_DOLLARS, to_cents
+from app.api.deps import get_current_user, get_household, get_household_db, get_household_read_db
 
 router = APIRouter(prefix="/api/loans", tags=["loans"])
 
 
 @router.post("", response_model=LoanResponse, status_code=201)
-def create_loan(
+async def create_loan(
     data: LoanCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_household_db),
     _: User = Depends(get_current_user),
 ):
     loan = Loan(**data.model_dump(), is_active=True)
     db.add(loan)
-    db.commit()
-    db.refresh(loan)
+    await db.flush()
+    await db.run_sync(regenerate_projection, loan)
+    await db.commit()
+    await db.refresh(loan)
     return loan
 
 
 @router.get("", response_model=list[LoanResponse])
-def list_loans(
+async def list_loans(
     active_only: bool = True,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_household_read_db),
     _: User = Depends(get_current_user),
 ):
-    query = db.query(Loan)
+    query = select(Loan)
     if active_only:
-        query = query.filter(Loan.is_active == True)
-    return query.order_by(Loan.priority_rank.asc().nullslast()).all()
+        query = query.where(Loan.is_active == True)
+    return (await db.scalars(query.order_by(Loan.priority_rank.asc().nullslast()))).all()
 
 
-@router.get("/summary")
-def loan_summary(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    loans = db.query(Loan).filter(Loan.is_active == True).all()
+@router.get("/summary", response_model=LoanSummary)
+async def loan_summary(db: AsyncSession = Depends(get_household_read_db), _: User = Depends(get_current_user)):
+    loans = (await db.scalars(select(Loan).where(Loan.is_active == True))).all()
     total = sum(l.current_balance for l in loans)
     mortgage = sum(l.current_balance for l in loans if l.loan_type == "mortgage")
-    non_mortgage = total - mortgage
-    monthly_payments = sum(l.monthly_payment or 0 for l in loans)
-    return {
-        "total_debt": round(total, 2),
-        "mortgage_debt": round(mortgage, 2),
-        "non_mortgage_debt": round(non_mortgage, 2),
-        "monthly_payments": round(monthly_payments, 2),
-        "active_loans": len(loans),
-    }
+    return LoanSummary(
+        total_debt=total,
+        mortgage_debt=mortgage,
+        non_mortgage_debt=total - mortgage,
+        monthly_payments=sum(l.monthly_payment or 0 for l in loans),
+        active_loans=len(loans),
+    )
 
 
 @router.get("/projections", response_model=list[LoanPayoffProjection])
-def payoff_projections(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    loans = db.query(Loan).filter(Loan.is_active == True).all()
-    projections = []
-    for loan in loans:
-        balance = loan.current_balance
-        payment = loan.monthly_payment or 0
-        rate = loan.interest_rate or 0
-        monthly_rate = rate / 12
+async def payoff_projections(db: AsyncSession = Depends(get_household_read_db), _: User = Depends(get_current_user)):
+    loans = (await db.scalars(select(Loan).where(Loan.is_active == True))).all()
+    if not loans:
+        return []
+
+    balances = [l.current_balance for l in loans]
+    rates = [l.interest_rate or 0 for l in loans]
+    payments = [l.monthly_payment or 0 for l in loans]
+    months, interest = project_loans(balances, rates, payments)
 
+    today = date.today()
+    projections = []
+    for loan, balance, rate, payment, n, total_interest in zip(loans, balances, rates, payments, months, interest):
         if payment <= 0:
-            projections.append(LoanPayoffProjection(
-                loan_id=loan.id, loan_name=loan.name, current_balance=balance,
-                monthly_payment=payment, interest_rate=rate,
-                projected_payoff_date=None, total_interest_remaining=0, months_remaining=0,
-            ))
-            continue
-
-        months = 0
-        total_interest = 0.0
-        remaining = balance
-        while remaining > 0 and months < 600:
-            interest = remaining * monthly_rate
-            total_interest += interest
-            principal = payment - interest
-            if principal <= 0:
-                break
-            remaining -= principal
-            months += 1
-
-        payoff_date = date.today() + relativedelta(months=months) if months < 600 else None
+            n = 0
+        paid_off = 0 < n < MAX_MONTHS
         projections.append(LoanPayoffProjection(
             loan_id=loan.id, loan_name=loan.name, current_balance=balance,
             monthly_payment=payment, interest_rate=rate,
-            projected_payoff_date=payoff_date,
-            total_interest_remaining=round(total_interest, 2),
-            months_remaining=months,
+            projected_payoff_date=today + relativedelta(months=int(n)) if paid_off else None,
+            total_interest_remaining=total_interest,
+            months_remaining=int(n),
         ))
     return projections
 
 
-@router.patch("/{loan_id}", response_model=LoanResponse)
-def update_loan(
+@router.get("/strategies", response_model=PayoffStrategyComparison)
+async def payoff_strategies(
+    extra_payment: float = Query(0, ge=0, le=MAX_DOLLARS),
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+):
+    extra_payment = to_cents(extra_payment)
+    loans = (await db.scalars(select(Loan).where(Loan.is_active == True).order_by(Loan.id))).all()
+    if not loans:
+        return PayoffStrategyComparison(extra_payment=extra_payment, strategies=[])
+
+    result = compare_strategies(loans, extra_payment)
+    today = date.today()
+
+    def month_date(month: int):
+        return today + relativedelta(months=month) if month >= 0 else None
+
+    strategies = []
+    for i, name in enumerate(STRATEGIES):
+        debt_free = int(result["debt_free_month"][i])
+        series = result["balance_series"][i]
+        if debt_free >= 0:
+            series = series[:debt_free]
+        payoffs = [
+            LoanPayoffDate(
+                loan_id=loan.id, loan_name=loan.name,
+                payoff_date=month_date(int(m)), months=int(m) if m >= 0 else None,
+            )
+            for loan, m in zip(loans, result["loan_payoff_month"][i])
+        ]
+        payoffs.sort(key=lambda p: p.months if p.months is not None else MAX_MONTHS + 1)
+        strategies.append(PayoffStrategyResult(
+            strategy=name,
+            debt_free_date=month_date(debt_free),
+            months_to_debt_free=debt_free if debt_free >= 0 else None,
+            total_interest=result["total_interest"][i],
+            loan_payoffs=payoffs,
+            balance_series=series.tolist(),
+        ))
+    return PayoffStrategyComparison(extra_payment=extra_payment, strategies=strategies)
+
+
+@router.get("/sweep", response_model=ScenarioSweepResponse)
+async def scenario_sweep(
+    extra_min: float = Query(0, ge=0, le=MAX_DOLLARS),
+    extra_max: float = Query(2000, ge=0, le=MAX_DOLLARS),
+    extra_steps: int = Query(21, ge=1, le=200),
+    rate_min: float = Query(0, ge=0),
+    rate_max: float = Query(0.15, ge=0),
+    rate_steps: int = Query(16, ge=1, le=100),
+    loan_ids: list[int] | None = Query(None),
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+):
+    if extra_max < extra_min or rate_max < rate_min:
+        raise HTTPException(status_code=400, detail="Range maximum must not be below its minimum")
+
+    extras = np.linspace(to_cents(extra_min), to_cents(extra_max), extra_steps).round()
+    rates = np.linspace(rate_min, rate_max, rate_steps)
+    loans = (await db.scalars(select(Loan).where(Loan.is_active == True).order_by(Loan.id))).all()
+    if not loans:
+        return ScenarioSweepResponse(
+            extra_payments=extras.tolist(), refinance_rates=rates.round(6).tolist(),
+            payoff_months=[[0] * rate_steps for _ in extras],
+            total_interest=[[0] * rate_steps for _ in extras],
+        )
+
+    # CPU-bound; keep it off the event loop
+    surface = await run_in_threadpool(sweep, loans, extras, rates, set(loan_ids) if loan_ids else None)
+    unreachable = surface["payoff_months"] < 0
+    return ScenarioSweepResponse(
+        extra_payments=extras.tolist(),
+        refinance_rates=rates.round(6).tolist(),
+        payoff_months=np.where(unreachable, None, surface["payoff_months"]).tolist(),
+        total_interest=np.where(unreachable, None, surface["total_interest"]).tolist(),
+    )
+
+
+@router.get("/timeline", response_model=list[PaymentTimelineMonth])
+async def payment_timeline(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+):
+    # Projected rows dated before today belong to a schedule nothing has refreshed since
+    date_from = max(date_from or date.today(), date.today())
+    date_to = date_to or date_from + relativedelta(years=5)
+    month = func.strftime("%Y-%m", LoanPayment.payment_date)
+    rows = (await db.execute(
+        select(
+            month,
+            func.sum(LoanPayment.amount),
+            func.sum(LoanPayment.principal_amount),
+            func.sum(LoanPayment.interest_amount),
+            func.count(LoanPayment.id),
+        )
+        .where(
+            LoanPayment.is_projected == True,
+            LoanPayment.payment_date >= date_from,
+            LoanPayment.payment_date <= date_to,
+        )
+        .group_by(month)
+        .order_by(month)
+    )).all()
+    return [
+        PaymentTimelineMonth(
+            month=m, amount=amount or 0, principal=principal or 0,
+            interest=interest or 0, payments=count,
+        )
+        for m, amount, principal, interest, count in rows
+    ]
+
+
+@router.get("/{loan_id}/schedule", response_model=LoanSchedule)
+async def loan_schedule(loan_id: int, db: AsyncSession = Depends(get_household_read_db), _: User = Depends(get_current_user)):
+    loan = await db.get(Loan, loan_id)
+    if not loan:
+        raise HTTPException(status_code=404, detail="Loan not found")
+
+    rate = loan.interest_rate or 0
+    payment = loan.monthly_payment or 0
+    schedule = amortization_schedule(loan.current_balance, rate, payment)
+    today = date.today()
+    rows = [
+        LoanScheduleRow(
+            month=int(m),
+            payment_date=today + relativedelta(months=int(m)),
+            payment=p,
+            principal=pr,
+            interest=i,
+            balance=b,
+        )
+        for m, p, pr, i, b in zip(
+            schedule["month"], schedule["payment"], schedule["principal"],
+            schedule["interest"], schedule["balance"],
+        )
+    ]
+    return LoanSchedule(
+        loan_id=loan.id, loan_name=loan.name, current_balance=loan.current_balance,
+        monthly_payment=payment, interest_rate=rate,
+        months_remaining=len(rows),
+        total_interest_remaining=schedule["interest"].sum(),
+        schedule=rows,
+    )
+
+
+@router.get("/{loan_id}/payments", response_model=list[LoanPaymentResponse])
+async def list_loan_payments(
     loan_id: int,
-    update: LoanUpdate,
-    db: Session = Depends(get_db),
+    include_projected: bool = False,
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+):
+    query = select(LoanPayment).where(LoanPayment.loan_id == loan_id)
+    if include_projected:
+        # Past-dated projected rows are left over from a schedule generated before then
+        query = query.where(or_(LoanPayment.is_projected == False, LoanPayment.payment_date >= date.today()))
+    else:
+        query = query.where(LoanPayment.is_projected == False)
+    return (await db.scalars(query.order_by(LoanPayment.payment_date))).all()
+
+
+@router.post("/{loan_id}/payments", response_model=LoanPaymentResponse, status_code=201)
+async def create_loan_payment(
+    loan_id: int,
+    data: LoanPaymentCreate,
+    db: AsyncSession = Depends(get_household_db),
     _: User = Depends(get_current_user),
 ):
-    loan = db.query(Loan).filter(Loan.id == loan_id).first()
+    loan = await db.get(Loan, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
 
-    for field, value in update.model_dump(exclude_unset=True).items():
-        setattr(loan, field, value)
+    payment = await db.run_sync(record_payment, loan, data.amount, data.payment_date)
+    await db.commit()
+    await db.refresh(payment)
+    return payment
+
+
+@router.patch("/{loan_id}", response_model=LoanResponse)
+async def update_loan(
+    loan_id: int,
+    update: LoanUpdate,
+    household: Household = Depends(get_household),
+):
+    def apply(db: Session) -> LoanResponse | None:
+        loan = db.get(Loan, loan_id)
+        if not loan:
+            return None
+        fields = update.model_dump(exclude_unset=True)
+        for field, value in fields.items():
+            setattr(loan, field, value)
+        if "current_balance" in fields:
+            loan.balance_date = date.today()
+        regenerate_projection(db, loan)
+        db.flush()
+        return LoanResponse.model_validate(loan)
 
-    db.commit()
-    db.refresh(loan)
+    loan = await write_coordinator.run(apply, household.SessionLocal)
+    if loan is None:
+        raise HTTPException(status_code=404, detail="Loan not found")
     return loan
 
 
 @router.delete("/{loan_id}", status_code=204)
-def delete_loan(
+async def delete_loan(
     loan_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_household_db),
     _: User = Depends(get_current_user),
 ):
-    loan = db.query(Loan).filter(Loan.id == loan_id).first()
+    loan = await db.get(Loan, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
-    db.delete(loan)
-    db.commit()
+    await db.execute(delete(LoanPayment).where(LoanPayment.loan_id == loan.id))
+    await db.delete(loan)
+    await db.commit()
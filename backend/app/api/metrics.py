@@ -0,0 +1,27 @@
+from __future__ import annotations
+import secrets
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import get_async_read_db
+from app.utils.metrics import registry
+from app.api.deps import get_current_user
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+settings = get_settings()
+
+
+async def require_metrics_access(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    # Scrapers send METRICS_TOKEN as a bearer token; without one configured, a logged-in session is required
+    if not settings.METRICS_TOKEN:
+        await get_current_user(request, db)
+        return
+    authorization = request.headers.get("authorization", "")
+    if not secrets.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+@router.get("", response_class=PlainTextResponse, dependencies=[Depends(require_metrics_access)])
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,29 +1,45 @@
 from __future__ import annotations
+from typing import Literal
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.plan import FinancialPlan, PlanPhase, WeeklySnapshot
+from app.models.transaction import Transaction
 from app.models.user import User
-from app.schemas.plan import CalendarResponse, WeekData, PhaseData
-from app.utils.date_utils import get_current_plan_week
-from app.api.deps import get_current_user
+from app.schemas.plan import CalendarColumnarResponse, CalendarResponse, WeekData, PhaseData
+from app.services.periods import spending_by
+from app.services.plan_calendar import PlanCalendar
+from app.utils.columnar import to_columnar
+from app.api.deps import get_current_user, get_household_read_db, get_plan_calendar
 
 router = APIRouter(prefix="/api/plan", tags=["plan"])
 
 
-@router.get("/calendar", response_model=CalendarResponse)
-def get_calendar(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    plan = db.query(FinancialPlan).filter(FinancialPlan.is_active == True).first()
+@router.get("/calendar", response_model=CalendarResponse | CalendarColumnarResponse)
+async def get_calendar(
+    format: Literal["rows", "columnar"] = "rows",
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+    calendar: PlanCalendar = Depends(get_plan_calendar),
+):
+    plan = await db.scalar(select(FinancialPlan).where(FinancialPlan.is_active == True))
     if not plan:
         return CalendarResponse(
-            current_week=0, total_weeks=252, progress_pct=0,
+            current_week=0, total_weeks=0, progress_pct=0,
             phases=[], weeks=[],
         )
 
-    current_week = get_current_plan_week()
+    current_week = calendar.current_week()
 
-    phases = db.query(PlanPhase).filter(PlanPhase.plan_id == plan.id).order_by(PlanPhase.phase_number).all()
-    weeks = db.query(WeeklySnapshot).filter(WeeklySnapshot.plan_id == plan.id).order_by(WeeklySnapshot.week_number).all()
+    phases = (await db.scalars(
+        select(PlanPhase).where(PlanPhase.plan_id == plan.id).order_by(PlanPhase.phase_number)
+    )).all()
+    weeks = (await db.scalars(
+        select(WeeklySnapshot).where(WeeklySnapshot.plan_id == plan.id).order_by(WeeklySnapshot.week_number)
+    )).all()
+    # Snapshots without a recorded total fall back to the week's actual spending
+    spent_by_week = dict((await db.execute(spending_by(Transaction.plan_week))).all())
 
     phase_data = []
     for p in phases:
@@ -41,13 +57,28 @@ def get_calendar(db: Session = Depends(get_db), _: User = Depends(get_current_us
             progress_pct=round((completed / total) * 100, 1) if total else 0,
         ))
 
+    if format == "columnar":
+        numeric = ("discretionary_spent", "debt_paid_down", "emergency_fund_balance")
+        return JSONResponse({
+            "current_week": current_week,
+            "total_weeks": calendar.total_weeks,
+            "progress_pct": calendar.progress_pct(current_week),
+            "phases": [p.model_dump() for p in phase_data],
+            "weeks": to_columnar(
+                WeekData, weeks,
+                status=[w.status or "future" for w in weeks],
+                **{name: [getattr(w, name) or 0 for w in weeks] for name in numeric},
+                total_spent=[w.total_spent or spent_by_week.get(w.week_number, 0) for w in weeks],
+            ),
+        })
+
     week_data = [
         WeekData(
             week_number=w.week_number,
             week_start_date=w.week_start_date,
             week_end_date=w.week_end_date,
             phase_number=w.phase_number,
-            total_spent=w.total_spent or 0,
+            total_spent=w.total_spent or spent_by_week.get(w.week_number, 0),
             discretionary_spent=w.discretionary_spent or 0,
             debt_paid_down=w.debt_paid_down or 0,
             emergency_fund_balance=w.emergency_fund_balance or 0,
@@ -59,16 +90,18 @@ def get_calendar(db: Session = Depends(get_db), _: User = Depends(get_current_us
 
     return CalendarResponse(
         current_week=current_week,
-        total_weeks=252,
-        progress_pct=round((current_week / 252) * 100, 1),
+        total_weeks=calendar.total_weeks,
+        progress_pct=calendar.progress_pct(current_week),
         phases=phase_data,
         weeks=week_data,
     )
 
 
 @router.get("/phases")
-def get_phases(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    plan = db.query(FinancialPlan).filter(FinancialPlan.is_active == True).first()
+async def get_phases(db: AsyncSession = Depends(get_household_read_db), _: User = Depends(get_current_user)):
+    plan = await db.scalar(select(FinancialPlan).where(FinancialPlan.is_active == True))
     if not plan:
         return []
-    return db.query(PlanPhase).filter(PlanPhase.plan_id == plan.id).order_by(PlanPhase.phase_number).all()
+    return (await db.scalars(
+        select(PlanPhase).where(PlanPhase.plan_id == plan.id).order_by(PlanPhase.phase_number)
+    )).all()
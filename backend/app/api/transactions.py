@@ -1,68 +1,138 @@
 from __future__ import annotations
-from fastapi import APIRouter, Depends, Query
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select
 from datetime import date
-from app.database import get_db
 from app.models.transaction import Transaction, TransactionSource
 from app.models.user import User
-from app.schemas.transaction import TransactionResponse, TransactionUpdate, TransactionSourceResponse
-from app.api.deps import get_current_user
+from app.schemas.transaction import (
+    TransactionResponse, TransactionUpdate, TransactionSourceResponse, TransactionSourceUpdate, BalancePoint,
+    TransactionPage, TransactionColumnarPage,
+)
+from app.services.ledger import LedgerService
+from app.services.households import Household
+from app.services.write_coordinator import write_coordinator
+from app.utils.columnar import to_columnar
+from app.utils.money import MAX_DOLLARS, to_cents
+from app.api.deps import get_current_user, get_household, get_household_db, get_household_read_db
 
 router = APIRouter(prefix="/api/transactions", tags=["transactions"])
 
 
 @router.get("/sources", response_model=list[TransactionSourceResponse])
-def get_sources(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    return db.query(TransactionSource).all()
+async def get_sources(db: AsyncSession = Depends(get_household_read_db), _: User = Depends(get_current_user)):
+    return (await db.scalars(select(TransactionSource))).all()
 
 
-@router.get("", response_model=dict)
-def list_transactions(
+@router.patch("/sources/{source_id}", response_model=TransactionSourceResponse)
+async def update_source(
+    source_id: int,
+    update: TransactionSourceUpdate,
+    db: AsyncSession = Depends(get_household_db),
+    _: User = Depends(get_current_user),
+):
+    source = await db.get(TransactionSource, source_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+    for field, value in update.model_dump(exclude_unset=True).items():
+        setattr(source, field, value)
+    await db.commit()
+    await db.refresh(source)
+    return source
+
+
+@router.get("/sources/{source_id}/balance", response_model=BalancePoint)
+async def source_balance(
+    source_id: int,
+    on: date | None = None,
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+):
+    source = await db.get(TransactionSource, source_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+    on = on or date.today()
+    balance = await db.run_sync(lambda s: LedgerService(s).balance_on(source, on))
+    return BalancePoint(date=on, balance=balance)
+
+
+@router.get("/sources/{source_id}/balances", response_model=list[BalancePoint])
+async def source_balance_series(
+    source_id: int,
+    date_from: date,
+    date_to: date | None = None,
+    db: AsyncSession = Depends(get_household_read_db),
+    _: User = Depends(get_current_user),
+):
+    source = await db.get(TransactionSource, source_id)
+    if not source:
+        raise HTTPException(status_code=404, detail="Source not found")
+    return await db.run_sync(lambda s: LedgerService(s).series(source, date_from, date_to or date.today()))
+
+
+@router.get("", response_model=TransactionPage | TransactionColumnarPage)
+async def list_transactions(
     source_id: int | None = None,
     category: str | None = None,
     date_from: date | None = None,
     date_to: date | None = None,
-    min_amount: float | None = None,
-    max_amount: float | None = None,
+    min_amount: float | None = Query(None, ge=-MAX_DOLLARS, le=MAX_DOLLARS),
+    max_amount: float | None = Query(None, ge=-MAX_DOLLARS, le=MAX_DOLLARS),
     search: str | None = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    format: Literal["rows", "columnar"] = "rows",
+    db: AsyncSession = Depends(get_household_read_db),
     _: User = Depends(get_current_user),
 ):
-    query = db.query(Transaction)
+    query = select(Transaction)
 
     if source_id:
-        query = query.filter(Transaction.source_id == source_id)
+        query = query.where(Transaction.source_id == source_id)
     if category:
-        query = query.filter(Transaction.category == category)
+        query = query.where(Transaction.category == category)
     if date_from:
-        query = query.filter(Transaction.transaction_date >= date_from)
+        query = query.where(Transaction.transaction_date >= date_from)
     if date_to:
-        query = query.filter(Transaction.transaction_date <= date_to)
+        query = query.where(Transaction.transaction_date <= date_to)
     if min_amount is not None:
-        query = query.filter(Transaction.amount >= min_amount)
+        query = query.where(Transaction.amount >= to_cents(min_amount))
     if max_amount is not None:
-        query = query.filter(Transaction.amount <= max_amount)
+        query = query.where(Transaction.amount <= to_cents(max_amount))
     if search:
         like = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             (Transaction.description.ilike(like))
             | (Transaction.merchant.ilike(like))
             | (Transaction.memo.ilike(like))
         )
 
-    total = query.count()
-    transactions = (
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    transactions = (await db.scalars(
         query.order_by(desc(Transaction.transaction_date))
         .offset((page - 1) * per_page)
         .limit(per_page)
-        .all()
-    )
+    )).all()
 
     # Attach source names
-    source_map = {s.id: s.name for s in db.query(TransactionSource).all()}
+    source_map = {s.id: s.name for s in await db.scalars(select(TransactionSource))}
+    pages = (total + per_page - 1) // per_page
+    if format == "columnar":
+        return JSONResponse({
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "pages": pages,
+            "transactions": to_columnar(
+                TransactionResponse, transactions,
+                source_name=[source_map.get(t.source_id) for t in transactions],
+                is_excluded=[bool(t.is_excluded) for t in transactions],
+            ),
+        })
+
     results = []
     for t in transactions:
         resp = TransactionResponse(
@@ -77,6 +147,8 @@ def list_transactions(
             amount=t.amount,
             is_debit=t.is_debit,
             memo=t.memo,
+            is_excluded=bool(t.is_excluded),
+            transfer_match_id=t.transfer_match_id,
         )
         results.append(resp)
 
@@ -84,35 +156,35 @@ def list_transactions(
         "total": total,
         "page": page,
         "per_page": per_page,
-        "pages": (total + per_page - 1) // per_page,
+        "pages": pages,
         "transactions": results,
     }
 
 
 @router.get("/categories")
-def get_categories(db: Session = Depends(get_db), _: User = Depends(get_current_user)):
-    rows = db.query(Transaction.category).distinct().filter(Transaction.category.isnot(None)).all()
-    return sorted([r[0] for r in rows])
+async def get_categories(db: AsyncSession = Depends(get_household_read_db), _: User = Depends(get_current_user)):
+    rows = await db.scalars(select(Transaction.category).distinct().where(Transaction.category.isnot(None)))
+    return sorted(rows.all())
 
 
 @router.patch("/{transaction_id}")
-def update_transaction(
+async def update_transaction(
     transaction_id: int,
     update: TransactionUpdate,
-    db: Session = Depends(get_db),
-    _: User = Depends(get_current_user),
+    household: Household = Depends(get_household),
 ):
-    txn = db.query(Transaction).filter(Transaction.id == transaction_id).first()
-    if not txn:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail="Transaction not found")
+    def apply(db: Session) -> bool:
+        txn = db.get(Transaction, transaction_id)
+        if not txn:
+            return False
+        if update.category is not None:
+            txn.category = update.category
+        if update.user_notes is not None:
+            txn.user_notes = update.user_notes
+        if update.is_excluded is not None:
+            txn.is_excluded = update.is_excluded
+        return True
 
-    if update.category is not None:
-        txn.category = update.category
-    if update.user_notes is not None:
-        txn.user_notes = update.user_notes
-    if update.is_excluded is not None:
-        txn.is_excluded = update.is_excluded
-
-    db.commit()
+    if not await write_coordinator.run(apply, household.SessionLocal):
+        raise HTTPException(status_code=404, detail="Transaction not found")
     return {"message": "Updated"}
@@ -7,11 +7,46 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me-in-production-use-openssl-rand-hex-32"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_CACHE_SIZE: int = 1024  # 0 disables the token -> user cache
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    BCRYPT_ROUNDS: int = 12  # changing this rehashes passwords on their next login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    LOGIN_MAX_FAILURES: int = 5
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 300
     DATABASE_URL: str = "sqlite:///./data/stopmonkey.db"
+    TENANCY_MODE: str = "single"  # "household": DATABASE_URL holds only users; each household gets its own file
+    HOUSEHOLD_DB_DIR: str = "./data/households"
+    HOUSEHOLD_POOL_SIZE: int = 64  # open household databases per worker; the least recently used close beyond this
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -32768  # negative = KiB, so 32 MiB per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    WRITE_BATCH_WINDOW_MS: float = 5  # group-commit window for small UI mutations
+    WRITE_BATCH_MAX: int = 64
+    WORKERS: int = 1  # gunicorn worker processes; >1 checks cache versions on every request
+    # Proxies trusted for X-Forwarded-For; the host's nginx reaches the container from the Docker bridge network
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1,172.16.0.0/12"
     UPLOAD_DIR: str = "./uploads"
     ADMIN_USERNAME: str = "admin"
     ADMIN_PASSWORD: str = "changeme"
+    SQL_PROFILE: bool = False  # profile every request; otherwise only those sending X-SQL-Profile and METRICS_TOKEN
+    SQL_PROFILE_N_PLUS_ONE_THRESHOLD: int = 3  # identical statements per request before flagging N+1
+    PROFILE_DIR: str = "./data/profiles"
+    PROFILE_SLOW_REQUEST_MS: float = 0  # sample every request and keep those slower than this; 0 = off
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5
+    PROFILE_MAX_FILES: int = 200  # oldest profiles are deleted beyond this
+    METRICS_TOKEN: str = ""  # bearer token for /api/metrics scrapers; empty = login required
+    GZIP_MINIMUM_SIZE: int = 1024  # bytes; smaller responses are sent uncompressed
+    GZIP_COMPRESS_LEVEL: int = 6
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
+    SWEEP_PARALLEL_THRESHOLD: int = 10000  # scenarios; larger grids are split across processes
+    SWEEP_MAX_WORKERS: int = 0  # 0 = one per CPU
+    LOAN_MATCH_AMOUNT_TOLERANCE: float = 0.05  # fraction of monthly_payment
+    LOAN_MATCH_DAY_WINDOW: int = 5  # days either side of payment_day
+    TRANSFER_MATCH_DAY_WINDOW: int = 5
+    TRANSFER_MATCH_AMOUNT_TOLERANCE: float = 0.01  # dollars
 
     class Config:
         env_file = ".env"
@@ -1,16 +1,85 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=False,
+
+def sqlite_pragmas(readonly: bool = False) -> dict:
+    """Connection PRAGMAs from Settings, applied on every new SQLite connection."""
+    pragmas = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": "MEMORY",
+    }
+    if readonly:
+        pragmas["query_only"] = "ON"
+    return pragmas
+
+
+def _install_pragmas(sync_engine, pragmas: dict):
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # journal_mode first: it must be set before query_only forbids the change
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(url: str, pragmas: dict | None = None, **kwargs):
+    is_sqlite = url.startswith("sqlite")
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        echo=False,
+        **kwargs,
+    )
+    if is_sqlite and pragmas:
+        _install_pragmas(engine, pragmas)
+    return engine
+
+
+def async_database_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+
+def create_async_db_engine(url: str, pragmas: dict | None = None, **kwargs):
+    engine = create_async_engine(async_database_url(url), echo=False, **kwargs)
+    if url.startswith("sqlite") and pragmas:
+        _install_pragmas(engine.sync_engine, pragmas)
+    return engine
+
+
+def _is_memory_db(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:")
+
+
+engine = create_db_engine(settings.DATABASE_URL, sqlite_pragmas())
+# GET endpoints read through their own pool so imports holding the write lock don't queue them
+read_engine = (
+    engine if _is_memory_db(settings.DATABASE_URL)
+    else create_db_engine(settings.DATABASE_URL, sqlite_pragmas(readonly=True))
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async engines serve the API routers; the sync ones above remain for imports, seeding and background jobs
+async_engine = create_async_db_engine(settings.DATABASE_URL, sqlite_pragmas())
+async_read_engine = (
+    async_engine if _is_memory_db(settings.DATABASE_URL)
+    else create_async_db_engine(settings.DATABASE_URL, sqlite_pragmas(readonly=True))
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -23,3 +92,21 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -1,9 +1,15 @@
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.config import get_settings
-from app.api import auth, transactions, loans, plan, dashboard, imports, budget, reports
+from app.api import auth, transactions, loans, plan, dashboard, imports, budget, reports, metrics, admin
 from app.seed.init_db import init_database
+from app.services.households import Household, households, shared_household
+from app.services.write_coordinator import write_coordinator
+from app.utils.metrics import MetricsMiddleware, instrument_engine
+from app.utils import sql_profiler
+from app.utils.profiler import ProfilingMiddleware
 
 settings = get_settings()
 
@@ -22,6 +28,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE, compresslevel=settings.GZIP_COMPRESS_LEVEL)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(sql_profiler.SQLProfilerMiddleware)
+app.add_middleware(ProfilingMiddleware)
+
+
+def instrument_household(household: Household):
+    for db_engine in household.sync_engines:
+        instrument_engine(db_engine)
+        sql_profiler.instrument_engine(db_engine)
+
+
+instrument_household(shared_household)
+if households is not None:
+    households.on_open(instrument_household)
 
 # Routes
 app.include_router(auth.router)
@@ -32,6 +53,8 @@ app.include_router(plan.router)
 app.include_router(imports.router)
 app.include_router(budget.router)
 app.include_router(reports.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 @app.on_event("startup")
@@ -39,6 +62,12 @@ def startup():
     os.makedirs("data", exist_ok=True)
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
     init_database()
+    write_coordinator.start()
+
+
+@app.on_event("shutdown")
+def shutdown():
+    write_coordinator.stop()
 
 
 @app.get("/api/health")
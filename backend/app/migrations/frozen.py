@@ -0,0 +1,286 @@
+"""Tables as they stood when the migrations that use them shipped.
+
+Migrations read and write through these rather than app.models: a database
+being upgraded has only the columns of its own version, and the models
+describe the latest one. Never change a definition here; add new ones.
+"""
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    UniqueConstraint, column, func, table,
+)
+
+# Version 1: the schema when versioning was introduced
+v1 = MetaData()
+
+users = Table(
+    "users", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("username", String, unique=True, nullable=False),
+    Column("password_hash", String, nullable=False),
+    Column("created_at", DateTime, server_default=func.now()),
+    Column("last_login", DateTime),
+)
+
+transaction_sources = Table(
+    "transaction_sources", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String, nullable=False),
+    Column("type", String, nullable=False),
+    Column("last_four", String),
+    Column("institution", String),
+    Column("active", Boolean, default=True),
+    Column("opening_balance", Float, default=0),
+    Column("opening_balance_date", Date),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+transactions = Table(
+    "transactions", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("source_id", Integer, ForeignKey("transaction_sources.id"), nullable=False),
+    Column("transaction_date", Date, nullable=False, index=True),
+    Column("clearing_date", Date),
+    Column("description", String, nullable=False),
+    Column("merchant", String, index=True),
+    Column("category", String, index=True),
+    Column("original_category", String),
+    Column("transaction_type", String),
+    Column("amount", Float, nullable=False),
+    Column("is_debit", Boolean, nullable=False),
+    Column("memo", Text),
+    Column("extended_details", Text),
+    Column("address", String),
+    Column("city_state", String),
+    Column("zip_code", String),
+    Column("country", String),
+    Column("reference_number", String),
+    Column("card_member", String),
+    Column("purchased_by", String),
+    Column("import_batch_id", String, index=True),
+    Column("dedup_hash", String, index=True),
+    Column("user_notes", Text),
+    Column("is_excluded", Boolean, default=False),
+    Column("transfer_match_id", Integer, ForeignKey("transactions.id"), index=True),
+    Column("imported_at", DateTime, server_default=func.now()),
+    Index("ix_transactions_source_dedup", "source_id", "dedup_hash"),
+)
+
+import_batches = Table(
+    "import_batches", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("batch_id", String, unique=True, nullable=False),
+    Column("source_id", Integer, ForeignKey("transaction_sources.id"), nullable=False),
+    Column("filename", String, nullable=False),
+    Column("file_hash", String, index=True),
+    Column("rows_imported", Integer),
+    Column("rows_skipped", Integer),
+    Column("date_range_start", Date),
+    Column("date_range_end", Date),
+    Column("imported_at", DateTime, server_default=func.now()),
+    Column("notes", Text),
+)
+
+source_daily_balances = Table(
+    "source_daily_balances", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("source_id", Integer, ForeignKey("transaction_sources.id"), nullable=False),
+    Column("balance_date", Date, nullable=False),
+    Column("net_change", Float, nullable=False),
+    Column("cumulative", Float, nullable=False),
+    UniqueConstraint("source_id", "balance_date", name="uq_source_daily_balance"),
+)
+
+categories = Table(
+    "categories", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String, unique=True, nullable=False),
+    Column("parent_category", String),
+    Column("budget_category", String),
+    Column("color_code", String),
+    Column("is_discretionary", Boolean, default=True),
+    Column("is_essential", Boolean, default=False),
+)
+
+category_mappings = Table(
+    "category_mappings", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("merchant_pattern", String, nullable=False),
+    Column("source_category", String),
+    Column("mapped_category", String, nullable=False),
+)
+
+loans = Table(
+    "loans", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String, nullable=False),
+    Column("loan_type", String, nullable=False),
+    Column("creditor", String),
+    Column("original_amount", Float),
+    Column("current_balance", Float, nullable=False),
+    Column("interest_rate", Float),
+    Column("monthly_payment", Float),
+    Column("payment_day", Integer),
+    Column("start_date", Date),
+    Column("end_date", Date),
+    Column("payments_remaining", Integer),
+    Column("is_active", Boolean, default=True),
+    Column("priority_rank", Integer),
+    Column("notes", Text),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+loan_payments = Table(
+    "loan_payments", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("loan_id", Integer, ForeignKey("loans.id"), nullable=False),
+    Column("payment_date", Date, nullable=False),
+    Column("amount", Float, nullable=False),
+    Column("principal_amount", Float),
+    Column("interest_amount", Float),
+    Column("balance_after", Float),
+    Column("transaction_id", Integer, ForeignKey("transactions.id")),
+    Column("is_projected", Boolean, default=False),
+    Column("created_at", DateTime, server_default=func.now()),
+    Index("ix_loan_payments_loan_projected_date", "loan_id", "is_projected", "payment_date"),
+    Index("ix_loan_payments_projected_date", "is_projected", "payment_date"),
+)
+
+financial_plan = Table(
+    "financial_plan", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("plan_name", String, nullable=False),
+    Column("start_date", Date, nullable=False),
+    Column("end_date", Date, nullable=False),
+    Column("total_weeks", Integer, nullable=False),
+    Column("total_months", Integer, nullable=False),
+    Column("is_active", Boolean, default=True),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+plan_phases = Table(
+    "plan_phases", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("plan_id", Integer, ForeignKey("financial_plan.id"), nullable=False),
+    Column("phase_number", Integer, nullable=False),
+    Column("name", String, nullable=False),
+    Column("start_month", Integer, nullable=False),
+    Column("end_month", Integer, nullable=False),
+    Column("start_week", Integer, nullable=False),
+    Column("end_week", Integer, nullable=False),
+    Column("color_code", String),
+    Column("primary_goal", String),
+    Column("description", Text),
+)
+
+weekly_snapshots = Table(
+    "weekly_snapshots", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("plan_id", Integer, ForeignKey("financial_plan.id"), nullable=False),
+    Column("week_number", Integer, nullable=False, index=True),
+    Column("week_start_date", Date, nullable=False),
+    Column("week_end_date", Date, nullable=False),
+    Column("phase_number", Integer, nullable=False),
+    Column("total_spent", Float),
+    Column("discretionary_spent", Float),
+    Column("debt_paid_down", Float),
+    Column("emergency_fund_balance", Float),
+    Column("weekly_spending_target", Float),
+    Column("is_on_track", Boolean),
+    Column("status", String, default="future"),
+    Column("notes", Text),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+monthly_snapshots = Table(
+    "monthly_snapshots", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("plan_id", Integer, ForeignKey("financial_plan.id"), nullable=False),
+    Column("month_number", Integer, nullable=False),
+    Column("month_date", Date, nullable=False),
+    Column("phase_number", Integer, nullable=False),
+    Column("monthly_income", Float),
+    Column("total_spent", Float),
+    Column("fixed_expenses", Float),
+    Column("discretionary_spent", Float),
+    Column("total_debt_start", Float),
+    Column("total_debt_end", Float),
+    Column("debt_paid_this_month", Float),
+    Column("interest_paid", Float),
+    Column("emergency_fund", Float),
+    Column("budget_target", Float),
+    Column("budget_variance", Float),
+    Column("created_at", DateTime, server_default=func.now()),
+)
+
+budget_targets = Table(
+    "budget_targets", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("phase_number", Integer, nullable=False),
+    Column("category", String, nullable=False),
+    Column("monthly_target", Float, nullable=False),
+    Column("is_fixed", Boolean, default=False),
+    Column("notes", Text),
+)
+
+milestones = Table(
+    "milestones", v1,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("phase_number", Integer),
+    Column("name", String, nullable=False),
+    Column("description", Text),
+    Column("target_date", Date),
+    Column("target_amount", Float),
+    Column("actual_date", Date),
+    Column("actual_amount", Float),
+    Column("is_achieved", Boolean, default=False),
+)
+
+
+# Version 8 adds the cross-process cache counters
+v8 = MetaData()
+
+cache_versions = Table(
+    "cache_versions", v8,
+    Column("name", String, primary_key=True),
+    Column("version", Integer, nullable=False, default=0),
+)
+
+# Version 9: the same tables with money as integer cents
+MONEY_COLUMNS = {
+    "loans": ["original_amount", "current_balance", "monthly_payment"],
+    "loan_payments": ["amount", "principal_amount", "interest_amount", "balance_after"],
+    "transaction_sources": ["opening_balance"],
+    "transactions": ["amount"],
+    "source_daily_balances": ["net_change", "cumulative"],
+    "weekly_snapshots": [
+        "total_spent", "discretionary_spent", "debt_paid_down", "emergency_fund_balance", "weekly_spending_target",
+    ],
+    "monthly_snapshots": [
+        "monthly_income", "total_spent", "fixed_expenses", "discretionary_spent", "total_debt_start",
+        "total_debt_end", "debt_paid_this_month", "interest_paid", "emergency_fund", "budget_target",
+        "budget_variance",
+    ],
+    "budget_targets": ["monthly_target"],
+    "milestones": ["target_amount", "actual_amount"],
+}
+
+
+def _in_cents(source: MetaData) -> MetaData:
+    metadata = MetaData()
+    for table in source.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for name in MONEY_COLUMNS.get(table.name, ()):
+            copy.c[name].type = Integer()
+    return metadata
+
+
+v9 = _in_cents(v1)
+
+# Version 10 adds period keys to transactions
+PERIOD_COLUMNS = ("plan_week", "plan_month", "phase_number", "yyyymm")
+
+transaction_periods = table(
+    "transactions",
+    column("transaction_date", Date),
+    *(column(name, Integer) for name in PERIOD_COLUMNS),
+)
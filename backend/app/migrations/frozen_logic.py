@@ -0,0 +1,103 @@
+"""Derivation logic as it stood when the migrations that use it shipped.
+
+Copies of app.services code, so a later change there cannot alter what an old
+migration writes. Like frozen.py, never change a definition here; add new ones.
+"""
+from __future__ import annotations
+import calendar
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+import numpy as np
+
+# Amortization as of migration 7 (app.services.amortization)
+MAX_MONTHS = 600
+_NPER_EPSILON = 1e-9
+
+
+def _months_to_payoff(balance: float, rate: float, payment: float) -> int:
+    monthly_rate = rate / 12
+    if balance <= 0:
+        return 0
+    if payment <= balance * monthly_rate:
+        return MAX_MONTHS
+    if monthly_rate == 0:
+        months = np.ceil(balance / payment - _NPER_EPSILON)
+    else:
+        months = np.ceil(-np.log1p(-monthly_rate * balance / payment) / np.log1p(monthly_rate) - _NPER_EPSILON)
+    return min(int(months), MAX_MONTHS)
+
+
+def _balance_after(balance: float, rate: float, payment: float, months: np.ndarray) -> np.ndarray:
+    monthly_rate = rate / 12
+    months = np.asarray(months, dtype=float)
+    growth = np.power(1 + monthly_rate, months)
+    annuity = (growth - 1) / monthly_rate if monthly_rate > 0 else months
+    return balance * growth - payment * annuity
+
+
+def amortization_schedule(balance: float, rate: float, payment: float) -> dict[str, np.ndarray]:
+    """Month-by-month payment, principal, interest and balance arrays for one loan."""
+    balance, rate, payment = float(balance), float(rate), float(payment)
+    months = _months_to_payoff(balance, rate, payment)
+    if months == 0 or months >= MAX_MONTHS:
+        empty = np.zeros(0)
+        return {"month": empty.astype(np.int64), "payment": empty, "principal": empty,
+                "interest": empty, "balance": empty}
+
+    month_index = np.arange(1, months + 1)
+    opening = _balance_after(balance, rate, payment, month_index - 1)
+    interest = opening * (rate / 12)
+    payments = np.full(months, payment)
+    payments[-1] = opening[-1] + interest[-1]
+    principal = payments - interest
+    closing = np.maximum(opening - principal, 0.0)
+    closing[-1] = 0.0
+    return {"month": month_index, "payment": payments, "principal": principal, "interest": interest, "balance": closing}
+
+
+def first_payment_date(payment_day: int | None, after: date) -> date:
+    """Next scheduled payment strictly after `after`, as of migration 7 (app.services.loan_projection)."""
+    if not payment_day:
+        return after + relativedelta(months=1)
+    candidate = after
+    for _ in range(2):
+        last_day = calendar.monthrange(candidate.year, candidate.month)[1]
+        due = candidate.replace(day=min(payment_day, last_day))
+        if due > after:
+            return due
+        candidate = candidate.replace(day=1) + relativedelta(months=1)
+    return after + relativedelta(months=1)
+
+
+class PeriodKeys:
+    """Transaction period columns as of migration 10 (app.services.plan_calendar.PlanCalendar.period_keys).
+
+    `phases` are rows with phase_number, start_week and end_week.
+    """
+
+    def __init__(self, start_date: date | None, total_weeks: int, phases):
+        self.start_date = start_date
+        total_weeks = total_weeks if start_date else 0
+        phases = sorted(phases, key=lambda p: p.phase_number)
+        current = phases[0].phase_number if phases else 1
+        covered: list[int | None] = [None] * (total_weeks + 1)
+        for p in phases:
+            for week in range(max(p.start_week, 1), min(p.end_week, total_weeks) + 1):
+                covered[week] = p.phase_number
+        # Index 0 unused; weeks no phase covers carry the preceding phase forward
+        self._phase_by_week = [current]
+        for phase in covered[1:]:
+            current = phase if phase is not None else current
+            self._phase_by_week.append(current)
+        self._days = total_weeks * 7
+
+    def __call__(self, d: date) -> dict:
+        offset = (d - self.start_date).days if self.start_date else -1
+        if 0 <= offset < self._days:
+            week = offset // 7 + 1
+            month = (d.year - self.start_date.year) * 12 + d.month - self.start_date.month + 1
+            keys = {"plan_week": week, "plan_month": month, "phase_number": self._phase_by_week[week]}
+        else:
+            keys = {"plan_week": None, "plan_month": None, "phase_number": None}
+        keys["yyyymm"] = d.year * 100 + d.month
+        return keys
@@ -0,0 +1,88 @@
+"""Schema-version bookkeeping and helpers for idempotent DDL."""
+from __future__ import annotations
+from typing import Callable
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+Migration = tuple[int, str, Callable[[Connection], None]]
+
+
+def current_version(engine: Engine) -> int:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version FROM schema_version")).scalar() or 0
+    except OperationalError:
+        return 0
+
+
+def column_exists(conn: Connection, table: str, column: str) -> bool:
+    return any(row[1] == column for row in conn.execute(text(f"PRAGMA table_info({table})")))
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str):
+    if not column_exists(conn, table, column):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def create_index(conn: Connection, name: str, table: str, columns: list[str]):
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+def column_types(conn: Connection, table: str) -> dict[str, str]:
+    return {row[1]: row[2].upper() for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def rebuild_table(conn: Connection, table: Table, expressions: dict[str, str]):
+    """Recreate `table` from a frozen definition (see frozen.py) and copy the rows across.
+
+    SQLite cannot change a column's type in place. `expressions` maps column
+    names to the SQL that computes their new value from the old row.
+    """
+    old = f"{table.name}__old"
+    existing = column_types(conn, table.name)
+    # Keep other tables' foreign keys pointing at the original name
+    conn.execute(text("PRAGMA legacy_alter_table = ON"))
+    conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {old}"))
+    indexes = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t AND sql IS NOT NULL"), {"t": old}
+    ).scalars().all()
+    for name in indexes:
+        conn.execute(text(f"DROP INDEX {name}"))
+    table.create(conn)
+    columns = [c.name for c in table.columns if c.name in existing]
+    conn.execute(text(
+        f"INSERT INTO {table.name} ({', '.join(columns)}) "
+        f"SELECT {', '.join(expressions.get(c, c) for c in columns)} FROM {old}"
+    ))
+    conn.execute(text(f"DROP TABLE {old}"))
+    conn.execute(text("PRAGMA legacy_alter_table = OFF"))
+
+
+def run_migrations(engine: Engine, migrations: list[Migration]) -> int:
+    """Apply pending migrations in order, each in its own transaction with its version bump.
+
+    Costs one query when the database is already at the latest version.
+    """
+    latest = migrations[-1][0]
+    if current_version(engine) >= latest:
+        return 0
+
+    applied = 0
+    for version, name, apply in migrations:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS schema_version "
+                "(id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER NOT NULL)"
+            ))
+            # Re-read inside the transaction so concurrent starters don't apply a step twice
+            if (conn.execute(text("SELECT version FROM schema_version")).scalar() or 0) >= version:
+                continue
+            apply(conn)
+            conn.execute(text(
+                "INSERT INTO schema_version (id, version) VALUES (1, :v) "
+                "ON CONFLICT(id) DO UPDATE SET version = excluded.version"
+            ), {"v": version})
+        print(f"Applied migration {version:03d}: {name}")
+        applied += 1
+    return applied
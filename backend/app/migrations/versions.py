@@ -0,0 +1,179 @@
+"""Ordered schema and data migrations. Append new steps; never edit or reorder shipped ones.
+
+Steps go through the tables in frozen.py, never app.models, so each sees its own version's schema,
+and derive rows with the copies in frozen_logic.py, never app.services, so each writes what it did when it shipped.
+"""
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import Table, bindparam, delete, insert, select, text, update
+from sqlalchemy.engine import Connection
+from app.migrations import frozen
+from app.migrations.frozen_logic import PeriodKeys, amortization_schedule, first_payment_date
+from app.migrations.runner import Migration, add_column, column_types, create_index, rebuild_table
+from app.seed.data import seed_admin, seed_sources, seed_plan, seed_milestones
+
+
+def m001_baseline(conn: Connection):
+    # Creates missing tables only; databases from before versioning keep theirs and are patched below
+    frozen.v1.create_all(bind=conn)
+
+
+def m002_loan_payment_indexes(conn: Connection):
+    create_index(conn, "ix_loan_payments_loan_projected_date", "loan_payments", ["loan_id", "is_projected", "payment_date"])
+    create_index(conn, "ix_loan_payments_projected_date", "loan_payments", ["is_projected", "payment_date"])
+
+
+def m003_transfer_match(conn: Connection):
+    add_column(conn, "transactions", "transfer_match_id", "INTEGER REFERENCES transactions(id)")
+    create_index(conn, "ix_transactions_transfer_match_id", "transactions", ["transfer_match_id"])
+
+
+def m004_opening_balance(conn: Connection):
+    add_column(conn, "transaction_sources", "opening_balance", "FLOAT DEFAULT 0")
+    add_column(conn, "transaction_sources", "opening_balance_date", "DATE")
+
+
+def m005_lookup_indexes(conn: Connection):
+    create_index(conn, "ix_import_batches_file_hash", "import_batches", ["file_hash"])
+    create_index(conn, "ix_transactions_source_dedup", "transactions", ["source_id", "dedup_hash"])
+
+
+def m006_seed(conn: Connection):
+    seed_admin(conn)
+    seed_sources(conn)
+    seed_plan(conn)
+    seed_milestones(conn)
+
+
+def project_loans(conn: Connection, loans: Table, loan_payments: Table, digits: int | None) -> int:
+    """Projected schedules for active loans that have none, amounts rounded to `digits` places."""
+    projected = select(loan_payments.c.loan_id).where(loan_payments.c.is_projected == True)
+    rows = conn.execute(
+        select(loans.c.id, loans.c.current_balance, loans.c.interest_rate, loans.c.monthly_payment,
+               loans.c.payment_day)
+        .where(loans.c.is_active == True, loans.c.id.notin_(projected))
+    ).all()
+    for loan in rows:
+        schedule = amortization_schedule(loan.current_balance, loan.interest_rate or 0, loan.monthly_payment or 0)
+        if not len(schedule["month"]):
+            continue
+        first = first_payment_date(loan.payment_day, date.today())
+        conn.execute(insert(loan_payments), [
+            {
+                "loan_id": loan.id,
+                "payment_date": first + relativedelta(months=int(m) - 1),
+                "amount": round(float(p), digits),
+                "principal_amount": round(float(pr), digits),
+                "interest_amount": round(float(i), digits),
+                "balance_after": round(float(b), digits),
+                "is_projected": True,
+            }
+            for m, p, pr, i, b in zip(
+                schedule["month"], schedule["payment"], schedule["principal"],
+                schedule["interest"], schedule["balance"],
+            )
+        ])
+    return len(rows)
+
+
+def build_ledgers(conn: Connection, digits: int | None):
+    """Daily running balances for sources with transactions but no ledger rows, rounded to `digits` places."""
+    net = "net" if digits is None else f"ROUND(net, {digits})"
+    running = f"SUM({net}) OVER (PARTITION BY source_id ORDER BY day)"
+    if digits is not None:
+        running = f"ROUND({running}, {digits})"
+    conn.execute(text(
+        "INSERT INTO source_daily_balances (source_id, balance_date, net_change, cumulative) "
+        f"SELECT source_id, day, {net}, {running} FROM ("
+        "SELECT source_id, transaction_date AS day, SUM(CASE WHEN is_debit THEN -amount ELSE amount END) AS net "
+        "FROM transactions WHERE source_id NOT IN (SELECT source_id FROM source_daily_balances) "
+        "GROUP BY source_id, transaction_date)"
+    ))
+
+
+def m007_backfill_projections_and_ledgers(conn: Connection):
+    # Money was still in dollars
+    project_loans(conn, frozen.loans, frozen.loan_payments, 2)
+    build_ledgers(conn, 2)
+
+
+def m008_cache_versions(conn: Connection):
+    frozen.v8.create_all(bind=conn)
+
+
+def m009_money_cents(conn: Connection):
+    # Tables created after this change already declare INTEGER columns holding cents
+    converted = 0
+    for name, columns in frozen.MONEY_COLUMNS.items():
+        types = column_types(conn, name)
+        if all(types.get(c, "INTEGER") == "INTEGER" for c in columns):
+            continue
+        rebuild_table(conn, frozen.v9.tables[name], {c: f"CAST(ROUND({c} * 100) AS INTEGER)" for c in columns if c in types})
+        converted += 1
+    if not converted:
+        return
+    # Projections and ledgers may have been derived from dollar values by earlier steps; derive them again
+    loan_payments = frozen.v9.tables["loan_payments"]
+    conn.execute(delete(loan_payments).where(loan_payments.c.is_projected == True))
+    conn.execute(delete(frozen.v9.tables["source_daily_balances"]))
+    project_loans(conn, frozen.v9.tables["loans"], loan_payments, None)
+    build_ledgers(conn, None)
+
+
+def m010_transaction_periods(conn: Connection):
+    for column in frozen.PERIOD_COLUMNS:
+        add_column(conn, "transactions", column, "INTEGER")
+    create_index(conn, "ix_transactions_spend_yyyymm", "transactions",
+                 ["is_debit", "is_excluded", "yyyymm", "category", "amount"])
+    create_index(conn, "ix_transactions_spend_plan_week", "transactions", ["is_debit", "is_excluded", "plan_week", "amount"])
+    create_index(conn, "ix_transactions_spend_plan_month", "transactions", ["is_debit", "is_excluded", "plan_month", "amount"])
+    create_index(conn, "ix_transactions_spend_phase", "transactions", ["is_debit", "is_excluded", "phase_number", "amount"])
+
+    plan, phases = frozen.financial_plan, frozen.plan_phases
+    row = conn.execute(select(plan.c.id, plan.c.start_date, plan.c.total_weeks).where(plan.c.is_active == True)).first()
+    if row is None:
+        period_keys = PeriodKeys(None, 0, [])
+    else:
+        period_keys = PeriodKeys(row.start_date, row.total_weeks, conn.execute(
+            select(phases.c.phase_number, phases.c.start_week, phases.c.end_week).where(phases.c.plan_id == row.id)
+        ).all())
+
+    periods = frozen.transaction_periods
+    dates = conn.execute(
+        select(periods.c.transaction_date).distinct().where(periods.c.yyyymm.is_(None))
+    ).scalars().all()
+    if dates:
+        conn.execute(
+            update(periods)
+            .where(periods.c.transaction_date == bindparam("day"))
+            .values({c: bindparam(f"new_{c}") for c in frozen.PERIOD_COLUMNS}),
+            [{"day": d, **{f"new_{c}": v for c, v in period_keys(d).items()}} for d in dates],
+        )
+
+
+def m011_user_household(conn: Connection):
+    add_column(conn, "users", "household", "VARCHAR")
+
+
+def m012_loan_balance_date(conn: Connection):
+    add_column(conn, "loans", "balance_date", "DATE")
+    # Existing balances were entered when the loan was created, or at least by today
+    conn.execute(text(
+        "UPDATE loans SET balance_date = DATE(COALESCE(created_at, CURRENT_TIMESTAMP)) WHERE balance_date IS NULL"
+    ))
+
+
+MIGRATIONS: list[Migration] = [
+    (1, "baseline schema", m001_baseline),
+    (2, "loan payment indexes", m002_loan_payment_indexes),
+    (3, "transfer match link", m003_transfer_match),
+    (4, "source opening balance", m004_opening_balance),
+    (5, "import lookup indexes", m005_lookup_indexes),
+    (6, "reference data", m006_seed),
+    (7, "projected schedules and ledgers", m007_backfill_projections_and_ledgers),
+    (8, "cache version counters", m008_cache_versions),
+    (9, "money as integer cents", m009_money_cents),
+    (10, "transaction period keys", m010_transaction_periods),
+    (11, "user household", m011_user_household),
+    (12, "loan balance date", m012_loan_balance_date),
+]
@@ -1,5 +1,6 @@
 from app.models.user import User
-from app.models.transaction import Transaction, TransactionSource, ImportBatch
+from app.models.transaction import Transaction, TransactionSource, ImportBatch, SourceDailyBalance
 from app.models.category import Category, CategoryMapping
 from app.models.loan import Loan, LoanPayment
 from app.models.plan import FinancialPlan, PlanPhase, WeeklySnapshot, MonthlySnapshot, BudgetTarget, Milestone
+from app.models.cache_version import CacheVersion
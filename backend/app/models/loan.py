@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey
+from datetime import date
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -11,10 +12,11 @@ class Loan(Base):
     name = Column(String, nullable=False)
     loan_type = Column(String, nullable=False)  # bnpl, auto, mortgage, personal
     creditor = Column(String)
-    original_amount = Column(Float)
-    current_balance = Column(Float, nullable=False)
+    original_amount = Column(Integer)
+    current_balance = Column(Integer, nullable=False)  # cents
+    balance_date = Column(Date, default=date.today)  # day current_balance was entered; later imported payments reduce it
     interest_rate = Column(Float)  # as decimal, e.g., 0.0699
-    monthly_payment = Column(Float)
+    monthly_payment = Column(Integer)
     payment_day = Column(Integer)
     start_date = Column(Date)
     end_date = Column(Date)
@@ -29,14 +31,18 @@ class Loan(Base):
 
 class LoanPayment(Base):
     __tablename__ = "loan_payments"
+    __table_args__ = (
+        Index("ix_loan_payments_loan_projected_date", "loan_id", "is_projected", "payment_date"),
+        Index("ix_loan_payments_projected_date", "is_projected", "payment_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     loan_id = Column(Integer, ForeignKey("loans.id"), nullable=False)
     payment_date = Column(Date, nullable=False)
-    amount = Column(Float, nullable=False)
-    principal_amount = Column(Float)
-    interest_amount = Column(Float)
-    balance_after = Column(Float)
+    amount = Column(Integer, nullable=False)  # cents
+    principal_amount = Column(Integer)
+    interest_amount = Column(Integer)
+    balance_after = Column(Integer)
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
     is_projected = Column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now())
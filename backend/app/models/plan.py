@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -41,11 +41,11 @@ class WeeklySnapshot(Base):
     week_start_date = Column(Date, nullable=False)
     week_end_date = Column(Date, nullable=False)
     phase_number = Column(Integer, nullable=False)
-    total_spent = Column(Float)
-    discretionary_spent = Column(Float)
-    debt_paid_down = Column(Float)
-    emergency_fund_balance = Column(Float)
-    weekly_spending_target = Column(Float)
+    total_spent = Column(Integer)
+    discretionary_spent = Column(Integer)
+    debt_paid_down = Column(Integer)
+    emergency_fund_balance = Column(Integer)
+    weekly_spending_target = Column(Integer)
     is_on_track = Column(Boolean)
     status = Column(String, default="future")  # future, current, completed, missed
     notes = Column(Text)
@@ -60,17 +60,17 @@ class MonthlySnapshot(Base):
     month_number = Column(Integer, nullable=False)
     month_date = Column(Date, nullable=False)
     phase_number = Column(Integer, nullable=False)
-    monthly_income = Column(Float)
-    total_spent = Column(Float)
-    fixed_expenses = Column(Float)
-    discretionary_spent = Column(Float)
-    total_debt_start = Column(Float)
-    total_debt_end = Column(Float)
-    debt_paid_this_month = Column(Float)
-    interest_paid = Column(Float)
-    emergency_fund = Column(Float)
-    budget_target = Column(Float)
-    budget_variance = Column(Float)
+    monthly_income = Column(Integer)
+    total_spent = Column(Integer)
+    fixed_expenses = Column(Integer)
+    discretionary_spent = Column(Integer)
+    total_debt_start = Column(Integer)
+    total_debt_end = Column(Integer)
+    debt_paid_this_month = Column(Integer)
+    interest_paid = Column(Integer)
+    emergency_fund = Column(Integer)
+    budget_target = Column(Integer)
+    budget_variance = Column(Integer)
     created_at = Column(DateTime, server_default=func.now())
 
 
@@ -80,7 +80,7 @@ class BudgetTarget(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     phase_number = Column(Integer, nullable=False)
     category = Column(String, nullable=False)
-    monthly_target = Column(Float, nullable=False)
+    monthly_target = Column(Integer, nullable=False)  # cents
     is_fixed = Column(Boolean, default=False)
     notes = Column(Text)
 
@@ -93,7 +93,7 @@ class Milestone(Base):
     name = Column(String, nullable=False)
     description = Column(Text)
     target_date = Column(Date)
-    target_amount = Column(Float)
+    target_amount = Column(Integer)
     actual_date = Column(Date)
-    actual_amount = Column(Float)
+    actual_amount = Column(Integer)
     is_achieved = Column(Boolean, default=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -13,6 +13,8 @@ class TransactionSource(Base):
     last_four = Column(String)
     institution = Column(String)
     active = Column(Boolean, default=True)
+    opening_balance = Column(Integer, default=0)  # cents; user-entered anchor for the running-balance ledger
+    opening_balance_date = Column(Date)
     created_at = Column(DateTime, server_default=func.now())
 
     transactions = relationship("Transaction", back_populates="source")
@@ -20,6 +22,14 @@ class TransactionSource(Base):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_source_dedup", "source_id", "dedup_hash"),
+        # Spending aggregates filter on is_debit/is_excluded and group by a period key; amount makes them covering
+        Index("ix_transactions_spend_yyyymm", "is_debit", "is_excluded", "yyyymm", "category", "amount"),
+        Index("ix_transactions_spend_plan_week", "is_debit", "is_excluded", "plan_week", "amount"),
+        Index("ix_transactions_spend_plan_month", "is_debit", "is_excluded", "plan_month", "amount"),
+        Index("ix_transactions_spend_phase", "is_debit", "is_excluded", "phase_number", "amount"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     source_id = Column(Integer, ForeignKey("transaction_sources.id"), nullable=False)
@@ -30,7 +40,7 @@ class Transaction(Base):
     category = Column(String, index=True)
     original_category = Column(String)
     transaction_type = Column(String)  # debit, credit, purchase, payment
-    amount = Column(Float, nullable=False)
+    amount = Column(Integer, nullable=False)  # cents
     is_debit = Column(Boolean, nullable=False)
     memo = Column(Text)
     extended_details = Column(Text)
@@ -45,6 +55,11 @@ class Transaction(Base):
     dedup_hash = Column(String, index=True)
     user_notes = Column(Text)
     is_excluded = Column(Boolean, default=False)
+    transfer_match_id = Column(Integer, ForeignKey("transactions.id"), index=True)  # counterpart of a matched transfer
+    plan_week = Column(Integer)  # period keys derived from transaction_date, see services/periods.py
+    plan_month = Column(Integer)
+    phase_number = Column(Integer)
+    yyyymm = Column(Integer)  # e.g. 202603
     imported_at = Column(DateTime, server_default=func.now())
 
     source = relationship("TransactionSource", back_populates="transactions")
@@ -57,7 +72,7 @@ class ImportBatch(Base):
     batch_id = Column(String, unique=True, nullable=False)
     source_id = Column(Integer, ForeignKey("transaction_sources.id"), nullable=False)
     filename = Column(String, nullable=False)
-    file_hash = Column(String)
+    file_hash = Column(String, index=True)
     rows_imported = Column(Integer)
     rows_skipped = Column(Integer)
     date_range_start = Column(Date)
@@ -66,3 +81,15 @@ class ImportBatch(Base):
     notes = Column(Text)
 
     source = relationship("TransactionSource")
+
+
+class SourceDailyBalance(Base):
+    """Per-source, per-day running total of signed transaction amounts."""
+    __tablename__ = "source_daily_balances"
+    __table_args__ = (UniqueConstraint("source_id", "balance_date", name="uq_source_daily_balance"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source_id = Column(Integer, ForeignKey("transaction_sources.id"), nullable=False)
+    balance_date = Column(Date, nullable=False)
+    net_change = Column(Integer, nullable=False)
+    cumulative = Column(Integer, nullable=False)  # sum of net_change up to and including balance_date
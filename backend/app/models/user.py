@@ -9,5 +9,6 @@ class User(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
+    household = Column(String)  # database shard in household tenancy; None = a household of one
     created_at = Column(DateTime, server_default=func.now())
     last_login = Column(DateTime)
@@ -0,0 +1,7 @@
+"""CSV parser registry. Parsers import pandas inside parse(), so loading this package stays cheap."""
+from app.parsers.credit_card_6032 import CreditCard6032Parser
+from app.parsers.apple_card import AppleCardParser
+from app.parsers.amex import AmexParser
+from app.parsers.checking_1569 import Checking1569Parser
+
+PARSERS = [CreditCard6032Parser, AppleCardParser, AmexParser, Checking1569Parser]
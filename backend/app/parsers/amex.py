@@ -1,6 +1,6 @@
-import pandas as pd
 from typing import List, Dict
 from app.parsers.base_parser import BaseParser
+from app.utils.money import to_cents
 
 
 class AmexParser(BaseParser):
@@ -9,6 +9,8 @@ class AmexParser(BaseParser):
     EXPECTED_COLUMNS = {"Date", "Description", "Amount", "Category"}
 
     def parse(self, file_path: str) -> List[Dict]:
+        import pandas as pd
+
         df = pd.read_csv(file_path, dtype=str)
         df.columns = df.columns.str.strip()
         transactions = []
@@ -32,7 +34,10 @@ class AmexParser(BaseParser):
             country = str(row.get("Country", "")).strip() if pd.notna(row.get("Country")) else None
             reference = str(row.get("Reference", "")).strip() if pd.notna(row.get("Reference")) else None
 
-            normalized_cat = self._normalize_category(category) if category else "Other"
+            if not is_debit and "PAYMENT" in description.upper():
+                normalized_cat = "Payment"  # e.g. "AUTOPAY PAYMENT - THANK YOU"; reconciled with checking
+            else:
+                normalized_cat = self._normalize_category(category) if category else "Other"
 
             transactions.append({
                 "transaction_date": pd.to_datetime(date_str).date(),
@@ -41,7 +46,7 @@ class AmexParser(BaseParser):
                 "category": normalized_cat,
                 "original_category": category,
                 "transaction_type": "charge" if is_debit else "credit",
-                "amount": abs(amount),
+                "amount": to_cents(abs(amount)),
                 "is_debit": is_debit,
                 "card_member": card_member,
                 "extended_details": extended,
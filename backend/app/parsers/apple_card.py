@@ -1,6 +1,6 @@
-import pandas as pd
 from typing import List, Dict
 from app.parsers.base_parser import BaseParser
+from app.utils.money import to_cents
 
 
 class AppleCardParser(BaseParser):
@@ -12,6 +12,8 @@ class AppleCardParser(BaseParser):
     }
 
     def parse(self, file_path: str) -> List[Dict]:
+        import pandas as pd
+
         df = pd.read_csv(file_path)
         df.columns = df.columns.str.strip()
         transactions = []
@@ -37,7 +39,7 @@ class AppleCardParser(BaseParser):
                 "category": normalized_cat,
                 "original_category": category,
                 "transaction_type": txn_type,
-                "amount": abs(amount),
+                "amount": to_cents(abs(amount)),
                 "is_debit": is_debit,
                 "purchased_by": purchased_by,
                 "dedup_hash": self.make_dedup_hash(self.SOURCE_NAME, date_str, str(amount), description),
@@ -1,6 +1,6 @@
-import pandas as pd
 from typing import List, Dict
 from app.parsers.base_parser import BaseParser
+from app.utils.money import to_cents
 
 
 class Checking1569Parser(BaseParser):
@@ -9,6 +9,8 @@ class Checking1569Parser(BaseParser):
     EXPECTED_COLUMNS = {"Date", "Transaction", "Name", "Memo", "Amount"}
 
     def parse(self, file_path: str) -> List[Dict]:
+        import pandas as pd
+
         df = pd.read_csv(file_path)
         df.columns = df.columns.str.strip()
         transactions = []
@@ -30,7 +32,7 @@ class Checking1569Parser(BaseParser):
                 "category": category,
                 "original_category": None,
                 "transaction_type": trans_type.lower().replace(" ", "_"),
-                "amount": abs(amount),
+                "amount": to_cents(abs(amount)),
                 "is_debit": is_debit,
                 "memo": memo,
                 "dedup_hash": self.make_dedup_hash(self.SOURCE_NAME, date_str, str(amount), name),
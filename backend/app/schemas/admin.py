@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Literal
+from pydantic import BaseModel, Field
+
+
+class ProfileArmRequest(BaseModel):
+    path: str  # raw request path, e.g. /api/loans/projections
+    count: int = Field(1, ge=1, le=100)
+    mode: Literal["cprofile", "sample"] = "cprofile"
+
+
+class SlowThresholdUpdate(BaseModel):
+    slow_request_ms: float = Field(ge=0)  # 0 turns automatic capture off
+
+
+class ArmedProfile(BaseModel):
+    path: str
+    mode: str
+    remaining: int
+
+
+class ProfilingState(BaseModel):
+    scope: str  # what a capture includes besides the profiled request
+    slow_request_ms: float
+    armed: list[ArmedProfile]
+
+
+class ProfileInfo(BaseModel):
+    name: str
+    size: int
+    created_at: datetime
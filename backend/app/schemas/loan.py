@@ -1,7 +1,8 @@
 from __future__ import annotations
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
 from typing import Optional
+from app.utils.money import Money, MoneyInput
 
 
 class LoanResponse(BaseModel):
@@ -9,10 +10,10 @@ class LoanResponse(BaseModel):
     name: str
     loan_type: str
     creditor: str | None
-    original_amount: float | None
-    current_balance: float
+    original_amount: Money | None
+    current_balance: Money
     interest_rate: float | None
-    monthly_payment: float | None
+    monthly_payment: Money | None
     end_date: date | None
     payments_remaining: int | None
     is_active: bool
@@ -26,10 +27,10 @@ class LoanCreate(BaseModel):
     name: str
     loan_type: str
     creditor: str | None = None
-    original_amount: float | None = None
-    current_balance: float
+    original_amount: MoneyInput | None = None
+    current_balance: MoneyInput
     interest_rate: float | None = None
-    monthly_payment: float | None = None
+    monthly_payment: MoneyInput | None = None
     end_date: date | None = None
     payments_remaining: int | None = None
     priority_rank: int | None = None
@@ -40,10 +41,10 @@ class LoanUpdate(BaseModel):
     name: str | None = None
     loan_type: str | None = None
     creditor: str | None = None
-    original_amount: float | None = None
-    current_balance: float | None = None
+    original_amount: MoneyInput | None = None
+    current_balance: MoneyInput | None = None
     interest_rate: float | None = None
-    monthly_payment: float | None = None
+    monthly_payment: MoneyInput | None = None
     end_date: date | None = None
     payments_remaining: int | None = None
     is_active: bool | None = None
@@ -51,12 +52,96 @@ class LoanUpdate(BaseModel):
     notes: str | None = None
 
 
+class LoanSummary(BaseModel):
+    total_debt: Money
+    mortgage_debt: Money
+    non_mortgage_debt: Money
+    monthly_payments: Money
+    active_loans: int
+
+
 class LoanPayoffProjection(BaseModel):
     loan_id: int
     loan_name: str
-    current_balance: float
-    monthly_payment: float
+    current_balance: Money
+    monthly_payment: Money
     interest_rate: float
     projected_payoff_date: date | None
-    total_interest_remaining: float
+    total_interest_remaining: Money
+    months_remaining: int
+
+
+class LoanScheduleRow(BaseModel):
+    month: int
+    payment_date: date
+    payment: Money
+    principal: Money
+    interest: Money
+    balance: Money
+
+
+class LoanSchedule(BaseModel):
+    loan_id: int
+    loan_name: str
+    current_balance: Money
+    monthly_payment: Money
+    interest_rate: float
     months_remaining: int
+    total_interest_remaining: Money
+    schedule: list[LoanScheduleRow]
+
+
+class LoanPayoffDate(BaseModel):
+    loan_id: int
+    loan_name: str
+    payoff_date: date | None
+    months: int | None
+
+
+class PayoffStrategyResult(BaseModel):
+    strategy: str
+    debt_free_date: date | None
+    months_to_debt_free: int | None
+    total_interest: Money
+    loan_payoffs: list[LoanPayoffDate]
+    balance_series: list[Money]
+
+
+class PayoffStrategyComparison(BaseModel):
+    extra_payment: Money
+    strategies: list[PayoffStrategyResult]
+
+
+class ScenarioSweepResponse(BaseModel):
+    extra_payments: list[Money]
+    refinance_rates: list[float]
+    payoff_months: list[list[int | None]]
+    total_interest: list[list[Money | None]]
+
+
+class LoanPaymentCreate(BaseModel):
+    amount: MoneyInput = Field(gt=0)
+    payment_date: date
+
+
+class LoanPaymentResponse(BaseModel):
+    id: int
+    loan_id: int
+    payment_date: date
+    amount: Money
+    principal_amount: Money | None
+    interest_amount: Money | None
+    balance_after: Money | None
+    transaction_id: int | None
+    is_projected: bool
+
+    class Config:
+        from_attributes = True
+
+
+class PaymentTimelineMonth(BaseModel):
+    month: str
+    amount: Money
+    principal: Money
+    interest: Money
+    payments: int
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from pydantic import BaseModel
 from datetime import date
+from app.utils.columnar import ColumnarList
+from app.utils.money import Money
 
 
 class WeekData(BaseModel):
@@ -8,10 +10,10 @@ class WeekData(BaseModel):
     week_start_date: date
     week_end_date: date
     phase_number: int
-    total_spent: float
-    discretionary_spent: float
-    debt_paid_down: float
-    emergency_fund_balance: float
+    total_spent: Money
+    discretionary_spent: Money
+    debt_paid_down: Money
+    emergency_fund_balance: Money
     is_on_track: bool | None
     status: str
 
@@ -36,16 +38,71 @@ class CalendarResponse(BaseModel):
     weeks: list[WeekData]
 
 
+class CalendarColumnarResponse(BaseModel):
+    """CalendarResponse for format=columnar: the weeks as columns of WeekData fields."""
+    current_week: int
+    total_weeks: int
+    progress_pct: float
+    phases: list[PhaseData]
+    weeks: ColumnarList
+
+
+class SpendingTrendPoint(BaseModel):
+    month: str
+    spent: Money
+    target: Money
+
+
+class AccountBalance(BaseModel):
+    source_id: int
+    name: str
+    type: str
+    balance: Money
+
+
 class DashboardResponse(BaseModel):
     current_week: int
     current_phase: int
     current_phase_name: str
     progress_pct: float
-    total_debt: float
-    non_mortgage_debt: float
-    month_spent: float
-    month_budget_target: float
-    month_variance: float
-    emergency_fund: float
-    debt_paid_this_month: float
-    spending_trend: list[dict]
+    total_debt: Money
+    non_mortgage_debt: Money
+    month_spent: Money
+    month_budget_target: Money
+    month_variance: Money
+    emergency_fund: Money
+    debt_paid_this_month: Money
+    spending_trend: list[SpendingTrendPoint]
+    account_balances: list[AccountBalance] = []
+
+
+class BudgetCategory(BaseModel):
+    category: str
+    target: Money
+    actual: Money
+    variance: Money
+    over_budget: bool
+
+
+class BudgetResponse(BaseModel):
+    month: str
+    phase: int
+    categories: list[BudgetCategory]
+    total_target: Money
+    total_actual: Money
+    total_variance: Money
+
+
+class MilestoneResponse(BaseModel):
+    id: int
+    phase_number: int | None
+    name: str
+    description: str | None
+    target_date: date | None
+    target_amount: Money | None
+    actual_date: date | None
+    actual_amount: Money | None
+    is_achieved: bool | None
+
+    class Config:
+        from_attributes = True
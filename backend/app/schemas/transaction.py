@@ -2,6 +2,8 @@ from __future__ import annotations
 from pydantic import BaseModel
 from datetime import date
 from typing import Optional
+from app.utils.columnar import ColumnarList
+from app.utils.money import Money, MoneyInput
 
 
 class TransactionResponse(BaseModel):
@@ -13,21 +15,40 @@ class TransactionResponse(BaseModel):
     merchant: str | None
     category: str | None
     transaction_type: str | None
-    amount: float
+    amount: Money
     is_debit: bool
     memo: str | None = None
+    is_excluded: bool = False
+    transfer_match_id: int | None = None
 
     class Config:
         from_attributes = True
 
 
+class TransactionPage(BaseModel):
+    total: int
+    page: int
+    per_page: int
+    pages: int
+    transactions: list[TransactionResponse]
+
+
+class TransactionColumnarPage(BaseModel):
+    """TransactionPage for format=columnar: the transactions as columns of TransactionResponse fields."""
+    total: int
+    page: int
+    per_page: int
+    pages: int
+    transactions: ColumnarList
+
+
 class TransactionFilter(BaseModel):
     source_id: int | None = None
     category: str | None = None
     date_from: date | None = None
     date_to: date | None = None
-    min_amount: float | None = None
-    max_amount: float | None = None
+    min_amount: MoneyInput | None = None
+    max_amount: MoneyInput | None = None
     search: str | None = None
     page: int = 1
     per_page: int = 50
@@ -45,11 +66,24 @@ class TransactionSourceResponse(BaseModel):
     type: str
     institution: str | None
     active: bool
+    opening_balance: Money | None = None
+    opening_balance_date: date | None = None
 
     class Config:
         from_attributes = True
 
 
+class TransactionSourceUpdate(BaseModel):
+    type: str | None = None
+    opening_balance: MoneyInput | None = None
+    opening_balance_date: date | None = None
+
+
+class BalancePoint(BaseModel):
+    date: date
+    balance: Money
+
+
 class ImportResponse(BaseModel):
     batch_id: str
     filename: str
@@ -58,3 +92,5 @@ class ImportResponse(BaseModel):
     rows_skipped: int
     date_range_start: date | None
     date_range_end: date | None
+    loan_payments_matched: int = 0
+    transfers_reconciled: int = 0
@@ -0,0 +1,115 @@
+"""Reference data: admin user, transaction sources, the plan with its phases and weeks, milestones.
+
+Inserted by migration 6, so written against the version 1 tables with money
+in dollars; migration 9 converts it to cents with everything else. Each
+seeder is idempotent and leaves committing to the caller.
+"""
+from datetime import date, timedelta
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Connection
+from app.migrations.frozen import (
+    financial_plan, milestones, plan_phases, transaction_sources, users, weekly_snapshots,
+)
+from app.utils.security import hash_password
+from app.config import get_settings
+
+
+def seed_admin(conn: Connection):
+    settings = get_settings()
+    existing = conn.execute(select(users.c.id).where(users.c.username == settings.ADMIN_USERNAME)).first()
+    if not existing:
+        conn.execute(insert(users).values(
+            username=settings.ADMIN_USERNAME,
+            password_hash=hash_password(settings.ADMIN_PASSWORD),
+        ))
+        print(f"Created admin user: {settings.ADMIN_USERNAME}")
+
+
+def seed_sources(conn: Connection):
+    sources = [
+        ("Credit Card A", "credit_card", "XXXX", "Bank A"),
+        ("Credit Card B", "credit_card", None, "Bank B"),
+        ("Credit Card C", "credit_card", "XXXX", "Bank C"),
+        ("Checking", "checking", "XXXX", "Bank A"),
+    ]
+    for name, stype, last4, inst in sources:
+        if not conn.execute(select(transaction_sources.c.id).where(transaction_sources.c.name == name)).first():
+            conn.execute(insert(transaction_sources).values(
+                name=name, type=stype, last_four=last4, institution=inst))
+
+
+def seed_plan(conn: Connection):
+    if conn.execute(select(financial_plan.c.id).where(financial_plan.c.is_active == True)).first():
+        return
+
+    start, total_weeks = date(2026, 2, 2), 252
+    plan_id = conn.execute(insert(financial_plan).values(
+        plan_name="Stop The Monkey",
+        start_date=start,
+        end_date=date(2030, 12, 28),
+        total_weeks=total_weeks,
+        total_months=58,
+        is_active=True,
+    )).inserted_primary_key[0]
+
+    phases = [
+        (1, "Stop the Bleeding", 1, 6, 1, 26, "#EF4444",
+         "Emergency fund + spending reduction",
+         "Build starter emergency fund. Cut discretionary spending. Remove credit cards from auto-pay."),
+        (2, "Debt Avalanche", 7, 24, 27, 104, "#F97316",
+         "Eliminate all non-mortgage debt",
+         "Pay off all credit cards, BNPL loans, auto loans, and personal loans using the avalanche method."),
+        (3, "Build the Fortress", 25, 42, 105, 182, "#3B82F6",
+         "12-month emergency fund + max retirement",
+         "Build full emergency fund. Contribute 15% to retirement. Fund education savings."),
+        (4, "Build the Runway", 43, 58, 183, 252, "#10B981",
+         "Accelerate mortgage + build runway",
+         "Extra mortgage principal payments. Build 12+ months of runway for potential career transition."),
+    ]
+    conn.execute(insert(plan_phases), [
+        {
+            "plan_id": plan_id, "phase_number": pnum, "name": name,
+            "start_month": sm, "end_month": em, "start_week": sw, "end_week": ew,
+            "color_code": color, "primary_goal": goal, "description": desc,
+        }
+        for pnum, name, sm, em, sw, ew, color, goal, desc in phases
+    ])
+
+    # --- Weekly Snapshots, one bulk insert ---
+    weeks = []
+    for week_num in range(1, total_weeks + 1):
+        week_start = start + timedelta(weeks=week_num - 1)
+        weeks.append({
+            "plan_id": plan_id,
+            "week_number": week_num,
+            "week_start_date": week_start,
+            "week_end_date": week_start + timedelta(days=6),
+            "phase_number": next(p[0] for p in phases if p[4] <= week_num <= p[5]),
+            "status": "future",
+        })
+    conn.execute(insert(weekly_snapshots), weeks)
+    print(f"Created plan with {len(weeks)} weekly snapshots")
+
+
+def seed_milestones(conn: Connection):
+    if conn.execute(select(milestones.c.id)).first():
+        return
+    rows = [  # target amounts in dollars
+        (1, "Starter Emergency Fund", "Build initial emergency fund", date(2026, 2, 28), 1000),
+        (1, "Freeze credit cards", "Remove cards from digital wallets", date(2026, 2, 14), None),
+        (1, "Cancel unnecessary subscriptions", "Keep only essential services", date(2026, 2, 21), None),
+        (1, "Reduce grocery spending", "Switch to budget-friendly stores", date(2026, 3, 1), None),
+        (1, "Spending reduction achieved", "Hit monthly spending target", date(2026, 7, 31), None),
+        (2, "All BNPL loans paid off", "BNPL loans eliminated", date(2027, 2, 28), 0),
+        (2, "All credit card debt eliminated", "CC balances at $0", date(2027, 6, 30), 0),
+        (2, "All non-mortgage debt eliminated", "Debt avalanche complete", date(2028, 1, 31), 0),
+        (3, "Full emergency fund", "12 months expenses in HYSA", date(2029, 7, 31), None),
+        (3, "15% retirement contributions", "Max retirement accounts", date(2028, 6, 30), None),
+        (4, "12+ months runway built", "Ready for career transition", date(2030, 12, 31), None),
+    ]
+    conn.execute(insert(milestones), [
+        {"phase_number": phase, "name": name, "description": desc,
+         "target_date": target_date, "target_amount": amount, "is_achieved": False}
+        for phase, name, desc, target_date, amount in rows
+    ])
+    print("Seeded milestones")
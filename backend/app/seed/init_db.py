@@ -1,131 +1,105 @@
-"""Initialize the database with tables, admin user, plan data, and milestones."""
-from datetime import date, timedelta
-from app.database import engine, SessionLocal, Base
-from app.models import *  # noqa — imports all models so Base knows about them
+"""Initialize the database: apply pending schema migrations and seed reference data.
+
+    python -m app.seed.init_db
+    python -m app.seed.init_db add-user alice --household smith
+    python -m app.seed.init_db move-to-household smith
+"""
+import argparse
+import getpass
+import os
+import sqlite3
+from app.database import engine, SessionLocal
+from app.migrations.runner import run_migrations
+from app.migrations.versions import MIGRATIONS
+from app.models.user import User
+from app.services.households import household_key, households
+from app.utils.cache_versions import cache_versions
 from app.utils.security import hash_password
-from app.config import get_settings
 
 
 def init_database():
-    settings = get_settings()
-
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
+    run_migrations(engine, MIGRATIONS)
+    if households is not None:
+        households.migrate_all()
 
-    try:
-        # --- Admin user ---
-        existing = db.query(User).filter(User.username == settings.ADMIN_USERNAME).first()
-        if not existing:
-            user = User(
-                username=settings.ADMIN_USERNAME,
-                password_hash=hash_password(settings.ADMIN_PASSWORD),
-            )
-            db.add(user)
-            db.commit()
-            print(f"Created admin user: {settings.ADMIN_USERNAME}")
 
-        # --- Transaction sources ---
-        sources = [
-            ("Credit Card A", "credit_card", "XXXX", "Bank A"),
-            ("Credit Card B", "credit_card", None, "Bank B"),
-            ("Credit Card C", "credit_card", "XXXX", "Bank C"),
-            ("Checking", "checking", "XXXX", "Bank A"),
-        ]
-        for name, stype, last4, inst in sources:
-            if not db.query(TransactionSource).filter(TransactionSource.name == name).first():
-                db.add(TransactionSource(name=name, type=stype, last_four=last4, institution=inst))
+def add_user(username: str, password: str, household: str | None = None) -> User:
+    """Create a login; in household tenancy its household's database is created too."""
+    with SessionLocal() as db:
+        if db.query(User).filter(User.username == username).first():
+            raise ValueError(f"User {username!r} already exists")
+        user = User(username=username, password_hash=hash_password(password), household=household)
+        if household:
+            household_key(user)  # rejects an unusable name before anything is written
+        db.add(user)
+        cache_versions.bump(db, "auth")
         db.commit()
+        db.refresh(user)
+        db.expunge(user)
+    if households is not None:
+        households.migrate(household_key(user))
+    return user
 
-        # --- Financial Plan ---
-        plan = db.query(FinancialPlan).filter(FinancialPlan.is_active == True).first()
-        if not plan:
-            plan = FinancialPlan(
-                plan_name="Stop The Monkey",
-                start_date=date(2026, 2, 2),
-                end_date=date(2030, 12, 28),
-                total_weeks=252,
-                total_months=58,
-                is_active=True,
-            )
-            db.add(plan)
-            db.commit()
-            db.refresh(plan)
-
-            # --- Plan Phases ---
-            phases = [
-                (1, "Stop the Bleeding", 1, 6, 1, 26, "#EF4444",
-                 "Emergency fund + spending reduction",
-                 "Build starter emergency fund. Cut discretionary spending. Remove credit cards from auto-pay."),
-                (2, "Debt Avalanche", 7, 24, 27, 104, "#F97316",
-                 "Eliminate all non-mortgage debt",
-                 "Pay off all credit cards, BNPL loans, auto loans, and personal loans using the avalanche method."),
-                (3, "Build the Fortress", 25, 42, 105, 182, "#3B82F6",
-                 "12-month emergency fund + max retirement",
-                 "Build full emergency fund. Contribute 15% to retirement. Fund education savings."),
-                (4, "Build the Runway", 43, 58, 183, 252, "#10B981",
-                 "Accelerate mortgage + build runway",
-                 "Extra mortgage principal payments. Build 12+ months of runway for potential career transition."),
-            ]
-            for pnum, name, sm, em, sw, ew, color, goal, desc in phases:
-                db.add(PlanPhase(
-                    plan_id=plan.id, phase_number=pnum, name=name,
-                    start_month=sm, end_month=em, start_week=sw, end_week=ew,
-                    color_code=color, primary_goal=goal, description=desc,
-                ))
-            db.commit()
 
-            # --- Weekly Snapshots (252 weeks) ---
-            plan_start = date(2026, 2, 2)
-            for week_num in range(1, 253):
-                week_start = plan_start + timedelta(weeks=week_num - 1)
-                week_end = week_start + timedelta(days=6)
-                if week_num <= 26:
-                    phase = 1
-                elif week_num <= 104:
-                    phase = 2
-                elif week_num <= 182:
-                    phase = 3
-                else:
-                    phase = 4
-                db.add(WeeklySnapshot(
-                    plan_id=plan.id,
-                    week_number=week_num,
-                    week_start_date=week_start,
-                    week_end_date=week_end,
-                    phase_number=phase,
-                    status="future",
-                ))
-            db.commit()
-            print("Created plan with 252 weekly snapshots")
+def move_to_household(household: str, usernames: list[str] | None = None) -> list[str]:
+    """Copy the shared database into a new household and assign users to it.
 
-        # --- Milestones ---
-        if not db.query(Milestone).first():
-            milestones = [
-                (1, "Starter Emergency Fund", "Build initial emergency fund", date(2026, 2, 28), 1000),
-                (1, "Freeze credit cards", "Remove cards from digital wallets", date(2026, 2, 14), None),
-                (1, "Cancel unnecessary subscriptions", "Keep only essential services", date(2026, 2, 21), None),
-                (1, "Reduce grocery spending", "Switch to budget-friendly stores", date(2026, 3, 1), None),
-                (1, "Spending reduction achieved", "Hit monthly spending target", date(2026, 7, 31), None),
-                (2, "All BNPL loans paid off", "BNPL loans eliminated", date(2027, 2, 28), 0),
-                (2, "All credit card debt eliminated", "CC balances at $0", date(2027, 6, 30), 0),
-                (2, "All non-mortgage debt eliminated", "Debt avalanche complete", date(2028, 1, 31), 0),
-                (3, "Full emergency fund", "12 months expenses in HYSA", date(2029, 7, 31), None),
-                (3, "15% retirement contributions", "Max retirement accounts", date(2028, 6, 30), None),
-                (4, "12+ months runway built", "Ready for career transition", date(2030, 12, 31), None),
-            ]
-            for phase, name, desc, target_date, amount in milestones:
-                db.add(Milestone(
-                    phase_number=phase, name=name, description=desc,
-                    target_date=target_date, target_amount=amount,
-                ))
-            db.commit()
-            print("Seeded milestones")
+    For switching an existing install to household tenancy, whose data is in
+    DATABASE_URL. Without `usernames`, every user without a household moves.
+    The shared database keeps its rows; household tenancy no longer reads them.
+    """
+    if households is None:
+        raise ValueError("Set TENANCY_MODE=household first")
+    path = households.path_for(household)
+    if os.path.exists(path):
+        raise ValueError(f"Household {household!r} already has a database at {path}")
+    with SessionLocal() as db:
+        query = db.query(User)
+        if usernames:
+            users = query.filter(User.username.in_(usernames)).all()
+            missing = set(usernames) - {u.username for u in users}
+            if missing:
+                raise ValueError(f"No such user: {', '.join(sorted(missing))}")
+        else:
+            users = query.filter(User.household.is_(None)).all()
+        for user in users:
+            user.household = household
+            household_key(user)
 
-    finally:
-        db.close()
+        # Copy before the assignment commits, so no user points at a database that isn't there
+        os.makedirs(households.directory, exist_ok=True)
+        source, target = sqlite3.connect(engine.url.database), sqlite3.connect(path)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+        # Cached logins still carry the old household
+        cache_versions.bump(db, "auth")
+        db.commit()
+        moved = [u.username for u in users]
+    households.migrate(household)
+    return moved
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the database, add a user, or move data into a household.")
+    commands = parser.add_subparsers(dest="command")
+    add = commands.add_parser("add-user")
+    add.add_argument("username")
+    add.add_argument("--household", help="household sharing a database; defaults to one of the user's own")
+    move = commands.add_parser("move-to-household", help="copy the shared database's data into a household")
+    move.add_argument("household")
+    move.add_argument("--user", action="append", dest="usernames", help="user to assign; default all without one")
+    args = parser.parse_args()
+
     init_database()
-    print("Database initialized successfully.")
+    if args.command == "add-user":
+        password = getpass.getpass(f"Password for {args.username}: ")
+        user = add_user(args.username, password, args.household)
+        print(f"Created user {user.username} in household {household_key(user)}")
+    elif args.command == "move-to-household":
+        moved = move_to_household(args.household, args.usernames)
+        print(f"Copied the shared database into household {args.household}; assigned {', '.join(moved) or 'no users'}")
+    else:
+        print("Database initialized successfully.")
@@ -0,0 +1,92 @@
+"""Closed-form amortization math for loan projections and schedules."""
+from __future__ import annotations
+import numpy as np
+
+MAX_MONTHS = 600
+
+# Guards ceil() against float noise when a balance pays off on an exact month boundary.
+_NPER_EPSILON = 1e-9
+
+
+def months_to_payoff(balances, rates, payments) -> np.ndarray:
+    """Number of monthly payments (NPER, rounded up) for each loan.
+
+    Loans whose payment does not cover the monthly interest never amortize and
+    are reported as MAX_MONTHS.
+    """
+    balances = np.asarray(balances, dtype=float)
+    monthly_rates = np.asarray(rates, dtype=float) / 12
+    payments = np.asarray(payments, dtype=float)
+
+    months = np.full(balances.shape, MAX_MONTHS, dtype=np.int64)
+    months[balances <= 0] = 0
+
+    amortizing = (balances > 0) & (payments > balances * monthly_rates)
+    zero_rate = amortizing & (monthly_rates == 0)
+    with_rate = amortizing & (monthly_rates > 0)
+
+    months[zero_rate] = np.ceil(balances[zero_rate] / payments[zero_rate] - _NPER_EPSILON)
+
+    r = monthly_rates[with_rate]
+    nper = -np.log1p(-r * balances[with_rate] / payments[with_rate]) / np.log1p(r)
+    months[with_rate] = np.ceil(nper - _NPER_EPSILON)
+
+    return np.minimum(months, MAX_MONTHS)
+
+
+def balance_after(balances, rates, payments, months) -> np.ndarray:
+    """Remaining balance after `months` full payments."""
+    balances = np.asarray(balances, dtype=float)
+    monthly_rates = np.asarray(rates, dtype=float) / 12
+    payments = np.asarray(payments, dtype=float)
+    months = np.asarray(months, dtype=float)
+
+    growth = np.power(1 + monthly_rates, months)
+    safe_rates = np.where(monthly_rates > 0, monthly_rates, 1.0)
+    annuity = np.where(monthly_rates > 0, (growth - 1) / safe_rates, months)
+    return balances * growth - payments * annuity
+
+
+def project_loans(balances, rates, payments) -> tuple[np.ndarray, np.ndarray]:
+    """Months remaining and total interest remaining for every loan at once.
+
+    Total interest is what is paid beyond the principal: every full payment
+    plus the final partial payment, minus the starting balance.
+    """
+    balances = np.asarray(balances, dtype=float)
+    rates = np.asarray(rates, dtype=float)
+    payments = np.asarray(payments, dtype=float)
+
+    months = months_to_payoff(balances, rates, payments)
+    paid_off = (months > 0) & (months < MAX_MONTHS)
+
+    before_last = balance_after(balances, rates, payments, np.maximum(months - 1, 0))
+    final_payment = before_last * (1 + rates / 12)
+    interest = np.where(paid_off, (months - 1) * payments + final_payment - balances, 0.0)
+    return months, np.maximum(interest, 0.0)
+
+
+def amortization_schedule(balance: float, rate: float, payment: float) -> dict[str, np.ndarray]:
+    """Month-by-month payment, principal, interest and balance arrays for one loan."""
+    months = int(months_to_payoff([balance], [rate], [payment])[0])
+    if months == 0 or months >= MAX_MONTHS:
+        empty = np.zeros(0)
+        return {"month": empty.astype(np.int64), "payment": empty, "principal": empty,
+                "interest": empty, "balance": empty}
+
+    month_index = np.arange(1, months + 1)
+    opening = balance_after(balance, rate, payment, month_index - 1)
+    interest = opening * (rate / 12)
+    payments = np.full(months, float(payment))
+    payments[-1] = opening[-1] + interest[-1]
+    principal = payments - interest
+    closing = np.maximum(opening - principal, 0.0)
+    closing[-1] = 0.0
+
+    return {
+        "month": month_index,
+        "payment": payments,
+        "principal": principal,
+        "interest": interest,
+        "balance": closing,
+    }
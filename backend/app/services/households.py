@@ -0,0 +1,163 @@
+"""Household tenancy: one SQLite database per household, opened on demand and closed when cold."""
+from __future__ import annotations
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app import database
+from app.config import get_settings
+from app.database import create_async_db_engine, create_db_engine, sqlite_pragmas
+from app.migrations.runner import run_migrations
+from app.migrations.versions import MIGRATIONS
+from app.services.plan_calendar import plan_calendars
+from app.utils.metrics import household_closes, household_opens, household_pool_open
+
+_KEY = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def household_key(user) -> str:
+    """The user's household, or a household of their own when none is assigned."""
+    key = user.household or f"user-{user.id}"
+    if not _KEY.match(key):
+        raise ValueError(f"Invalid household name {key!r}")
+    return key
+
+
+class Household:
+    """Engines and session factories for one database.
+
+    With `url` None this wraps the application's own engines from app.database,
+    which is how single tenancy serves every user from DATABASE_URL.
+    """
+
+    def __init__(self, key: str | None, url: str | None = None):
+        self.key = key
+        if url is None:
+            self.engine, self.read_engine = database.engine, database.read_engine
+            self.async_engine, self.async_read_engine = database.async_engine, database.async_read_engine
+            self.SessionLocal, self.ReadSessionLocal = database.SessionLocal, database.ReadSessionLocal
+            self.AsyncSessionLocal = database.AsyncSessionLocal
+            self.AsyncReadSessionLocal = database.AsyncReadSessionLocal
+            self.migrated = True  # init_database() ran at startup
+        else:
+            self.engine = create_db_engine(url, sqlite_pragmas())
+            self.read_engine = create_db_engine(url, sqlite_pragmas(readonly=True))
+            self.async_engine = create_async_db_engine(url, sqlite_pragmas())
+            self.async_read_engine = create_async_db_engine(url, sqlite_pragmas(readonly=True))
+            self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            self.ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
+            self.AsyncSessionLocal = async_sessionmaker(
+                self.async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            self.AsyncReadSessionLocal = async_sessionmaker(
+                self.async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+            self.migrated = False
+        self.database = self.engine.url.database
+        self.leases = 0
+        self._migrate_lock = threading.Lock()
+
+    @property
+    def sync_engines(self):
+        return (self.engine, self.read_engine, self.async_engine.sync_engine, self.async_read_engine.sync_engine)
+
+    def migrate(self):
+        with self._migrate_lock:
+            if not self.migrated:
+                run_migrations(self.engine, MIGRATIONS)
+                self.migrated = True
+
+    async def close(self):
+        # Sessions still holding a connection keep it until they close; the pools are discarded
+        self.engine.dispose()
+        self.read_engine.dispose()
+        await self.async_engine.dispose()
+        await self.async_read_engine.dispose()
+        plan_calendars.discard(self.database)
+
+
+class HouseholdPool:
+    """Open household databases in least-recently-used order.
+
+    Requests lease a household for their duration. Once more than `size` are
+    open, idle ones are evicted oldest first and handed back to the releasing
+    caller to close; leased households are never evicted, so a burst can
+    briefly exceed `size`.
+    """
+
+    def __init__(self, directory: str, size: int):
+        self.directory = directory
+        self.size = size
+        self._open: OrderedDict[str, Household] = OrderedDict()
+        self._lock = threading.Lock()
+        self._on_open: list[Callable[[Household], None]] = []
+        self._current: set[str] = set()  # brought up to date by this process; reopening skips the check
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.db")
+
+    def url_for(self, key: str) -> str:
+        return f"sqlite:///{self.path_for(key)}"
+
+    def on_open(self, fn: Callable[[Household], None]):
+        self._on_open.append(fn)
+
+    def acquire(self, key: str) -> Household:
+        with self._lock:
+            household = self._open.get(key)
+            if household is None:
+                household = self._open[key] = Household(key, self.url_for(key))
+                household.migrated = key in self._current
+                for fn in self._on_open:
+                    fn(household)
+                household_opens.inc()
+                household_pool_open.set(value=len(self._open))
+            self._open.move_to_end(key)
+            household.leases += 1
+            return household
+
+    def release(self, household: Household) -> list[Household]:
+        """Return a lease; yields the idle households evicted to make room, for the caller to close."""
+        with self._lock:
+            household.leases -= 1
+            evicted = []
+            for key in list(self._open):
+                if len(self._open) <= self.size:
+                    break
+                if self._open[key].leases == 0:
+                    evicted.append(self._open.pop(key))
+            if evicted:
+                household_closes.inc(amount=len(evicted))
+                household_pool_open.set(value=len(self._open))
+            return evicted
+
+    def ensure_migrated(self, household: Household):
+        household.migrate()
+        self._current.add(household.key)
+
+    def migrate(self, key: str):
+        """Create or upgrade one household's database outside the pool."""
+        os.makedirs(self.directory, exist_ok=True)
+        engine = create_db_engine(self.url_for(key), sqlite_pragmas())
+        try:
+            run_migrations(engine, MIGRATIONS)
+        finally:
+            engine.dispose()
+        self._current.add(key)
+
+    def migrate_all(self) -> int:
+        """Upgrade every household database on disk; run before serving so workers don't race."""
+        os.makedirs(self.directory, exist_ok=True)
+        keys = sorted(name[:-3] for name in os.listdir(self.directory) if name.endswith(".db"))
+        for key in keys:
+            self.migrate(key)
+        return len(keys)
+
+
+_settings = get_settings()
+shared_household = Household(None)
+households = (
+    HouseholdPool(_settings.HOUSEHOLD_DB_DIR, _settings.HOUSEHOLD_POOL_SIZE)
+    if _settings.TENANCY_MODE == "household" else None
+)
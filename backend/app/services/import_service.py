@@ -1,26 +1,32 @@
+import csv
+import time
 import uuid
-import pandas as pd
 from sqlalchemy.orm import Session
 from app.models.transaction import Transaction, TransactionSource, ImportBatch
-from app.parsers.credit_card_6032 import CreditCard6032Parser
-from app.parsers.apple_card import AppleCardParser
-from app.parsers.amex import AmexParser
-from app.parsers.checking_1569 import Checking1569Parser
-
-
-PARSERS = [CreditCard6032Parser, AppleCardParser, AmexParser, Checking1569Parser]
+from app.parsers import PARSERS
+from app.services.loan_matcher import LoanMatcher
+from app.services.reconciliation import ReconciliationService
+from app.services.ledger import LedgerService
+from app.services.plan_calendar import PlanCalendar, plan_calendars
+from app.utils.metrics import import_rows, import_batch_seconds, import_rows_per_second
 
 
 class ImportService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, calendar: PlanCalendar | None = None):
         self.db = db
+        self.calendar = calendar
 
-    def detect_parser(self, file_path: str):
-        df = pd.read_csv(file_path, nrows=1, dtype=str)
-        columns = set(c.strip() for c in df.columns)
-        for parser_cls in PARSERS:
-            if parser_cls.EXPECTED_COLUMNS.issubset(columns):
-                return parser_cls()
+    def detect_parser(self, file_path: str, filename: str = ""):
+        with open(file_path, newline="", encoding="utf-8-sig") as f:
+            header = next(csv.reader(f), [])
+        columns = set(c.strip() for c in header)
+        matches = [p for p in PARSERS if p.EXPECTED_COLUMNS.issubset(columns)]
+        if len(matches) > 1:
+            # Checking 1569 and Credit Card 6032 share a header; the account digits in the filename decide
+            hinted = [p for p in matches if p.SOURCE_NAME.split()[-1] in filename]
+            matches = hinted or matches
+        if matches:
+            return matches[0]()
         raise ValueError(
             f"Unknown CSV format. Columns found: {columns}. "
             f"Supported formats: Credit Card 6032, Apple Card, AMEX, Checking 1569"
@@ -43,7 +49,8 @@ class ImportService:
         return source
 
     def import_csv(self, file_path: str, file_hash: str, filename: str) -> dict:
-        parser = self.detect_parser(file_path)
+        started = time.perf_counter()
+        parser = self.detect_parser(file_path, filename)
         source = self.get_or_create_source(parser)
         raw_transactions = parser.parse(file_path)
 
@@ -55,6 +62,7 @@ class ImportService:
             ).all()
         )
 
+        calendar = self.calendar or plan_calendars.get(self.db)
         batch_id = str(uuid.uuid4())
         imported = 0
         skipped = 0
@@ -72,6 +80,7 @@ class ImportService:
                 import_batch_id=batch_id,
                 dedup_hash=dedup,
                 **txn_data,
+                **calendar.period_keys(txn_data["transaction_date"]),
             )
             self.db.add(txn)
             imported += 1
@@ -94,8 +103,20 @@ class ImportService:
             date_range_end=max_date,
         )
         self.db.add(batch)
+        if imported:
+            self.db.flush()
+            LedgerService(self.db).apply_batch(source.id, batch_id)
         self.db.commit()
 
+        loan_payments = LoanMatcher(self.db).match_batch(batch_id) if imported else 0
+        transfers = ReconciliationService(self.db).reconcile_batch(batch_id) if imported else 0
+
+        elapsed = time.perf_counter() - started
+        import_rows.inc(source.name, "imported", amount=imported)
+        import_rows.inc(source.name, "skipped", amount=skipped)
+        import_batch_seconds.observe(source.name, value=elapsed)
+        import_rows_per_second.set(source.name, value=(imported + skipped) / elapsed if elapsed else 0.0)
+
         return {
             "batch_id": batch_id,
             "filename": filename,
@@ -104,4 +125,6 @@ class ImportService:
             "rows_skipped": skipped,
             "date_range_start": min_date,
             "date_range_end": max_date,
+            "loan_payments_matched": loan_payments,
+            "transfers_reconciled": transfers,
         }
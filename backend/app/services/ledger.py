@@ -0,0 +1,140 @@
+"""Running-balance ledger per transaction source, kept as daily cumulative sums in cents."""
+from __future__ import annotations
+from datetime import date
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction, TransactionSource, SourceDailyBalance
+
+# Money in is positive, money out negative; card balances therefore read as negative (owed).
+SIGNED_AMOUNT = case((Transaction.is_debit == True, -Transaction.amount), else_=Transaction.amount)
+
+
+class LedgerService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _daily_net(self, source_id: int, *filters) -> dict[date, int]:
+        rows = (
+            self.db.query(Transaction.transaction_date, func.sum(SIGNED_AMOUNT))
+            .filter(Transaction.source_id == source_id, *filters)
+            .group_by(Transaction.transaction_date)
+            .all()
+        )
+        return {d: int(net) for d, net in rows}
+
+    def _apply(self, source_id: int, changes: dict[date, int]):
+        """Fold per-day deltas into the ledger, re-accumulating only from the earliest changed day."""
+        if not changes:
+            return
+        start = min(changes)
+        previous = (
+            self.db.query(SourceDailyBalance.cumulative)
+            .filter(SourceDailyBalance.source_id == source_id, SourceDailyBalance.balance_date < start)
+            .order_by(SourceDailyBalance.balance_date.desc())
+            .limit(1)
+            .scalar()
+        ) or 0
+        rows = {
+            r.balance_date: r
+            for r in self.db.query(SourceDailyBalance).filter(
+                SourceDailyBalance.source_id == source_id,
+                SourceDailyBalance.balance_date >= start,
+            )
+        }
+        for day, delta in changes.items():
+            row = rows.get(day)
+            if row is None:
+                row = SourceDailyBalance(source_id=source_id, balance_date=day, net_change=0, cumulative=0)
+                self.db.add(row)
+                rows[day] = row
+            row.net_change += delta
+
+        running = previous
+        for day in sorted(rows):
+            running += rows[day].net_change
+            rows[day].cumulative = running
+
+    def apply_batch(self, source_id: int, batch_id: str):
+        """Add a freshly imported batch to its source's ledger. Caller commits."""
+        self._apply(source_id, self._daily_net(source_id, Transaction.import_batch_id == batch_id))
+
+    def rebuild(self, source_id: int):
+        self.db.query(SourceDailyBalance).filter(SourceDailyBalance.source_id == source_id).delete()
+        self._apply(source_id, self._daily_net(source_id))
+
+    def rebuild_missing(self) -> int:
+        """Build ledgers for sources that have transactions but no ledger rows yet."""
+        with_ledger = self.db.query(SourceDailyBalance.source_id).distinct()
+        source_ids = [
+            s for (s,) in self.db.query(Transaction.source_id)
+            .filter(Transaction.source_id.notin_(with_ledger))
+            .distinct()
+        ]
+        for source_id in source_ids:
+            self.rebuild(source_id)
+        return len(source_ids)
+
+    def _cumulative_on(self, source_id: int, on: date) -> int:
+        return (
+            self.db.query(SourceDailyBalance.cumulative)
+            .filter(SourceDailyBalance.source_id == source_id, SourceDailyBalance.balance_date <= on)
+            .order_by(SourceDailyBalance.balance_date.desc())
+            .limit(1)
+            .scalar()
+        ) or 0
+
+    def _anchor(self, source: TransactionSource) -> int:
+        """Ledger value that corresponds to the user-entered opening balance."""
+        opening = source.opening_balance or 0
+        if source.opening_balance_date is None:
+            return opening
+        return opening - self._cumulative_on(source.id, source.opening_balance_date)
+
+    def balance_on(self, source: TransactionSource, on: date) -> int:
+        return self._anchor(source) + self._cumulative_on(source.id, on)
+
+    def _cumulative_on_many(self, source_ids: list[int], on: date) -> dict[int, int]:
+        latest = (
+            self.db.query(SourceDailyBalance.source_id, func.max(SourceDailyBalance.balance_date).label("balance_date"))
+            .filter(SourceDailyBalance.source_id.in_(source_ids), SourceDailyBalance.balance_date <= on)
+            .group_by(SourceDailyBalance.source_id)
+            .subquery()
+        )
+        rows = self.db.query(SourceDailyBalance.source_id, SourceDailyBalance.cumulative).join(
+            latest,
+            (SourceDailyBalance.source_id == latest.c.source_id)
+            & (SourceDailyBalance.balance_date == latest.c.balance_date),
+        )
+        return dict(rows.all())
+
+    def balances_on(self, sources: list[TransactionSource], on: date) -> dict[int, int]:
+        """balance_on for many sources with one query, plus one per distinct opening-balance date."""
+        cumulative = self._cumulative_on_many([s.id for s in sources], on)
+        by_anchor_date: dict[date, list[int]] = {}
+        for s in sources:
+            if s.opening_balance_date is not None:
+                by_anchor_date.setdefault(s.opening_balance_date, []).append(s.id)
+        at_anchor: dict[int, int] = {}
+        for anchor_date, ids in by_anchor_date.items():
+            at_anchor.update(self._cumulative_on_many(ids, anchor_date))
+        return {
+            s.id: (s.opening_balance or 0) - at_anchor.get(s.id, 0) + cumulative.get(s.id, 0)
+            for s in sources
+        }
+
+    def series(self, source: TransactionSource, date_from: date, date_to: date) -> list[dict]:
+        """Balance at date_from followed by every day in range on which it changed."""
+        anchor = self._anchor(source)
+        rows = (
+            self.db.query(SourceDailyBalance.balance_date, SourceDailyBalance.cumulative)
+            .filter(
+                SourceDailyBalance.source_id == source.id,
+                SourceDailyBalance.balance_date > date_from,
+                SourceDailyBalance.balance_date <= date_to,
+            )
+            .order_by(SourceDailyBalance.balance_date)
+            .all()
+        )
+        points = [{"date": date_from, "balance": anchor + self._cumulative_on(source.id, date_from)}]
+        points += [{"date": d, "balance": anchor + c} for d, c in rows]
+        return points
@@ -0,0 +1,109 @@
+"""Links imported debit transactions to the loans they pay."""
+from __future__ import annotations
+from collections import defaultdict
+from datetime import date
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.loan import Loan, LoanPayment
+from app.models.transaction import Transaction
+from app.services.loan_projection import record_payment, regenerate_projection
+
+# Categories the checking parser gives loan payments
+LOAN_PAYMENT_CATEGORIES = ("Mortgage", "Auto Loan", "Personal Loan", "BNPL Payment")
+
+
+class LoanMatcher:
+    def __init__(self, db: Session):
+        self.db = db
+        settings = get_settings()
+        self.amount_tolerance = settings.LOAN_MATCH_AMOUNT_TOLERANCE
+        self.day_window = settings.LOAN_MATCH_DAY_WINDOW
+
+    def build_index(self, loans: list[Loan]) -> dict[str, list[tuple[str, Loan]]]:
+        """Map the first word of each creditor to (full creditor, loan) pairs."""
+        index = defaultdict(list)
+        for loan in loans:
+            creditor = (loan.creditor or "").strip().upper()
+            if not creditor:
+                continue
+            index[creditor.split()[0]].append((creditor, loan))
+        return index
+
+    def _amount_matches(self, loan: Loan, amount: float) -> bool:
+        if not loan.monthly_payment:
+            return False
+        return abs(amount - loan.monthly_payment) <= loan.monthly_payment * self.amount_tolerance
+
+    def _day_matches(self, loan: Loan, txn_date: date) -> bool:
+        if not loan.payment_day:
+            return True
+        distance = abs(txn_date.day - loan.payment_day)
+        return min(distance, 31 - distance) <= self.day_window
+
+    def find_loan(self, index: dict, txn: Transaction) -> Loan | None:
+        description = (txn.description or "").upper()
+        best = None
+        for token in set(description.split()):
+            for creditor, loan in index.get(token, ()):
+                if creditor not in description:
+                    continue
+                if not self._amount_matches(loan, txn.amount) or not self._day_matches(loan, txn.transaction_date):
+                    continue
+                diff = abs(txn.amount - loan.monthly_payment)
+                if best is None or diff < best[0]:
+                    best = (diff, loan)
+        return best[1] if best else None
+
+    def match_batch(self, batch_id: str) -> int:
+        """Link the batch's loan payments to their loans.
+
+        Only payments dated after the loan's balance_date reduce the balance;
+        older ones are already reflected in it and are linked without booking.
+        Future-dated rows are left alone.
+        """
+        loans = self.db.query(Loan).filter(Loan.is_active == True).all()
+        index = self.build_index(loans)
+        if not index:
+            return 0
+
+        already_linked = self.db.query(LoanPayment.transaction_id).filter(
+            LoanPayment.transaction_id.isnot(None)
+        )
+        candidates = (
+            self.db.query(Transaction)
+            .filter(
+                Transaction.import_batch_id == batch_id,
+                Transaction.is_debit == True,
+                Transaction.category.in_(LOAN_PAYMENT_CATEGORIES),
+                Transaction.transaction_date <= date.today(),
+                Transaction.id.notin_(already_linked),
+            )
+            .order_by(Transaction.transaction_date, Transaction.id)
+            .all()
+        )
+
+        touched = {}
+        matched = 0
+        for txn in candidates:
+            loan = self.find_loan(index, txn)
+            if loan is None:
+                continue
+            if loan.balance_date is None or txn.transaction_date <= loan.balance_date:
+                self.db.add(LoanPayment(
+                    loan_id=loan.id,
+                    payment_date=txn.transaction_date,
+                    amount=txn.amount,
+                    transaction_id=txn.id,
+                    is_projected=False,
+                ))
+            else:
+                record_payment(self.db, loan, txn.amount, txn.transaction_date, transaction_id=txn.id, regenerate=False)
+                touched[loan.id] = loan
+            matched += 1
+
+        for loan in touched.values():
+            if loan.current_balance <= 0:
+                loan.is_active = False
+            regenerate_projection(self.db, loan)
+        self.db.commit()
+        return matched
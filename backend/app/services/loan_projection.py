@@ -0,0 +1,101 @@
+"""Persisted projected LoanPayment rows, regenerated per loan when it changes."""
+from __future__ import annotations
+import calendar
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.loan import Loan, LoanPayment
+from app.services.amortization import amortization_schedule
+
+
+def first_payment_date(loan: Loan, after: date) -> date:
+    """Next scheduled payment strictly after `after`, honoring payment_day when set."""
+    if not loan.payment_day:
+        return after + relativedelta(months=1)
+    candidate = after
+    for _ in range(2):
+        last_day = calendar.monthrange(candidate.year, candidate.month)[1]
+        due = candidate.replace(day=min(loan.payment_day, last_day))
+        if due > after:
+            return due
+        candidate = (candidate.replace(day=1) + relativedelta(months=1))
+    return after + relativedelta(months=1)
+
+
+def regenerate_projection(db: Session, loan: Loan, after: date | None = None) -> int:
+    """Replace the loan's projected rows with a fresh schedule. Caller commits."""
+    db.query(LoanPayment).filter(
+        LoanPayment.loan_id == loan.id,
+        LoanPayment.is_projected == True,
+    ).delete(synchronize_session=False)
+
+    if not loan.is_active:
+        return 0
+
+    schedule = amortization_schedule(loan.current_balance, loan.interest_rate or 0, loan.monthly_payment or 0)
+    if not len(schedule["month"]):
+        return 0
+
+    first = first_payment_date(loan, after or date.today())
+    rows = [
+        {
+            "loan_id": loan.id,
+            "payment_date": first + relativedelta(months=int(m) - 1),
+            "amount": round(float(p)),
+            "principal_amount": round(float(pr)),
+            "interest_amount": round(float(i)),
+            "balance_after": round(float(b)),
+            "is_projected": True,
+        }
+        for m, p, pr, i, b in zip(
+            schedule["month"], schedule["payment"], schedule["principal"],
+            schedule["interest"], schedule["balance"],
+        )
+    ]
+    db.execute(insert(LoanPayment), rows)
+    return len(rows)
+
+
+def regenerate_missing(db: Session) -> int:
+    """Materialize schedules for active loans that have no projected rows yet."""
+    projected = db.query(LoanPayment.loan_id).filter(LoanPayment.is_projected == True).distinct()
+    loans = db.query(Loan).filter(Loan.is_active == True, Loan.id.notin_(projected)).all()
+    for loan in loans:
+        regenerate_projection(db, loan)
+    return len(loans)
+
+
+def record_payment(
+    db: Session,
+    loan: Loan,
+    amount: int,
+    payment_date: date,
+    transaction_id: int | None = None,
+    regenerate: bool = True,
+) -> LoanPayment:
+    """Book an actual payment of `amount` cents: split it, reduce the balance and refresh the projection.
+
+    Pass regenerate=False when booking several payments for the same loan and
+    call regenerate_projection once afterwards.
+    """
+    interest = min(round(loan.current_balance * (loan.interest_rate or 0) / 12), amount)
+    principal = min(amount - interest, loan.current_balance)
+    loan.current_balance -= principal
+    if loan.payments_remaining:
+        loan.payments_remaining -= 1
+
+    payment = LoanPayment(
+        loan_id=loan.id,
+        payment_date=payment_date,
+        amount=amount,
+        principal_amount=principal,
+        interest_amount=interest,
+        balance_after=loan.current_balance,
+        transaction_id=transaction_id,
+        is_projected=False,
+    )
+    db.add(payment)
+    if regenerate:
+        regenerate_projection(db, loan, after=max(payment_date, date.today()))
+    return payment
@@ -0,0 +1,120 @@
+"""Multi-loan payoff simulation with freed-up payments rolling into the next loan."""
+from __future__ import annotations
+from collections import OrderedDict
+import threading
+import numpy as np
+from app.services.amortization import MAX_MONTHS
+
+STRATEGIES = ("avalanche", "snowball", "custom")
+
+_PAID_OFF_EPSILON = 0.5  # half a cent
+_CACHE_SIZE = 32
+_cache: OrderedDict = OrderedDict()  # keyed on the loans' state, so loan writes need not clear it
+_cache_lock = threading.Lock()  # shared by every thread serving requests
+
+
+def simulate(balances, rates, payments, order, extra, max_months: int = MAX_MONTHS, record_series: bool = True) -> dict:
+    """Simulate S scenarios over L loans in lock-step.
+
+    All array arguments are shaped (S, L) except `extra`, which is (S,). `order`
+    lists loan indices in the order surplus money is applied for each scenario.
+    Every month each loan receives its minimum payment; the scenario's extra
+    payment plus any minimums freed by paid-off loans is then poured into the
+    loans in `order` until it runs out.
+    """
+    balances = np.array(balances, dtype=float)
+    monthly_rates = np.asarray(rates, dtype=float) / 12
+    payments = np.asarray(payments, dtype=float)
+    order = np.asarray(order, dtype=np.int64)
+    extra = np.asarray(extra, dtype=float)
+    scenarios, loan_count = balances.shape
+
+    budget = payments.sum(axis=1) + extra
+    total_interest = np.zeros(scenarios)
+    debt_free_month = np.full(scenarios, -1, dtype=np.int64)
+    loan_payoff_month = np.where(balances <= _PAID_OFF_EPSILON, 0, -1)
+    series = []
+
+    rows = np.arange(scenarios)[:, None]
+    for month in range(1, max_months + 1):
+        interest = balances * monthly_rates
+        due = balances + interest
+        minimums = np.minimum(payments, due)
+        surplus = np.maximum(budget - minimums.sum(axis=1), 0.0)
+
+        remaining = due - minimums
+        ordered = remaining[rows, order]
+        already_covered = np.cumsum(ordered, axis=1) - ordered
+        allocation = np.clip(surplus[:, None] - already_covered, 0.0, ordered)
+        paid_extra = np.empty_like(allocation)
+        paid_extra[rows, order] = allocation
+
+        balances = remaining - paid_extra
+        balances[balances <= _PAID_OFF_EPSILON] = 0.0
+        total_interest += interest.sum(axis=1)
+
+        newly_paid = (loan_payoff_month < 0) & (balances == 0)
+        loan_payoff_month[newly_paid] = month
+
+        outstanding = balances.sum(axis=1)
+        if record_series:
+            series.append(outstanding)
+        finished = (debt_free_month < 0) & (outstanding == 0)
+        debt_free_month[finished] = month
+        if (debt_free_month >= 0).all():
+            break
+
+    return {
+        "debt_free_month": debt_free_month,
+        "loan_payoff_month": loan_payoff_month,
+        "total_interest": total_interest,
+        "balance_series": np.stack(series, axis=1) if series else np.zeros((scenarios, 0)),
+    }
+
+
+def strategy_orders(balances, rates, priority_ranks) -> np.ndarray:
+    """Payment order for avalanche, snowball and custom, shaped (3, L)."""
+    balances = np.asarray(balances, dtype=float)
+    rates = np.asarray(rates, dtype=float)
+    ranks = np.array([r if r is not None else np.iinfo(np.int64).max for r in priority_ranks], dtype=np.int64)
+    index = np.arange(len(balances))
+
+    avalanche = np.lexsort((index, balances, -rates))
+    snowball = np.lexsort((index, -rates, balances))
+    custom = np.lexsort((index, ranks))
+    return np.stack([avalanche, snowball, custom])
+
+
+def _loan_signature(loans) -> tuple:
+    return tuple(
+        (l.id, l.current_balance, l.interest_rate, l.monthly_payment, l.priority_rank)
+        for l in loans
+    )
+
+
+def compare_strategies(loans, extra_payment: int = 0) -> dict:
+    """Run every strategy for the given loans, cached on the loans' current state. Amounts are cents."""
+    key = (_loan_signature(loans), float(extra_payment))
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    balances = [l.current_balance for l in loans]
+    rates = [l.interest_rate or 0 for l in loans]
+    payments = [l.monthly_payment or 0 for l in loans]
+    order = strategy_orders(balances, rates, [l.priority_rank for l in loans])
+
+    count = len(STRATEGIES)
+    result = simulate(
+        np.tile(balances, (count, 1)),
+        np.tile(rates, (count, 1)),
+        np.tile(payments, (count, 1)),
+        order,
+        np.full(count, float(extra_payment)),
+    )
+    with _cache_lock:
+        _cache[key] = result
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
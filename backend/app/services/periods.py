@@ -0,0 +1,49 @@
+"""Plan week, plan month, phase and calendar-month keys stamped on transactions for index-backed grouping."""
+from __future__ import annotations
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction
+from app.services.plan_calendar import PlanCalendar, plan_calendars
+from app.utils.cache_versions import cache_versions
+
+PERIOD_COLUMNS = ("plan_week", "plan_month", "phase_number", "yyyymm")
+
+
+def stamp_periods(db: Session, calendar: PlanCalendar, missing_only: bool = True) -> int:
+    """Recompute period keys with one UPDATE per distinct date. Caller commits."""
+    query = db.query(Transaction.transaction_date).distinct()
+    if missing_only:
+        query = query.filter(Transaction.yyyymm.is_(None))
+    dates = [d for (d,) in query]
+    if not dates:
+        return 0
+    table = Transaction.__table__
+    statement = (
+        update(table)
+        .where(table.c.transaction_date == bindparam("day"))
+        .values({c: bindparam(f"new_{c}") for c in PERIOD_COLUMNS})
+    )
+    db.execute(statement, [
+        {"day": d, **{f"new_{c}": v for c, v in calendar.period_keys(d).items()}}
+        for d in dates
+    ])
+    return len(dates)
+
+
+def plan_changed(db: Session) -> int:
+    """Call after editing the active plan or its phases. Caller commits.
+
+    Every worker rebuilds its calendar, and all transactions are restamped
+    against the new one.
+    """
+    cache_versions.bump(db, "plan")
+    return stamp_periods(db, plan_calendars.get(db), missing_only=False)
+
+
+def spending_by(key, *filters):
+    """Counted spending (debits not excluded as transfers) summed per value of `key`."""
+    return (
+        select(key, func.sum(Transaction.amount))
+        .where(Transaction.is_debit == True, Transaction.is_excluded == False, *filters)
+        .group_by(key)
+    )
@@ -0,0 +1,139 @@
+"""Date, plan week, plan month and phase lookups built from the active plan's rows."""
+from __future__ import annotations
+from datetime import date, timedelta
+from sqlalchemy.orm import Session
+from app.models.plan import FinancialPlan, PlanPhase
+from app.utils.cache_versions import cache_versions
+
+
+def yyyymm(d: date) -> int:
+    return d.year * 100 + d.month
+
+
+class PlanCalendar:
+    """Precomputed lookup arrays for one plan; every lookup is an index into a list.
+
+    Weeks run for seven days from the plan's start date. Plan months are
+    calendar months counted from the start date's month, so month 1 may be
+    partial. Phases come from each PlanPhase's week and month ranges; weeks or
+    months no phase covers inherit the preceding phase.
+    """
+
+    def __init__(self, start_date: date | None, total_weeks: int, phases: list[PlanPhase]):
+        self.start_date = start_date
+        self.total_weeks = total_weeks if start_date else 0
+        phases = sorted(phases, key=lambda p: p.phase_number)
+        first_phase = phases[0].phase_number if phases else 1
+        self.phase_names = {p.phase_number: p.name for p in phases}
+
+        week_ranges = [(p.start_week, p.end_week, p.phase_number) for p in phases]
+        month_ranges = [(p.start_month, p.end_month, p.phase_number) for p in phases]
+        last_day = start_date + timedelta(days=self.total_weeks * 7 - 1) if self.total_weeks else None
+        self.total_months = self.plan_month(last_day) if last_day else 0
+        months = max(self.total_months, max((p.end_month for p in phases), default=0))
+        self._phase_by_week = self._spread(first_phase, self.total_weeks, week_ranges)
+        self._phase_by_month = self._spread(first_phase, months, month_ranges)
+
+        # (plan_week, plan_month) for every day of the plan, indexed by days since start
+        self._days = []
+        for offset in range(self.total_weeks * 7):
+            self._days.append((offset // 7 + 1, self.plan_month(start_date + timedelta(days=offset))))
+
+    @staticmethod
+    def _spread(default: int, length: int, ranges: list[tuple[int, int, int]]) -> list[int]:
+        """Phase per period, index 0 unused, gaps carrying the previous phase forward."""
+        covered: list[int | None] = [None] * (length + 1)
+        for start, end, phase in ranges:
+            for i in range(max(start, 1), min(end, length) + 1):
+                covered[i] = phase
+        result, current = [default], default
+        for phase in covered[1:]:
+            current = phase if phase is not None else current
+            result.append(current)
+        return result
+
+    @classmethod
+    def load(cls, db: Session) -> PlanCalendar:
+        plan = db.query(FinancialPlan).filter(FinancialPlan.is_active == True).first()
+        if plan is None:
+            return cls(None, 0, [])
+        phases = db.query(PlanPhase).filter(PlanPhase.plan_id == plan.id).all()
+        return cls(plan.start_date, plan.total_weeks, phases)
+
+    def plan_week(self, d: date) -> int | None:
+        """Plan week containing `d`, or None outside the plan."""
+        if self.start_date is None:
+            return None
+        offset = (d - self.start_date).days
+        return self._days[offset][0] if 0 <= offset < len(self._days) else None
+
+    def plan_month(self, d: date) -> int:
+        """Calendar months since the plan's first month, which is month 1; 0 without a plan."""
+        if self.start_date is None:
+            return 0
+        return (d.year - self.start_date.year) * 12 + d.month - self.start_date.month + 1
+
+    def week_dates(self, week: int) -> tuple[date, date]:
+        start = self.start_date + timedelta(weeks=week - 1)
+        return start, start + timedelta(days=6)
+
+    @staticmethod
+    def _clamped(phases: list[int], i: int) -> int:
+        return phases[min(max(i, 1), len(phases) - 1)] if len(phases) > 1 else phases[0]
+
+    def phase_for_week(self, week: int) -> int:
+        return self._clamped(self._phase_by_week, week)
+
+    def phase_for_month(self, month: int) -> int:
+        return self._clamped(self._phase_by_month, month)
+
+    def current_week(self, today: date | None = None) -> int:
+        """Plan week for today: 0 before the plan starts, the last week after it ends."""
+        today = today or date.today()
+        if self.start_date is None or today < self.start_date:
+            return 0
+        return min((today - self.start_date).days // 7 + 1, self.total_weeks)
+
+    def progress_pct(self, week: int) -> float:
+        return round(week / self.total_weeks * 100, 1) if self.total_weeks else 0
+
+    def period_keys(self, d: date) -> dict:
+        """Transaction period columns for `d`; the plan keys are None outside the plan."""
+        offset = (d - self.start_date).days if self.start_date else -1
+        if 0 <= offset < len(self._days):
+            week, month = self._days[offset]
+            keys = {"plan_week": week, "plan_month": month, "phase_number": self._phase_by_week[week]}
+        else:
+            keys = {"plan_week": None, "plan_month": None, "phase_number": None}
+        keys["yyyymm"] = yyyymm(d)
+        return keys
+
+
+class PlanCalendars:
+    """Each database's active plan calendar, built on first use and dropped when the "plan" cache version moves.
+
+    Keyed by database file so every household database keeps its own.
+    """
+
+    def __init__(self):
+        self._calendars: dict[str | None, PlanCalendar] = {}
+
+    def cached(self, database: str | None) -> PlanCalendar | None:
+        return self._calendars.get(database)
+
+    def get(self, db: Session) -> PlanCalendar:
+        database = db.get_bind().url.database
+        calendar = self._calendars.get(database)
+        if calendar is None:
+            calendar = self._calendars[database] = PlanCalendar.load(db)
+        return calendar
+
+    def discard(self, database: str | None):
+        self._calendars.pop(database, None)
+
+    def clear(self):
+        self._calendars.clear()
+
+
+plan_calendars = PlanCalendars()
+cache_versions.register("plan", plan_calendars.clear)
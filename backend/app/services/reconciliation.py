@@ -0,0 +1,103 @@
+"""Pairs card payments seen on both the paying and the receiving account."""
+from __future__ import annotations
+import bisect
+from collections import defaultdict
+from datetime import timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.transaction import Transaction
+from app.utils.money import to_cents
+
+# Money leaving checking toward a card, and the same money arriving on the card.
+TRANSFER_OUT_CATEGORIES = {"CC Payment"}
+TRANSFER_IN_CATEGORIES = {"Payment", "Credit"}
+
+
+class ReconciliationService:
+    def __init__(self, db: Session):
+        self.db = db
+        settings = get_settings()
+        self.day_window = timedelta(days=settings.TRANSFER_MATCH_DAY_WINDOW)
+        self.tolerance = to_cents(settings.TRANSFER_MATCH_AMOUNT_TOLERANCE)
+
+    def _transfer_filter(self):
+        return and_(
+            Transaction.transfer_match_id.is_(None),
+            Transaction.is_excluded == False,
+            or_(
+                and_(Transaction.is_debit == True, Transaction.category.in_(TRANSFER_OUT_CATEGORIES)),
+                and_(Transaction.is_debit == False, Transaction.category.in_(TRANSFER_IN_CATEGORIES)),
+            ),
+        )
+
+    def _bucket(self, amount: int) -> int:
+        return amount // max(self.tolerance, 1)
+
+    def build_index(self, pool: list[Transaction]) -> dict:
+        """Bucket counterparts by (is_debit, amount bucket), each bucket sorted by date."""
+        index = defaultdict(list)
+        for txn in pool:
+            index[(txn.is_debit, self._bucket(txn.amount))].append(txn)
+        for bucket in index.values():
+            bucket.sort(key=lambda t: (t.transaction_date, t.id))
+        return {key: ([t.transaction_date for t in txns], txns) for key, txns in index.items()}
+
+    def find_counterpart(self, index: dict, txn: Transaction, used: set[int]) -> Transaction | None:
+        bucket = self._bucket(txn.amount)
+        low, high = txn.transaction_date - self.day_window, txn.transaction_date + self.day_window
+        best = None
+        for key in ((not txn.is_debit, bucket - 1), (not txn.is_debit, bucket), (not txn.is_debit, bucket + 1)):
+            if key not in index:
+                continue
+            dates, txns = index[key]
+            for i in range(bisect.bisect_left(dates, low), bisect.bisect_right(dates, high)):
+                other = txns[i]
+                if other.id in used or other.source_id == txn.source_id:
+                    continue
+                if abs(other.amount - txn.amount) > self.tolerance:
+                    continue
+                gap = abs((other.transaction_date - txn.transaction_date).days)
+                if best is None or gap < best[0]:
+                    best = (gap, other)
+        return best[1] if best else None
+
+    def reconcile_batch(self, batch_id: str) -> int:
+        """Exclude and cross-link transfer pairs involving the batch. Returns pairs found."""
+        batch = (
+            self.db.query(Transaction)
+            .filter(Transaction.import_batch_id == batch_id, self._transfer_filter())
+            .order_by(Transaction.transaction_date, Transaction.id)
+            .all()
+        )
+        if not batch:
+            return 0
+
+        start = min(t.transaction_date for t in batch) - self.day_window
+        end = max(t.transaction_date for t in batch) + self.day_window
+        pool = (
+            self.db.query(Transaction)
+            .filter(
+                Transaction.import_batch_id != batch_id,
+                Transaction.transaction_date >= start,
+                Transaction.transaction_date <= end,
+                self._transfer_filter(),
+            )
+            .all()
+        )
+        index = self.build_index(pool)
+
+        used = set()
+        pairs = 0
+        for txn in batch:
+            other = self.find_counterpart(index, txn, used)
+            if other is None:
+                continue
+            used.add(other.id)
+            txn.transfer_match_id, other.transfer_match_id = other.id, txn.id
+            txn.is_excluded = other.is_excluded = True
+            pairs += 1
+
+        if pairs:
+            self.db.commit()
+        return pairs
@@ -0,0 +1,66 @@
+"""Extra-payment x refinance-rate grid evaluated as one batched payoff simulation."""
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from app.config import get_settings
+from app.services.payoff_strategy import simulate
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        settings = get_settings()
+        _executor = ProcessPoolExecutor(max_workers=settings.SWEEP_MAX_WORKERS or os.cpu_count())
+    return _executor
+
+
+def _simulate_chunk(balances, rates, payments, extra) -> tuple[np.ndarray, np.ndarray]:
+    # Avalanche order per scenario: refinanced rates can reshuffle which loan is most expensive.
+    order = np.argsort(-rates, axis=1, kind="stable")
+    result = simulate(balances, rates, payments, order, extra, record_series=False)
+    return result["debt_free_month"], result["total_interest"]
+
+
+def sweep(loans, extra_payments, refinance_rates, refinance_ids: set[int] | None = None) -> dict:
+    """Debt-free month and total interest for every (extra payment, rate) pair.
+
+    Loans in `refinance_ids` (all loans when None) take the scenario's rate; the
+    rest keep their own. Returns (E, R) arrays; unreachable payoffs are -1.
+    """
+    settings = get_settings()
+    extra_payments = np.asarray(extra_payments, dtype=float)
+    refinance_rates = np.asarray(refinance_rates, dtype=float)
+    e_count, r_count = len(extra_payments), len(refinance_rates)
+    scenarios = e_count * r_count
+
+    balances = np.array([l.current_balance for l in loans], dtype=float)
+    own_rates = np.array([l.interest_rate or 0 for l in loans], dtype=float)
+    payments = np.array([l.monthly_payment or 0 for l in loans], dtype=float)
+    refinanced = np.array([refinance_ids is None or l.id in refinance_ids for l in loans])
+
+    scenario_rates = np.where(refinanced, refinance_rates[:, None], own_rates)
+    rates = np.tile(scenario_rates, (e_count, 1))
+    extra = np.repeat(extra_payments, r_count)
+    balances = np.tile(balances, (scenarios, 1))
+    payments = np.tile(payments, (scenarios, 1))
+
+    workers = settings.SWEEP_MAX_WORKERS or os.cpu_count() or 1
+    if scenarios < settings.SWEEP_PARALLEL_THRESHOLD or workers == 1:
+        months, interest = _simulate_chunk(balances, rates, payments, extra)
+    else:
+        bounds = np.array_split(np.arange(scenarios), workers)
+        futures = [
+            _get_executor().submit(_simulate_chunk, balances[idx], rates[idx], payments[idx], extra[idx])
+            for idx in bounds if len(idx)
+        ]
+        parts = [f.result() for f in futures]
+        months = np.concatenate([p[0] for p in parts])
+        interest = np.concatenate([p[1] for p in parts])
+
+    return {
+        "payoff_months": months.reshape(e_count, r_count),
+        "total_interest": interest.reshape(e_count, r_count),
+    }
@@ -0,0 +1,126 @@
+"""Group commit for small mutations: many callers, one transaction per batching window."""
+from __future__ import annotations
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteCoordinator:
+    """Runs queued `fn(session)` mutations on one writer thread.
+
+    Mutations that arrive within `window_ms` of each other share a transaction
+    and a single commit. Each caller's future resolves only after that commit,
+    so the request that issued a write reads it back on its next query. If any
+    mutation in a batch fails, the batch is rolled back and its members are
+    replayed one transaction each so one bad write cannot sink the others.
+    Mutations for different databases (session factories) never share a
+    batch. Mutations should return plain data, not ORM instances.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], window_ms: float, max_batch: int):
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="write-coordinator", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def submit(self, fn: Callable[[Session], object], session_factory: Callable[[], Session] | None = None) -> Future:
+        self.start()
+        future: Future = Future()
+        self._queue.put((fn, future, session_factory or self.session_factory))
+        return future
+
+    async def run(self, fn: Callable[[Session], object], session_factory: Callable[[], Session] | None = None):
+        return await asyncio.wrap_future(self.submit(fn, session_factory))
+
+    def _run(self):
+        carried = None
+        while True:
+            item, carried = carried or self._queue.get(), None
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.window
+            stopping = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if item[2] is not batch[0][2]:
+                    carried = item  # starts the next batch, on its own database
+                    break
+                batch.append(item)
+            self._apply(batch)
+            if stopping:
+                return
+
+    def _apply(self, batch: list[tuple[Callable, Future, Callable]]):
+        session = batch[0][2]()
+        try:
+            results = [fn(session) for fn, _, _ in batch]
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                for fn, future, _ in batch:
+                    self._apply_one(session, fn, future)
+            return
+        finally:
+            session.close()
+
+        self.batches += 1
+        self.writes += len(batch)
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _apply_one(self, session: Session, fn: Callable, future: Future):
+        try:
+            result = fn(session)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            future.set_exception(e)
+            return
+        self.batches += 1
+        self.writes += 1
+        future.set_result(result)
+
+
+_settings = get_settings()
+write_coordinator = WriteCoordinator(SessionLocal, _settings.WRITE_BATCH_WINDOW_MS, _settings.WRITE_BATCH_MAX)
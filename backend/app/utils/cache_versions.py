@@ -0,0 +1,57 @@
+"""Cross-process cache invalidation through per-cache version counters stored in SQLite."""
+from __future__ import annotations
+import threading
+from collections import defaultdict
+from typing import Callable
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.models.cache_version import CacheVersion
+
+
+class CacheVersions:
+    def __init__(self, enabled: bool):
+        self.enabled = enabled  # only worth a query per request when several workers share the database
+        self._seen: dict[tuple[str | None, str], int] = {}  # (scope, name) -> version
+        self._listeners: dict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def register(self, name: str, on_change: Callable[[], None]):
+        self._listeners[name].append(on_change)
+
+    def _notify(self, names):
+        for name in names:
+            for on_change in self._listeners.get(name, ()):
+                on_change()
+
+    def apply(self, versions: dict[str, int], scope: str | None = None):
+        """Drop every cache whose version moved since this process last looked.
+
+        `scope` names the database the versions were read from, since each
+        household database keeps its own counters.
+        """
+        with self._lock:
+            changed = [name for name, version in versions.items() if self._seen.get((scope, name), 0) != version]
+            self._seen.update(((scope, name), version) for name, version in versions.items())
+        self._notify(changed)
+
+    async def refresh(self, db: AsyncSession, scope: str | None = None):
+        if not self.enabled:
+            return
+        rows = await db.execute(select(CacheVersion.name, CacheVersion.version))
+        self.apply(dict(rows.all()), scope)
+
+    def bump(self, db: Session, *names: str):
+        """Advance versions in the caller's transaction; this process drops its copies immediately."""
+        for name in names:
+            db.execute(
+                insert(CacheVersion)
+                .values(name=name, version=1)
+                .on_conflict_do_update(index_elements=[CacheVersion.name], set_={"version": CacheVersion.version + 1})
+            )
+        self._notify(names)
+
+
+cache_versions = CacheVersions(get_settings().WORKERS > 1)
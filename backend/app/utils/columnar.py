@@ -0,0 +1,69 @@
+"""Columnar encoding of list payloads: one array per field plus a schema header."""
+from __future__ import annotations
+import types
+import typing
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Literal
+from pydantic import BaseModel, Field
+from app.utils.money import to_dollars
+
+_TYPE_NAMES = {int: "integer", float: "number", str: "string", bool: "boolean", date: "date", datetime: "datetime"}
+
+
+class ColumnarField(BaseModel):
+    name: str
+    type: str
+    nullable: bool
+
+
+class ColumnarList(BaseModel):
+    """The shape to_columnar returns, for declaring it in response models."""
+    format: Literal["columnar"]
+    fields: list[ColumnarField] = Field(alias="schema")
+    count: int
+    columns: dict[str, list]
+
+
+@lru_cache(maxsize=None)
+def _schema(model: type[BaseModel]) -> tuple[tuple[str, str, bool], ...]:
+    fields = []
+    for name, info in model.model_fields.items():
+        annotation = info.annotation
+        args = typing.get_args(annotation)
+        nullable = type(None) in args and (typing.get_origin(annotation) in (typing.Union, types.UnionType))
+        base = next((a for a in args if a is not type(None)), annotation) if nullable else annotation
+        metadata = [*info.metadata, *getattr(base, "__metadata__", ())]
+        if any(getattr(m, "func", None) is to_dollars for m in metadata):
+            fields.append((name, "money", nullable))
+            continue
+        fields.append((name, _TYPE_NAMES.get(base, "object"), nullable))
+    return tuple(fields)
+
+
+def to_columnar(model: type[BaseModel], objects, **computed: list) -> dict:
+    """Encode `objects` as one array per field of `model`.
+
+    Values are read straight off the objects (typically ORM rows) instead of
+    building a model instance per row. Fields whose values need work, such as
+    defaults or joined names, are passed in `computed` as ready-made arrays.
+    """
+    objects = list(objects)
+    columns = {}
+    for name, type_name, _ in _schema(model):
+        values = computed[name] if name in computed else [getattr(o, name) for o in objects]
+        if type_name in ("date", "datetime"):
+            values = [v.isoformat() if v is not None else None for v in values]
+        elif type_name == "money":
+            values = [to_dollars(v) for v in values]
+        columns[name] = values
+    return {
+        "format": "columnar",
+        # Money columns hold cents internally but go out in dollars, like the row format
+        "schema": [
+            {"name": n, "type": "number" if t == "money" else t, "nullable": nullable}
+            for n, t, nullable in _schema(model)
+        ],
+        "count": len(objects),
+        "columns": columns,
+    }
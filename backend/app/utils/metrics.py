@@ -0,0 +1,229 @@
+"""In-process Prometheus metrics for requests, SQL statements and CSV imports."""
+from __future__ import annotations
+import bisect
+import re
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+IMPORT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+MAX_STATEMENT_LABELS = 500  # further distinct statements are counted as "other"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: dict = {}
+        self._lock = threading.Lock()
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, *labels, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(counts), total) for k, (counts, total) in self._values.items()]
+        lines = self._header()
+        bucket_names = self.label_names + ("le",)
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(bucket_names, labels + (_number(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self._metrics for line in metric.render()) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP responses by route and status.", ("method", "route", "status"))
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+db_query_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL statement latency by operation.", ("operation",), QUERY_BUCKETS)
+db_statement_calls = registry.counter(
+    "db_statement_calls_total", "Executions per normalized SQL statement.", ("statement",))
+db_statement_seconds = registry.counter(
+    "db_statement_seconds_total", "Time spent per normalized SQL statement.", ("statement",))
+import_rows = registry.counter(
+    "import_rows_total", "CSV rows processed by source and outcome.", ("source", "outcome"))
+import_batch_seconds = registry.histogram(
+    "import_batch_duration_seconds", "Wall time of each CSV import.", ("source",), IMPORT_BUCKETS)
+import_rows_per_second = registry.gauge(
+    "import_rows_per_second", "Throughput of the most recent CSV import.", ("source",))
+household_opens = registry.counter(
+    "household_opens_total", "Household databases opened by this worker.")
+household_closes = registry.counter(
+    "household_closes_total", "Idle household databases closed to stay within HOUSEHOLD_POOL_SIZE.")
+household_pool_open = registry.gauge(
+    "household_pool_open", "Household databases currently open in this worker.")
+
+
+# --- SQL statements ---
+
+_PLACEHOLDER_GROUP = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+_normalized: dict[str, str] = {}  # raw statement -> label
+_shapes: set[str] = set()
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace, IN-lists and multi-row VALUES so one query shape is one label."""
+    cached = _normalized.get(statement)
+    if cached is not None:
+        return cached
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _REPEATED_GROUPS.sub("(?)", _PLACEHOLDER_GROUP.sub("(?)", shape))
+    if shape not in _shapes:
+        if len(_shapes) >= MAX_STATEMENT_LABELS:
+            shape = "other"
+        else:
+            _shapes.add(shape)
+    if len(_normalized) >= 4 * MAX_STATEMENT_LABELS:
+        _normalized.clear()
+    _normalized[statement] = shape
+    return shape
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    shape = normalize_statement(statement)
+    db_query_seconds.observe(shape.split(" ", 1)[0].upper(), value=elapsed)
+    db_statement_calls.inc(shape)
+    db_statement_seconds.inc(shape, amount=elapsed)
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement on a sync engine (pass `async_engine.sync_engine` for async ones)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+# --- HTTP requests ---
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and status per route template, not per raw path."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_request_seconds.observe(scope["method"], path, value=time.perf_counter() - started)
+            http_requests.inc(scope["method"], path, str(status))
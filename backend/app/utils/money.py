@@ -0,0 +1,45 @@
+"""Money is stored and aggregated as integer cents; clients send and receive dollars."""
+from __future__ import annotations
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Annotated
+from pydantic import BeforeValidator, PlainSerializer
+
+
+MAX_CENTS = 2**63 - 1  # SQLite INTEGER
+MAX_DOLLARS = 1_000_000_000  # bound for plain float query parameters converted with to_cents
+
+
+def to_cents(dollars) -> int | None:
+    """Dollars (float, str or Decimal) to whole cents, rounding half away from zero.
+
+    Raises ValueError for anything that is not a finite amount SQLite can store,
+    which Pydantic reports as a validation error.
+    """
+    if dollars is None:
+        return None
+    try:
+        amount = Decimal(str(dollars))
+        if not amount.is_finite():
+            raise ValueError(f"Not a finite amount: {dollars!r}")
+        cents = int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {dollars!r}") from None
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"Amount out of range: {dollars!r}")
+    return cents
+
+
+def to_dollars(cents) -> float | None:
+    return cents / 100 if cents is not None else None
+
+
+def _whole_cents(cents):
+    # Amortization math yields fractional cents as floats or numpy scalars
+    return cents if cents is None or isinstance(cents, int) else int(round(cents))
+
+
+# Response fields: cents in Python, dollars in JSON
+Money = Annotated[int, BeforeValidator(_whole_cents), PlainSerializer(to_dollars, return_type=float)]
+
+# Request fields: dollars in JSON, cents once validated
+MoneyInput = Annotated[int, BeforeValidator(to_cents)]
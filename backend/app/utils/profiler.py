@@ -0,0 +1,204 @@
+"""On-demand CPU profiling of requests, stored as downloadable artifacts.
+
+Armed requests run under cProfile (a .prof pstats file) or the stack sampler;
+with a slow-request threshold set, every request is sampled and kept only if
+it ran longer than the threshold. The sampler walks every thread, so work
+pushed to the threadpool is captured too. Its output is collapsed stacks
+(.folded), readable by speedscope or flamegraph.pl.
+
+Neither mode isolates one request. cProfile traces the event-loop thread,
+which interleaves every in-flight request, and misses the request's threadpool
+work; the sampler records every busy thread. A capture therefore includes
+whatever else the worker ran meanwhile. CAPTURE_SCOPE says so in the admin API.
+"""
+from __future__ import annotations
+import cProfile
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from app.config import get_settings
+
+settings = get_settings()
+
+MODES = ("cprofile", "sample")
+CAPTURE_SCOPE = (
+    "Profiles cover the whole worker process while the request ran, not the request alone: "
+    "cprofile traces the event-loop thread, including other requests it interleaves but not threadpool work; "
+    "sample records every busy thread. Profile on an otherwise idle worker for a clean report."
+)
+_IDLE_FUNCTIONS = {"wait", "select", "poll", "sleep", "accept", "get", "_worker"}  # leaf frames of parked threads
+
+
+class ProfileStore:
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max_files
+
+    def list(self) -> list[dict]:
+        if not os.path.isdir(self.directory):
+            return []
+        entries = [e for e in os.scandir(self.directory) if e.is_file()]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        return [
+            {"name": e.name, "size": e.stat().st_size, "created_at": datetime.fromtimestamp(e.stat().st_mtime)}
+            for e in entries
+        ]
+
+    def path_for(self, name: str) -> str | None:
+        """Path of an existing profile; None for unknown names, including anything path-like."""
+        if os.path.basename(name) != name:
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def new_path(self, method: str, path: str, elapsed_ms: float, extension: str) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-") or "root"
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return os.path.join(self.directory, f"{stamp}_{method}_{slug}_{elapsed_ms:.0f}ms.{extension}")
+
+    def prune(self):
+        for entry in self.list()[self.max_files:]:
+            os.remove(os.path.join(self.directory, entry["name"]))
+
+
+class StackSampler:
+    """Background thread that samples all thread stacks while any capture is open."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._captures: dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start_capture(self) -> Counter:
+        samples = Counter()
+        with self._lock:
+            self._captures[id(samples)] = samples
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return samples
+
+    def stop_capture(self, samples: Counter) -> Counter:
+        with self._lock:
+            self._captures.pop(id(samples), None)
+        return samples
+
+    def _run(self):
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                idle = not self._captures
+            if idle:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            time.sleep(self.interval_seconds)
+            stacks = [
+                stack for ident, frame in sys._current_frames().items()
+                if ident != me and (stack := _folded(frame))
+            ]
+            with self._lock:
+                for samples in self._captures.values():
+                    samples.update(stacks)
+
+
+def _folded(frame) -> str | None:
+    if frame.f_code.co_name in _IDLE_FUNCTIONS:
+        return None
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfilingControl:
+    """Which requests get profiled: armed paths (admin-triggered) and the slow-request threshold."""
+
+    def __init__(self, slow_request_ms: float):
+        self.slow_request_ms = slow_request_ms
+        self._armed: dict[str, list] = {}  # path -> [mode, remaining]
+        self._lock = threading.Lock()
+
+    def arm(self, path: str, count: int, mode: str):
+        with self._lock:
+            self._armed[path] = [mode, count]
+
+    def take(self, path: str) -> str | None:
+        with self._lock:
+            armed = self._armed.get(path)
+            if armed is None:
+                return None
+            armed[1] -= 1
+            if armed[1] <= 0:
+                del self._armed[path]
+            return armed[0]
+
+    def state(self) -> dict:
+        with self._lock:
+            return {
+                "scope": CAPTURE_SCOPE,
+                "slow_request_ms": self.slow_request_ms,
+                "armed": [{"path": p, "mode": m, "remaining": n} for p, (m, n) in self._armed.items()],
+            }
+
+    @property
+    def active(self) -> bool:
+        return bool(self._armed) or self.slow_request_ms > 0
+
+
+store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_FILES)
+sampler = StackSampler(settings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+control = ProfilingControl(settings.PROFILE_SLOW_REQUEST_MS)
+_cprofile_lock = threading.Lock()  # the interpreter allows one active cProfile at a time
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not control.active:
+            await self.app(scope, receive, send)
+            return
+
+        mode = control.take(scope["path"])
+        if mode is None and control.slow_request_ms <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        profile = None
+        if mode == "cprofile" and _cprofile_lock.acquire(blocking=False):
+            profile = cProfile.Profile()
+            profile.enable()
+        samples = sampler.start_capture() if profile is None else None
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if profile is not None:
+                profile.disable()
+                _cprofile_lock.release()
+                profile.dump_stats(store.new_path(scope["method"], scope["path"], elapsed_ms, "prof"))
+                store.prune()
+            else:
+                sampler.stop_capture(samples)
+                if samples and (mode is not None or elapsed_ms >= control.slow_request_ms):
+                    _write_folded(store.new_path(scope["method"], scope["path"], elapsed_ms, "folded"), samples)
+                    store.prune()
+
+
+def _write_folded(path: str, samples: Counter):
+    with open(path, "w") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
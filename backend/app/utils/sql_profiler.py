@@ -0,0 +1,134 @@
+"""Opt-in per-request SQL profiling with N+1 detection.
+
+Enable for every request with SQL_PROFILE=true, or for one request by sending
+an `X-SQL-Profile: 1` header along with `Authorization: Bearer <METRICS_TOKEN>`.
+Profiled responses carry X-SQL-Queries, X-SQL-Time-Ms and X-SQL-N-Plus-One
+headers and the statements are logged.
+"""
+from __future__ import annotations
+import logging
+import secrets
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PROFILE_HEADER = b"x-sql-profile"
+
+
+@dataclass
+class QueryProfile:
+    statements: list[tuple[str, float]] = field(default_factory=list)  # (statement, seconds)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(elapsed for _, elapsed in self.statements)
+
+    def n_plus_one(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        """Statements issued `threshold` or more times with only their parameters changing."""
+        threshold = threshold or settings.SQL_PROFILE_N_PLUS_ONE_THRESHOLD
+        repeats = Counter(statement for statement, _ in self.statements)
+        return [(statement, n) for statement, n in repeats.most_common() if n >= threshold]
+
+
+_current: ContextVar[QueryProfile | None] = ContextVar("sql_profile", default=None)
+
+
+@contextmanager
+def profile_queries():
+    """Record every statement issued in this context (threads and greenlets inherit it)."""
+    profile = QueryProfile()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is not None and conn.info.get("profile_started"):
+        profile.statements.append((statement, time.perf_counter() - conn.info["profile_started"].pop()))
+
+
+def _handle_error(context):
+    started = context.connection.info.get("profile_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine):
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _requested(scope) -> bool:
+    """Whether the request opts in; the header only counts from holders of METRICS_TOKEN."""
+    if not settings.METRICS_TOKEN:
+        return False
+    headers = dict(scope["headers"])
+    return PROFILE_HEADER in headers and secrets.compare_digest(
+        headers.get(b"authorization", b""), f"Bearer {settings.METRICS_TOKEN}".encode()
+    )
+
+
+class SQLProfilerMiddleware:
+    """Profiles opted-in requests and reports the result in headers and the log."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (settings.SQL_PROFILE or _requested(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        with profile_queries() as profile:
+            async def send_with_summary(message):
+                if message["type"] == "http.response.start":
+                    suspects = profile.n_plus_one()
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-sql-queries", str(profile.count).encode()),
+                        (b"x-sql-time-ms", f"{profile.total_seconds * 1000:.2f}".encode()),
+                        (b"x-sql-n-plus-one", str(len(suspects)).encode()),
+                    ]
+                    _log(scope, profile, suspects)
+                await send(message)
+
+            await self.app(scope, receive, send_with_summary)
+
+
+def _log(scope, profile: QueryProfile, suspects: list[tuple[str, int]]):
+    logger.info(
+        "%s %s: %d queries in %.2f ms", scope["method"], scope["path"], profile.count, profile.total_seconds * 1000
+    )
+    for statement, n in suspects:
+        logger.warning("N+1 suspect on %s (%d times): %s", scope["path"], n, " ".join(statement.split()))
+
+
+def assert_max_queries(client, path: str, limit: int, method: str = "GET", **kwargs):
+    """Issue a profiled request through a test client and fail if it runs more than `limit` queries."""
+    headers = {**kwargs.pop("headers", {}), "X-SQL-Profile": "1", "Authorization": f"Bearer {settings.METRICS_TOKEN}"}
+    response = client.request(method, path, headers=headers, **kwargs)
+    count = int(response.headers["x-sql-queries"])
+    assert count <= limit, f"{method} {path} issued {count} queries, expected at most {limit}"
+    return response
@@ -0,0 +1,60 @@
+"""Failed-login throttling, checked before any password hashing happens."""
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from app.config import get_settings
+
+
+class LoginThrottle:
+    def __init__(self, max_failures: int, window_seconds: float, max_keys: int = 10000):
+        self.max_failures = max_failures
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._failures: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(client: str, username: str) -> tuple[str, str]:
+        # Per client+account stops guessing one password; per client (with more slack) stops spraying
+        return f"{client}|{username.lower()}", client
+
+    def _recent(self, key: str, now: float) -> deque | None:
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+        while failures and failures[0] <= now - self.window_seconds:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def retry_after(self, client: str, username: str) -> int:
+        """Seconds until the client may try again, or 0 if not throttled."""
+        now = time.monotonic()
+        account_key, client_key = self._keys(client, username)
+        with self._lock:
+            wait = 0.0
+            for key, limit in ((account_key, self.max_failures), (client_key, self.max_failures * 4)):
+                failures = self._recent(key, now)
+                if failures is not None and len(failures) >= limit:
+                    wait = max(wait, failures[0] + self.window_seconds - now)
+            return int(wait) + 1 if wait > 0 else 0
+
+    def record_failure(self, client: str, username: str):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._failures) >= self.max_keys:
+                for key in list(self._failures):
+                    self._recent(key, now)
+            for key in self._keys(client, username):
+                self._failures.setdefault(key, deque()).append(now)
+
+    def reset(self, client: str, username: str):
+        with self._lock:
+            self._failures.pop(self._keys(client, username)[0], None)
+
+
+_settings = get_settings()
+login_throttle = LoginThrottle(_settings.LOGIN_MAX_FAILURES, _settings.LOGIN_THROTTLE_WINDOW_SECONDS)
@@ -0,0 +1,76 @@
+"""Bounded LRU/TTL cache from access token to the resolved user."""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from app.config import get_settings
+from app.utils.cache_versions import cache_versions
+
+
+class TokenCache:
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()  # token -> (user, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            user, expires_at = entry
+            if expires_at <= now:
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return user
+
+    def put(self, token: str, user, token_exp: float):
+        """Cache until the token's own `exp` or the TTL, whichever comes first."""
+        if self.maxsize <= 0:
+            return
+        expires_at = min(token_exp, time.time() + self.ttl_seconds)
+        with self._lock:
+            self._entries[token] = (user, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_token(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for token in [t for t, (user, _) in self._entries.items() if user.id == user_id]:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_settings = get_settings()
+token_cache = TokenCache(_settings.AUTH_CACHE_SIZE, _settings.AUTH_CACHE_TTL_SECONDS)
+cache_versions.register("auth", token_cache.clear)
@@ -0,0 +1,109 @@
+"""Timings for the hot paths against a synthetic database, compared with stored baselines.
+
+Each case reports its median over --repeat runs. With --save-baseline the
+medians are written to baselines.json; otherwise a case fails when its median
+exceeds the baseline by more than --tolerance. Baselines are machine-specific:
+re-save them when moving to different hardware. Needs httpx.
+
+    cd backend && python -m benchmarks.hot_paths --years 3
+    cd backend && python -m benchmarks.hot_paths --years 3 --save-baseline
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_workdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+os.environ.setdefault("UPLOAD_DIR", f"{_workdir}/uploads")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.import_service import ImportService  # noqa: E402
+from benchmarks.synthetic import FORMATS, generate_csv, seed_database  # noqa: E402
+
+BASELINES = Path(__file__).with_name("baselines.json")
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _import_case(fmt: str, rows: int):
+    def run(i: int):
+        path = os.path.join(_workdir, f"{fmt}_{i}_{rows}.csv")
+        generate_csv(fmt, path, rows, seed=1000 + i)
+        with SessionLocal() as db:
+            ImportService(db).import_csv(path, f"bench-{fmt}-{i}", os.path.basename(path))
+    return run
+
+
+def _get_case(client: TestClient, path: str):
+    def run(i: int):
+        response = client.get(path)
+        assert response.status_code == 200, f"{path}: {response.status_code} {response.text[:200]}"
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--per-month", type=int, default=400)
+    parser.add_argument("--import-rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    with TestClient(app) as client:
+        with SessionLocal() as db:
+            seed_database(db, args.years, args.per_month)
+        client.post("/api/auth/login", json={"username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD})
+
+        pages = client.get("/api/transactions?per_page=50").json()["pages"]
+        cases = {f"import_csv[{fmt}]": _import_case(fmt, args.import_rows) for fmt in FORMATS}
+        cases.update({
+            "list_transactions[first_page]": _get_case(client, "/api/transactions?per_page=50"),
+            "list_transactions[deep_page]": _get_case(client, f"/api/transactions?per_page=50&page={max(pages - 1, 1)}"),
+            "list_transactions[search]": _get_case(client, "/api/transactions?search=KROGER"),
+            "get_dashboard": _get_case(client, "/api/dashboard"),
+            "get_budget_vs_actual": _get_case(client, "/api/budget?month=2027-03"),
+            "get_calendar": _get_case(client, "/api/plan/calendar"),
+            "payoff_projections": _get_case(client, "/api/loans/projections"),
+        })
+
+        results = {name: round(_time(fn, args.repeat), 3) for name, fn in cases.items()}
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    failures = []
+    print(f"{'case':<34} {'median ms':>10} {'baseline':>10} {'change':>8}")
+    for name, median in results.items():
+        baseline = baselines.get(name)
+        change = f"{(median / baseline - 1) * 100:+.0f}%" if baseline else "-"
+        print(f"{name:<34} {median:>10.2f} {baseline if baseline is not None else '-':>10} {change:>8}")
+        if baseline and median > baseline * (1 + args.tolerance):
+            failures.append(name)
+
+    if args.save_baseline:
+        BASELINES.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baselines to {BASELINES.name}")
+    elif failures:
+        print(f"Regressed beyond {args.tolerance:.0%}: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Cold-start import cost of app.main, measured with `python -X importtime`.
+
+Exits non-zero when a lazily loaded dependency is imported at startup or the
+total import time exceeds the budget.
+
+    cd backend && python -m benchmarks.import_time --budget-ms 2500
+"""
+from __future__ import annotations
+import argparse
+import os
+import subprocess
+import sys
+
+LAZY_MODULES = ("pandas", "pdfplumber")
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    """Self and cumulative microseconds for every module imported by `module`."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=2500.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = measure(args.module)
+    total_ms = timings[args.module][1] / 1000
+    print(f"{args.module}: {total_ms:.0f} ms cumulative, {len(timings)} modules")
+    for name, (self_us, _) in sorted(timings.items(), key=lambda kv: kv[1][0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    failures = [f"{name} imported at startup" for name in LAZY_MODULES if name in timings]
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.0f} ms exceeds budget of {args.budget_ms:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
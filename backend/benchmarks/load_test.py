@@ -0,0 +1,233 @@
+"""Open-loop load test: a weighted traffic mix at a target request rate against a seeded database.
+
+Starts gunicorn on a synthetic database, logs in once, then fires requests on
+a fixed schedule regardless of how fast earlier ones complete. Latency is
+measured from each request's scheduled start, so queueing inside the client
+counts against the server instead of hiding it. Writes per-route p50/p95/p99
+and error rates as JSON for comparison between commits. Needs httpx.
+
+With --households the server runs TENANCY_MODE=household: each household
+gets its own seeded database and login, and every request goes out as a
+random household. Per-route latency should hold steady as the count grows
+past --pool-size, while the worker's pool counters show cold databases
+being closed and reopened.
+
+    cd backend && python -m benchmarks.load_test --rate 50 --seconds 30 --out load.json
+    cd backend && python -m benchmarks.load_test --mix dashboard=5,transactions=3,import=1
+    cd backend && python -m benchmarks.load_test --households 200 --pool-size 32 --years 1
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+import httpx
+from benchmarks.server import BACKEND_DIR, free_port, percentile, start_server, wait_ready
+from benchmarks.synthetic import generate_csv, household_name
+
+DEFAULT_MIX = {"dashboard": 30, "transactions": 30, "budget": 15, "calendar": 15, "import": 2}
+IMPORT_FORMATS = ("apple_card", "checking_1569", "credit_card_6032", "amex")
+METRICS_TOKEN = "load-test"
+
+
+class Traffic:
+    """One request per route name; requests vary their parameters deterministically."""
+
+    def __init__(self, workdir: str, import_rows: int, seed: int):
+        self.workdir = workdir
+        self.import_rows = import_rows
+        self.rng = random.Random(seed)
+
+    def request(self, route: str, i: int) -> dict:
+        if route == "dashboard":
+            return {"method": "GET", "url": "/api/dashboard"}
+        if route == "transactions":
+            if i % 5 == 0:
+                return {"method": "GET", "url": "/api/transactions", "params": {"search": "KROGER"}}
+            return {"method": "GET", "url": "/api/transactions", "params": {"page": self.rng.randint(1, 20)}}
+        if route == "budget":
+            month = f"{self.rng.choice([2026, 2027, 2028])}-{self.rng.randint(1, 12):02d}"
+            return {"method": "GET", "url": "/api/budget", "params": {"month": month}}
+        if route == "calendar":
+            return {"method": "GET", "url": "/api/plan/calendar"}
+        if route == "import":
+            fmt = IMPORT_FORMATS[i % len(IMPORT_FORMATS)]
+            path = generate_csv(fmt, os.path.join(self.workdir, f"{fmt}_{i}.csv"), self.import_rows, seed=10_000 + i)
+            with open(path, "rb") as f:
+                content = f.read()
+            return {"method": "POST", "url": "/api/imports/upload",
+                    "files": {"file": (os.path.basename(path), content, "text/csv")}}
+        raise ValueError(f"Unknown route {route!r}")
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> dict:
+    """Cookie header for one login, leaving the client's own cookie jar empty."""
+    response = await client.post("/api/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    token = client.cookies.get("access_token")
+    client.cookies.clear()
+    return {"cookie": f"access_token={token}"}
+
+
+async def household_pool_metrics(client: httpx.AsyncClient) -> dict:
+    """The household_* series from whichever worker answers."""
+    response = await client.get("/api/metrics", headers={"authorization": f"Bearer {METRICS_TOKEN}"})
+    lines = response.text.splitlines() if response.status_code == 200 else []
+    return {name: float(value) for name, value in (line.split() for line in lines if line.startswith("household_"))}
+
+
+async def run_load(base_url: str, traffic: Traffic, mix: dict[str, int], rate: float, seconds: float,
+                   max_in_flight: int, credentials: list[tuple[str, str]]) -> dict:
+    routes, weights = list(mix), list(mix.values())
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: dict[str, Counter] = defaultdict(Counter)
+    slots = asyncio.Semaphore(max_in_flight)
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        await wait_ready(client)
+        sessions = [await login(client, username, password) for username, password in credentials]
+
+        async def fire(route: str, i: int, scheduled: float, headers: dict):
+            async with slots:
+                try:
+                    response = await client.request(**traffic.request(route, i), headers=headers)
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+            latencies[route].append(time.perf_counter() - scheduled)
+            statuses[route][status] += 1
+
+        pending = []
+        started = time.perf_counter()
+        for i in range(int(rate * seconds)):
+            scheduled = started + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            route = traffic.rng.choices(routes, weights)[0]
+            pending.append(asyncio.create_task(fire(route, i, scheduled, traffic.rng.choice(sessions))))
+        await asyncio.gather(*pending)
+        elapsed = time.perf_counter() - started
+        pool = await household_pool_metrics(client)
+
+    report = {}
+    for route in routes:
+        samples = latencies.get(route, [])
+        errors = sum(n for status, n in statuses[route].items() if not status.startswith(("2", "3")))
+        report[route] = _summary(samples, errors)
+        report[route]["statuses"] = dict(statuses[route])
+    everything = [s for samples in latencies.values() for s in samples]
+    total_errors = sum(r["errors"] for r in report.values())
+    result = {"elapsed_s": round(elapsed, 3), "achieved_rps": round(len(everything) / elapsed, 2),
+              "overall": _summary(everything, total_errors), "routes": report}
+    if pool:
+        result["household_pool"] = pool
+    return result
+
+
+def _summary(samples: list[float], errors: int) -> dict:
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+    }
+
+
+def _parse_mix(text: str) -> dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        route, _, weight = part.partition("=")
+        mix[route.strip()] = int(weight or 1)
+    unknown = set(mix) - set(DEFAULT_MIX)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown routes: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX, help="route=weight,...")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument("--years", type=int, default=2, help="years of synthetic history to seed")
+    parser.add_argument("--households", type=int, default=0,
+                        help="household databases to seed and spread requests over; 0 = single tenancy")
+    parser.add_argument("--pool-size", type=int, default=64, help="HOUSEHOLD_POOL_SIZE for --households")
+    parser.add_argument("--import-rows", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write JSON results here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.households:
+            # Cheap hashes: logging in hundreds of households would otherwise dominate the run
+            env = {"TENANCY_MODE": "household", "HOUSEHOLD_DB_DIR": f"{workdir}/households",
+                   "HOUSEHOLD_POOL_SIZE": str(args.pool_size), "BCRYPT_ROUNDS": "4"}
+            seed_command = ["households", "--dir", f"{workdir}/households", "--count", str(args.households)]
+            credentials = [(household_name(i)[0], "changeme") for i in range(args.households)]
+        else:
+            env, seed_command, credentials = {}, ["db"], [("admin", "changeme")]
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.synthetic", *seed_command, "--url", f"sqlite:///{workdir}/bench.db",
+             "--years", str(args.years), "--seed", str(args.seed)],
+            cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL, env={**os.environ, **env},
+        )
+        port = free_port()
+        server = start_server(args.workers, port, workdir, METRICS_TOKEN=METRICS_TOKEN, **env)
+        try:
+            traffic = Traffic(workdir, args.import_rows, args.seed)
+            result = asyncio.run(run_load(
+                f"http://127.0.0.1:{port}", traffic, args.mix, args.rate, args.seconds,
+                args.max_in_flight, credentials,
+            ))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    result["config"] = {
+        "rate": args.rate, "seconds": args.seconds, "mix": args.mix, "workers": args.workers,
+        "years": args.years, "import_rows": args.import_rows, "seed": args.seed,
+        "households": args.households, "pool_size": args.pool_size if args.households else None,
+        "commit": _git_commit(), "cpus": os.cpu_count(),
+        "finished_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+    print(f"target {args.rate:.0f} req/s, achieved {result['achieved_rps']} req/s over {result['elapsed_s']}s")
+    print(f"{'route':<14} {'count':>6} {'err %':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, r in [*result["routes"].items(), ("overall", result["overall"])]:
+        print(f"{route:<14} {r['count']:>6} {r['error_rate'] * 100:>6.1f} "
+              f"{r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f}")
+    if "household_pool" in result:
+        pool = result["household_pool"]
+        print(f"one worker's household pool: {pool.get('household_pool_open', 0):.0f} open, "
+              f"{pool.get('household_opens_total', 0):.0f} opens, {pool.get('household_closes_total', 0):.0f} closes")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Payload size and response time of row vs columnar JSON, with and without gzip.
+
+    cd backend && python -m benchmarks.payload_size --repeat 50
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+_workdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+os.environ.setdefault("UPLOAD_DIR", f"{_workdir}/uploads")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.database import SessionLocal  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.synthetic import seed_database  # noqa: E402
+
+ENDPOINTS = {
+    "calendar": "/api/plan/calendar",
+    "transactions": "/api/transactions?per_page=200",
+}
+
+
+def measure(client: TestClient, url: str, encoding: str, repeat: int) -> tuple[int, float]:
+    """Bytes on the wire and median response time in ms."""
+    headers = {"Accept-Encoding": encoding}
+    size = client.get(url, headers=headers).num_bytes_downloaded
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(url, headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+    return size, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    with TestClient(app) as client:
+        with SessionLocal() as db:
+            seed_database(db, args.years)
+        client.post("/api/auth/login", json={"username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD})
+
+        print(f"{'endpoint':<14} {'format':<9} {'encoding':<9} {'bytes':>9} {'vs rows':>8} {'median ms':>10}")
+        for name, url in ENDPOINTS.items():
+            baseline = None
+            for fmt in ("rows", "columnar"):
+                for encoding in ("identity", "gzip"):
+                    sep = "&" if "?" in url else "?"
+                    size, median = measure(client, f"{url}{sep}format={fmt}", encoding, args.repeat)
+                    baseline = baseline or size
+                    print(f"{name:<14} {fmt:<9} {encoding:<9} {size:>9} {size / baseline:>8.0%} {median:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Query budget per endpoint, checked with the SQL profiler against a fresh database.
+
+Exits non-zero if any endpoint issues more queries than its budget. Needs httpx.
+
+    cd backend && python -m benchmarks.query_counts
+"""
+from __future__ import annotations
+import os
+import sys
+import tempfile
+
+_workdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/bench.db")
+os.environ.setdefault("UPLOAD_DIR", f"{_workdir}/uploads")
+os.environ.setdefault("METRICS_TOKEN", "query-counts")  # the profiling header is only honored with it
+
+from fastapi.testclient import TestClient  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils.sql_profiler import assert_max_queries  # noqa: E402
+
+# Authenticated requests include the user lookup on a cold token cache
+BUDGETS = {
+    "/api/dashboard": 9,
+    "/api/loans": 2,
+    "/api/loans/summary": 2,
+    "/api/loans/projections": 2,
+    "/api/loans/strategies": 2,
+    "/api/loans/timeline": 3,
+    "/api/transactions": 4,
+    "/api/transactions/sources": 2,
+    "/api/budget": 3,
+    "/api/plan/calendar": 4,
+    "/api/imports/history": 2,
+}
+
+
+def main():
+    settings = get_settings()
+    failures = []
+    with TestClient(app) as client:
+        client.post("/api/auth/login", json={"username": settings.ADMIN_USERNAME, "password": settings.ADMIN_PASSWORD})
+        for path, budget in BUDGETS.items():
+            try:
+                response = assert_max_queries(client, path, budget)
+                print(f"{path:<28} {response.headers['x-sql-queries']:>3} / {budget}")
+            except AssertionError as e:
+                failures.append(str(e))
+                print(f"{path:<28} FAIL  {e}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
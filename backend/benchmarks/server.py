@@ -0,0 +1,51 @@
+"""Helpers for benchmarks that drive a real gunicorn server over HTTP."""
+from __future__ import annotations
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+def start_server(workers: int, port: int, workdir: str, **env_overrides: str) -> subprocess.Popen:
+    """gunicorn on 127.0.0.1:`port` with its database and uploads under `workdir`."""
+    env = {
+        **os.environ,
+        "WORKERS": str(workers),
+        "BIND": f"127.0.0.1:{port}",
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "UPLOAD_DIR": f"{workdir}/uploads",
+        **env_overrides,
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", str(BACKEND_DIR / "gunicorn.conf.py"), "app.main:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
@@ -0,0 +1,108 @@
+"""Read latency while an import is writing, default vs tuned SQLite engine profile.
+
+    cd backend && python -m benchmarks.sqlite_read_latency --seconds 5
+"""
+from __future__ import annotations
+import argparse
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from sqlalchemy import insert, text
+from app.database import Base, create_db_engine, sqlite_pragmas
+from app.models import Transaction, TransactionSource
+
+READ_QUERY = text(
+    "SELECT SUM(amount) FROM transactions "
+    "WHERE transaction_date >= :start AND is_debit = 1 AND is_excluded = 0"
+)
+
+
+def _rows(count: int, start: date, batch: str) -> list[dict]:
+    rng = random.Random(batch)
+    return [
+        {
+            "source_id": 1,
+            "transaction_date": start + timedelta(days=rng.randrange(720)),
+            "description": f"MERCHANT {rng.randrange(500)}",
+            "merchant": f"MERCHANT {rng.randrange(500)}",
+            "category": rng.choice(["Groceries", "Dining", "Shopping", "Utilities"]),
+            "amount": round(rng.uniform(1, 400), 2),
+            "is_debit": True,
+            "is_excluded": False,
+            "import_batch_id": batch,
+        }
+        for _ in range(count)
+    ]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+def run_profile(name: str, tuned: bool, seed_rows: int, batch_rows: int, seconds: float) -> dict:
+    url = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    write_engine = create_db_engine(url, sqlite_pragmas() if tuned else None)
+    read_engine = create_db_engine(url, sqlite_pragmas(readonly=True)) if tuned else write_engine
+    Base.metadata.create_all(write_engine)
+
+    start = date(2025, 1, 1)
+    with write_engine.begin() as conn:
+        conn.execute(insert(TransactionSource), [{"name": "Bench", "type": "checking"}])
+        conn.execute(insert(Transaction), _rows(seed_rows, start, "seed"))
+
+    stop = threading.Event()
+    batches = [0]
+
+    def writer():
+        while not stop.is_set():
+            with write_engine.begin() as conn:
+                conn.execute(insert(Transaction), _rows(batch_rows, start, f"b{batches[0]}"))
+            batches[0] += 1
+
+    latencies, errors = [], 0
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            with read_engine.connect() as conn:
+                conn.execute(READ_QUERY, {"start": start + timedelta(days=360)}).scalar()
+            latencies.append((time.perf_counter() - t0) * 1000)
+        except Exception:
+            errors += 1
+    stop.set()
+    thread.join()
+    write_engine.dispose()
+    read_engine.dispose()
+
+    return {
+        "profile": name,
+        "reads": len(latencies),
+        "errors": errors,
+        "import_batches": batches[0],
+        "p50_ms": round(statistics.median(latencies), 3) if latencies else None,
+        "p95_ms": round(_percentile(latencies, 0.95), 3),
+        "p99_ms": round(_percentile(latencies, 0.99), 3),
+        "max_ms": round(max(latencies), 3) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed-rows", type=int, default=50000)
+    parser.add_argument("--batch-rows", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    for name, tuned in (("default", False), ("tuned", True)):
+        result = run_profile(name, tuned, args.seed_rows, args.batch_rows, args.seconds)
+        print("  ".join(f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
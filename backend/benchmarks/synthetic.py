@@ -0,0 +1,292 @@
+"""Deterministic synthetic data: CSV exports in every supported format and pre-populated databases.
+
+    cd backend && python -m benchmarks.synthetic csv --rows 5000 --out /tmp/csv
+    cd backend && python -m benchmarks.synthetic db --years 3 --url sqlite:////tmp/bench.db
+    cd backend && python -m benchmarks.synthetic households --count 100 --years 1 \
+        --url sqlite:////tmp/users.db --dir /tmp/households
+"""
+from __future__ import annotations
+import argparse
+import csv
+import hashlib
+import os
+import random
+from datetime import date, timedelta
+
+FORMATS = ("amex", "apple_card", "checking_1569", "credit_card_6032")
+
+# Filenames carry the account digits so detection can tell Checking 1569 and Credit Card 6032 apart
+SOURCE_NAMES = {
+    "amex": "AMEX",
+    "apple_card": "Apple Card",
+    "checking_1569": "Checking 1569",
+    "credit_card_6032": "Credit Card 6032",
+}
+
+MERCHANTS = [
+    ("KROGER #{n}", "Groceries", 20, 220),
+    ("WHOLE FOODS MARKET", "Groceries", 15, 180),
+    ("COSTCO WHSE #{n}", "Groceries", 60, 400),
+    ("SHELL OIL {n}", "Transportation", 25, 80),
+    ("UBER TRIP", "Transportation", 8, 60),
+    ("CHIPOTLE {n}", "Dining", 9, 45),
+    ("STARBUCKS STORE {n}", "Dining", 4, 18),
+    ("AMAZON MKTPL", "Shopping", 8, 250),
+    ("TARGET {n}", "Shopping", 10, 200),
+    ("DUKE ENERGY", "Utilities", 90, 260),
+    ("SPECTRUM", "Utilities", 60, 130),
+    ("CVS/PHARMACY #{n}", "Health", 6, 90),
+    ("NETFLIX.COM", "Entertainment", 15, 23),
+    ("STATE FARM INSURANCE", "Insurance", 120, 310),
+]
+
+AMEX_CATEGORIES = {
+    "Groceries": "Merchandise & Supplies-Groceries",
+    "Transportation": "Transportation-Fuel",
+    "Dining": "Restaurant-Restaurant",
+    "Shopping": "Merchandise & Supplies-Internet Purchase",
+    "Utilities": "Business Services-Utilities",
+    "Health": "Business Services-Health Care Services",
+    "Entertainment": "Entertainment-Associations",
+    "Insurance": "Business Services-Insurance Services",
+}
+APPLE_CATEGORIES = {
+    "Groceries": "Grocery",
+    "Dining": "Restaurants",
+    "Shopping": "Shopping",
+    "Transportation": "Transportation",
+    "Utilities": "Utilities",
+    "Health": "Health",
+    "Entertainment": "Entertainment",
+    "Insurance": "Insurance",
+}
+CHECKING_BILLS = [
+    ("P&G PAYROLL", "ELECTRONIC DEPOSIT", 4800.0),
+    ("HEARTLAND MORTGAGE", "DEBIT", -2150.0),
+    ("SANTANDER CONSUMER  AUTOPAY", "DEBIT", -550.0),
+    ("LIGHTSTREAM LOAN", "DEBIT", -410.0),
+    ("AMEX EPAYMENT", "DEBIT", -1500.0),
+    ("APPLE CARD GSBANK PAYMENT", "DEBIT", -900.0),
+]
+
+
+def _purchases(rows: int, start: date, rng: random.Random, span_days: int = 365):
+    """`rows` purchases spread evenly over `span_days` from `start`, oldest first."""
+    for i in range(rows):
+        name, category, low, high = rng.choice(MERCHANTS)
+        day = start + timedelta(days=i * span_days // max(rows, 1))
+        yield day, name.format(n=rng.randrange(100, 999)), category, round(rng.uniform(low, high), 2), i
+
+
+def _write(path: str, header: list[str], rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def generate_csv(fmt: str, path: str, rows: int, start: date = date(2026, 2, 2), seed: int = 0) -> str:
+    """Write `rows` transactions in the given export format; same arguments give the same file."""
+    rng = random.Random(f"{fmt}:{seed}")
+    us = "%m/%d/%Y"
+    if fmt == "amex":
+        _write(path, ["Date", "Description", "Card Member", "Amount", "Extended Details", "Address",
+                      "City/State", "Zip Code", "Country", "Reference", "Category"], (
+            [d.strftime(us), name, "PAT DOE", f"{amount:.2f}", f"{name} ORDER", "1 MAIN ST",
+             "CINCINNATI OH", "45202", "UNITED STATES", f"'{seed:04d}{i:010d}'", AMEX_CATEGORIES.get(cat, "Other")]
+            for d, name, cat, amount, i in _purchases(rows, start, rng)
+        ))
+    elif fmt == "apple_card":
+        _write(path, ["Transaction Date", "Clearing Date", "Description", "Merchant", "Category",
+                      "Type", "Amount (USD)", "Purchased By"], (
+            [d.strftime(us), (d + timedelta(days=1)).strftime(us), f"{name} {seed}-{i}", name.title(),
+             APPLE_CATEGORIES.get(cat, "Other"), "Purchase", f"{amount:.2f}", "Pat Doe"]
+            for d, name, cat, amount, i in _purchases(rows, start, rng)
+        ))
+    elif fmt == "credit_card_6032":
+        _write(path, ["Date", "Transaction", "Name", "Memo", "Amount"], (
+            [d.strftime(us), "DEBIT", f"{name} {seed}-{i}", f"REF {i}", f"{-amount:.2f}"]
+            for d, name, cat, amount, i in _purchases(rows, start, rng)
+        ))
+    elif fmt == "checking_1569":
+        def checking_rows():
+            for d, name, cat, amount, i in _purchases(rows, start, rng):
+                if i % 10 == 0:
+                    bill, kind, bill_amount = CHECKING_BILLS[(i // 10) % len(CHECKING_BILLS)]
+                    yield [d.strftime(us), kind, bill, f"REF {seed}-{i}", f"{bill_amount:.2f}"]
+                else:
+                    yield [d.strftime(us), "DEBIT", f"{name} {seed}-{i}", "", f"{-amount:.2f}"]
+        _write(path, ["Date", "Transaction", "Name", "Memo", "Amount"], checking_rows())
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    return path
+
+
+def generate_all(directory: str, rows: int, seed: int = 0) -> dict[str, str]:
+    os.makedirs(directory, exist_ok=True)
+    return {
+        fmt: generate_csv(fmt, os.path.join(directory, f"{fmt}_{seed}_{rows}.csv"), rows, seed=seed)
+        for fmt in FORMATS
+    }
+
+
+def seed_database(db, years: int, per_month: int = 400, loans: int = 12, seed: int = 0, start: date = date(2026, 2, 2)):
+    """Bulk-load `years` of transactions across the CSV sources, plus `loans` active loans.
+
+    `db` is a Session on a migrated database; projections and ledgers are rebuilt at the end.
+    """
+    from sqlalchemy import insert
+    from app.models import Loan, Transaction, TransactionSource
+    from app.services.ledger import LedgerService
+    from app.services.loan_projection import regenerate_missing
+    from app.services.plan_calendar import PlanCalendar
+    from app.utils.money import to_cents
+
+    rng = random.Random(f"db:{seed}")
+    calendar = PlanCalendar.load(db)
+    source_ids = []
+    for fmt in FORMATS:
+        name = SOURCE_NAMES[fmt]
+        source = db.query(TransactionSource).filter(TransactionSource.name == name).first()
+        if source is None:
+            source = TransactionSource(name=name, type="checking" if fmt == "checking_1569" else "credit_card")
+            db.add(source)
+            db.flush()
+        source_ids.append(source.id)
+
+    rows = []
+    days = years * 365
+    for i in range(years * 12 * per_month):
+        name, category, low, high = rng.choice(MERCHANTS)
+        source_id = rng.choice(source_ids)
+        day = start + timedelta(days=rng.randrange(days))
+        amount = round(rng.uniform(low, high), 2)
+        rows.append({
+            "source_id": source_id,
+            "transaction_date": day,
+            "description": name.format(n=rng.randrange(100, 999)),
+            "merchant": name.split(" #")[0],
+            "category": category,
+            "transaction_type": "debit",
+            "amount": to_cents(amount),
+            "is_debit": True,
+            "is_excluded": False,
+            "import_batch_id": f"synthetic-{seed}",
+            "dedup_hash": hashlib.md5(f"{seed}|{i}".encode()).hexdigest(),
+            **calendar.period_keys(day),
+        })
+    for chunk in range(0, len(rows), 5000):
+        db.execute(insert(Transaction), rows[chunk:chunk + 5000])
+
+    loan_types = ["auto", "personal", "bnpl", "credit_card"]
+    for i in range(loans):
+        balance = round(rng.uniform(500, 40000), 2)
+        rate = round(rng.uniform(0, 0.28), 4)
+        db.add(Loan(
+            name=f"Synthetic Loan {i + 1}",
+            loan_type=loan_types[i % len(loan_types)],
+            creditor=f"LENDER{i + 1} FINANCE",
+            original_amount=to_cents(balance * 1.3),
+            current_balance=to_cents(balance),
+            interest_rate=rate,
+            monthly_payment=to_cents(round(max(balance * (rate / 12) * 1.5, balance / 60, 25), 2)),
+            payment_day=1 + i * 2 % 28,
+            start_date=start,
+            is_active=True,
+            priority_rank=i + 1,
+        ))
+    db.flush()
+    regenerate_missing(db)
+    for source_id in source_ids:
+        LedgerService(db).rebuild(source_id)
+    db.commit()
+
+
+def household_name(i: int) -> tuple[str, str]:
+    """(username, household) of the i-th synthetic household's login."""
+    return f"household{i:04d}", f"h{i:04d}"
+
+
+def seed_households(directory_url: str, household_dir: str, count: int, password: str, **seed_args):
+    """One login per household in the users database at `directory_url`, each with its own seeded database.
+
+    Mirrors TENANCY_MODE=household with HOUSEHOLD_DB_DIR=`household_dir`.
+    """
+    from sqlalchemy.orm import Session
+    from app.database import create_db_engine, sqlite_pragmas
+    from app.migrations.runner import run_migrations
+    from app.migrations.versions import MIGRATIONS
+    from app.models import User
+    from app.utils.security import hash_password
+
+    os.makedirs(household_dir, exist_ok=True)
+    engine = create_db_engine(directory_url, sqlite_pragmas())
+    run_migrations(engine, MIGRATIONS)
+    password_hash = hash_password(password)  # one bcrypt for every login
+    with Session(engine) as db:
+        existing = {name for (name,) in db.query(User.username)}
+        for i in range(count):
+            username, household = household_name(i)
+            if username not in existing:
+                db.add(User(username=username, password_hash=password_hash, household=household))
+        db.commit()
+    engine.dispose()
+
+    seed = seed_args.pop("seed", 0)
+    for i in range(count):
+        household_engine = create_db_engine(f"sqlite:///{household_dir}/{household_name(i)[1]}.db", sqlite_pragmas())
+        run_migrations(household_engine, MIGRATIONS)
+        with Session(household_engine) as db:
+            seed_database(db, seed=seed + i, **seed_args)
+        household_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    csv_cmd = sub.add_parser("csv")
+    csv_cmd.add_argument("--format", choices=FORMATS + ("all",), default="all")
+    csv_cmd.add_argument("--rows", type=int, default=1000)
+    csv_cmd.add_argument("--seed", type=int, default=0)
+    csv_cmd.add_argument("--out", default=".")
+    db_cmd = sub.add_parser("db")
+    db_cmd.add_argument("--url", required=True)
+    db_cmd.add_argument("--years", type=int, default=3)
+    db_cmd.add_argument("--per-month", type=int, default=400)
+    db_cmd.add_argument("--loans", type=int, default=12)
+    db_cmd.add_argument("--seed", type=int, default=0)
+    households_cmd = sub.add_parser("households")
+    households_cmd.add_argument("--url", required=True, help="users database")
+    households_cmd.add_argument("--dir", required=True, help="household databases")
+    households_cmd.add_argument("--count", type=int, default=10)
+    households_cmd.add_argument("--password", default="changeme")
+    households_cmd.add_argument("--years", type=int, default=1)
+    households_cmd.add_argument("--per-month", type=int, default=400)
+    households_cmd.add_argument("--loans", type=int, default=12)
+    households_cmd.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "csv":
+        formats = FORMATS if args.format == "all" else (args.format,)
+        os.makedirs(args.out, exist_ok=True)
+        for fmt in formats:
+            print(generate_csv(fmt, os.path.join(args.out, f"{fmt}_{args.seed}_{args.rows}.csv"), args.rows, seed=args.seed))
+    elif args.command == "households":
+        seed_households(args.url, args.dir, args.count, args.password, years=args.years,
+                        per_month=args.per_month, loans=args.loans, seed=args.seed)
+        print(f"Seeded {args.count} households of {args.years * 12 * args.per_month} transactions into {args.dir}")
+    else:
+        from sqlalchemy.orm import Session
+        from app.database import create_db_engine, sqlite_pragmas
+        from app.migrations.runner import run_migrations
+        from app.migrations.versions import MIGRATIONS
+
+        engine = create_db_engine(args.url, sqlite_pragmas())
+        run_migrations(engine, MIGRATIONS)
+        with Session(engine) as db:
+            seed_database(db, args.years, args.per_month, args.loans, args.seed)
+        print(f"Seeded {args.years * 12 * args.per_month} transactions and {args.loans} loans into {args.url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Upgrade check: a database from before versioned migrations must end up like a fresh one.
+
+Builds a database with the original schema and a few rows in dollars, runs the
+migrations over it and over an empty file, and compares both with the schema
+app.models declares (columns, indexes, foreign keys) and the upgraded rows with
+their expected values. Exits non-zero on any difference.
+
+    cd backend && python -m benchmarks.upgrade_check
+"""
+from __future__ import annotations
+import os
+import sqlite3
+import sys
+import tempfile
+
+_workdir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_workdir}/app.db")
+
+from sqlalchemy import create_engine  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.migrations.runner import run_migrations  # noqa: E402
+from app.migrations.versions import MIGRATIONS  # noqa: E402
+import app.models  # noqa: E402,F401 — registers every table on Base
+
+# What the first release's init_db created with Base.metadata.create_all
+BASELINE_SCHEMA = """
+CREATE TABLE budget_targets (id INTEGER NOT NULL, phase_number INTEGER NOT NULL, category VARCHAR NOT NULL,
+    monthly_target FLOAT NOT NULL, is_fixed BOOLEAN, notes TEXT, PRIMARY KEY (id));
+CREATE TABLE categories (id INTEGER NOT NULL, name VARCHAR NOT NULL, parent_category VARCHAR, budget_category
+    VARCHAR, color_code VARCHAR, is_discretionary BOOLEAN, is_essential BOOLEAN, PRIMARY KEY (id), UNIQUE
+    (name));
+CREATE TABLE category_mappings (id INTEGER NOT NULL, merchant_pattern VARCHAR NOT NULL, source_category
+    VARCHAR, mapped_category VARCHAR NOT NULL, PRIMARY KEY (id));
+CREATE TABLE financial_plan (id INTEGER NOT NULL, plan_name VARCHAR NOT NULL, start_date DATE NOT NULL,
+    end_date DATE NOT NULL, total_weeks INTEGER NOT NULL, total_months INTEGER NOT NULL, is_active BOOLEAN,
+    created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), PRIMARY KEY (id));
+CREATE TABLE import_batches (id INTEGER NOT NULL, batch_id VARCHAR NOT NULL, source_id INTEGER NOT NULL,
+    filename VARCHAR NOT NULL, file_hash VARCHAR, rows_imported INTEGER, rows_skipped INTEGER,
+    date_range_start DATE, date_range_end DATE, imported_at DATETIME DEFAULT (CURRENT_TIMESTAMP), notes TEXT,
+    PRIMARY KEY (id), UNIQUE (batch_id), FOREIGN KEY(source_id) REFERENCES transaction_sources (id));
+CREATE TABLE loan_payments (id INTEGER NOT NULL, loan_id INTEGER NOT NULL, payment_date DATE NOT NULL, amount
+    FLOAT NOT NULL, principal_amount FLOAT, interest_amount FLOAT, balance_after FLOAT, transaction_id
+    INTEGER, is_projected BOOLEAN, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), PRIMARY KEY (id), FOREIGN
+    KEY(loan_id) REFERENCES loans (id), FOREIGN KEY(transaction_id) REFERENCES transactions (id));
+CREATE TABLE loans (id INTEGER NOT NULL, name VARCHAR NOT NULL, loan_type VARCHAR NOT NULL, creditor VARCHAR,
+    original_amount FLOAT, current_balance FLOAT NOT NULL, interest_rate FLOAT, monthly_payment FLOAT,
+    payment_day INTEGER, start_date DATE, end_date DATE, payments_remaining INTEGER, is_active BOOLEAN,
+    priority_rank INTEGER, notes TEXT, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), PRIMARY KEY (id));
+CREATE TABLE milestones (id INTEGER NOT NULL, phase_number INTEGER, name VARCHAR NOT NULL, description TEXT,
+    target_date DATE, target_amount FLOAT, actual_date DATE, actual_amount FLOAT, is_achieved BOOLEAN, PRIMARY
+    KEY (id));
+CREATE TABLE monthly_snapshots (id INTEGER NOT NULL, plan_id INTEGER NOT NULL, month_number INTEGER NOT NULL,
+    month_date DATE NOT NULL, phase_number INTEGER NOT NULL, monthly_income FLOAT, total_spent FLOAT,
+    fixed_expenses FLOAT, discretionary_spent FLOAT, total_debt_start FLOAT, total_debt_end FLOAT,
+    debt_paid_this_month FLOAT, interest_paid FLOAT, emergency_fund FLOAT, budget_target FLOAT,
+    budget_variance FLOAT, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), PRIMARY KEY (id), FOREIGN
+    KEY(plan_id) REFERENCES financial_plan (id));
+CREATE TABLE plan_phases (id INTEGER NOT NULL, plan_id INTEGER NOT NULL, phase_number INTEGER NOT NULL, name
+    VARCHAR NOT NULL, start_month INTEGER NOT NULL, end_month INTEGER NOT NULL, start_week INTEGER NOT NULL,
+    end_week INTEGER NOT NULL, color_code VARCHAR, primary_goal VARCHAR, description TEXT, PRIMARY KEY (id),
+    FOREIGN KEY(plan_id) REFERENCES financial_plan (id));
+CREATE TABLE transaction_sources (id INTEGER NOT NULL, name VARCHAR NOT NULL, type VARCHAR NOT NULL, last_four
+    VARCHAR, institution VARCHAR, active BOOLEAN, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP), PRIMARY KEY
+    (id));
+CREATE TABLE transactions (id INTEGER NOT NULL, source_id INTEGER NOT NULL, transaction_date DATE NOT NULL,
+    clearing_date DATE, description VARCHAR NOT NULL, merchant VARCHAR, category VARCHAR, original_category
+    VARCHAR, transaction_type VARCHAR, amount FLOAT NOT NULL, is_debit BOOLEAN NOT NULL, memo TEXT,
+    extended_details TEXT, address VARCHAR, city_state VARCHAR, zip_code VARCHAR, country VARCHAR,
+    reference_number VARCHAR, card_member VARCHAR, purchased_by VARCHAR, import_batch_id VARCHAR, dedup_hash
+    VARCHAR, user_notes TEXT, is_excluded BOOLEAN, imported_at DATETIME DEFAULT (CURRENT_TIMESTAMP), PRIMARY
+    KEY (id), FOREIGN KEY(source_id) REFERENCES transaction_sources (id));
+CREATE INDEX ix_transactions_category ON transactions (category);
+CREATE INDEX ix_transactions_dedup_hash ON transactions (dedup_hash);
+CREATE INDEX ix_transactions_import_batch_id ON transactions (import_batch_id);
+CREATE INDEX ix_transactions_merchant ON transactions (merchant);
+CREATE INDEX ix_transactions_transaction_date ON transactions (transaction_date);
+CREATE TABLE users (id INTEGER NOT NULL, username VARCHAR NOT NULL, password_hash VARCHAR NOT NULL, created_at
+    DATETIME DEFAULT (CURRENT_TIMESTAMP), last_login DATETIME, PRIMARY KEY (id), UNIQUE (username));
+CREATE TABLE weekly_snapshots (id INTEGER NOT NULL, plan_id INTEGER NOT NULL, week_number INTEGER NOT NULL,
+    week_start_date DATE NOT NULL, week_end_date DATE NOT NULL, phase_number INTEGER NOT NULL, total_spent
+    FLOAT, discretionary_spent FLOAT, debt_paid_down FLOAT, emergency_fund_balance FLOAT,
+    weekly_spending_target FLOAT, is_on_track BOOLEAN, status VARCHAR, notes TEXT, created_at DATETIME DEFAULT
+    (CURRENT_TIMESTAMP), PRIMARY KEY (id), FOREIGN KEY(plan_id) REFERENCES financial_plan (id));
+CREATE INDEX ix_weekly_snapshots_week_number ON weekly_snapshots (week_number);
+"""
+
+
+def build_baseline(path: str):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.execute("INSERT INTO users (username, password_hash) VALUES (?, 'x')", (get_settings().ADMIN_USERNAME,))
+    conn.executemany(
+        "INSERT INTO transaction_sources (id, name, type, last_four, institution, active) VALUES (?, ?, ?, ?, ?, 1)",
+        [(1, "Checking", "checking", "XXXX", "Bank A"), (2, "Credit Card A", "credit_card", "XXXX", "Bank A")],
+    )
+    conn.executemany(
+        "INSERT INTO transactions (source_id, transaction_date, description, amount, is_debit, is_excluded) "
+        "VALUES (?, ?, ?, ?, ?, 0)",
+        [(1, "2025-12-30", "PAYROLL", 2500.00, 0), (1, "2026-03-01", "GROCER", 10.10, 1),
+         (1, "2026-03-01", "COFFEE", 0.20, 1), (2, "2026-03-05", "FUEL", 45.67, 1)],
+    )
+    conn.execute(
+        "INSERT INTO loans (id, name, loan_type, original_amount, current_balance, interest_rate, monthly_payment, "
+        "payment_day, is_active) VALUES (1, 'Car', 'auto', 20000.05, 12345.67, 0.0699, 432.10, 15, 1)"
+    )
+    conn.execute(
+        "INSERT INTO loan_payments (loan_id, payment_date, amount, is_projected) VALUES (1, '2026-02-15', 432.10, 0)"
+    )
+    conn.execute("INSERT INTO milestones (phase_number, name, target_amount) VALUES (1, 'Starter fund', 1000)")
+    conn.commit()
+    conn.close()
+
+
+def migrate(path: str) -> int:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        return run_migrations(engine, MIGRATIONS)
+    finally:
+        engine.dispose()
+
+
+def schema(path: str) -> dict:
+    """Per table: columns, indexes and foreign keys as SQLite reports them."""
+    conn = sqlite3.connect(path)
+    tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name != 'schema_version' AND name NOT LIKE 'sqlite_%'"
+    )]
+    result = {}
+    for table in tables:
+        columns = {tuple(r[1:]) for r in conn.execute(f"PRAGMA table_info({table})")}
+        indexes = set()
+        for _, name, unique, origin, _ in conn.execute(f"PRAGMA index_list({table})"):
+            index_columns = tuple(r[2] for r in conn.execute(f"PRAGMA index_info({name})"))
+            # Constraint-backed indexes get generated names that depend on creation order
+            indexes.add((name if origin == "c" else origin, unique, index_columns))
+        foreign_keys = {tuple(r[2:5]) for r in conn.execute(f"PRAGMA foreign_key_list({table})")}
+        result[table] = {"columns": columns, "indexes": indexes, "foreign keys": foreign_keys}
+    conn.close()
+    return result
+
+
+def schema_differences(actual: dict, expected: dict) -> list[str]:
+    problems = [f"missing table {t}" for t in expected.keys() - actual.keys()]
+    problems += [f"unexpected table {t}" for t in actual.keys() - expected.keys()]
+    for table in expected.keys() & actual.keys():
+        for kind, wanted in expected[table].items():
+            got = actual[table][kind]
+            problems += [f"{table}: missing {kind[:-1]} {item}" for item in sorted(wanted - got, key=str)]
+            problems += [f"{table}: unexpected {kind[:-1]} {item}" for item in sorted(got - wanted, key=str)]
+    return problems
+
+
+def value_differences(path: str) -> list[str]:
+    conn = sqlite3.connect(path)
+    checks = {
+        "one admin, no household": ("SELECT COUNT(*), COUNT(household) FROM users", (1, 0)),
+        "loan in cents": (
+            "SELECT original_amount, current_balance, monthly_payment FROM loans", (2000005, 1234567, 43210)),
+        "loan balance dated": ("SELECT balance_date IS NOT NULL FROM loans", (1,)),
+        "recorded payment in cents": ("SELECT amount FROM loan_payments WHERE is_projected = 0", (43210,)),
+        "projected schedule in cents": (
+            "SELECT COUNT(*) > 0, SUM(typeof(amount) != 'integer') FROM loan_payments WHERE is_projected = 1", (1, 0)),
+        "transactions in cents": ("SELECT SUM(amount), SUM(typeof(amount) != 'integer') FROM transactions", (255597, 0)),
+        "period keys stamped": ("SELECT COUNT(*) FROM transactions WHERE yyyymm IS NULL", (0,)),
+        "plan week of 2026-03-01": (
+            "SELECT DISTINCT plan_week, plan_month, phase_number, yyyymm FROM transactions "
+            "WHERE transaction_date = '2026-03-01'", (4, 2, 1, 202603)),
+        "checking ledger": (
+            "SELECT net_change, cumulative FROM source_daily_balances WHERE source_id = 1 "
+            "ORDER BY balance_date DESC LIMIT 1", (-1030, 248970)),
+        "card ledger": ("SELECT net_change, cumulative FROM source_daily_balances WHERE source_id = 2", (-4567, -4567)),
+        "existing milestones kept, in cents": ("SELECT COUNT(*), MAX(target_amount) FROM milestones", (1, 100000)),
+        "plan seeded": ("SELECT COUNT(*) FROM weekly_snapshots", (252,)),
+        "sources not duplicated": ("SELECT COUNT(*) FROM transaction_sources", (4,)),
+    }
+    problems = []
+    for name, (query, expected) in checks.items():
+        got = conn.execute(query).fetchone()
+        if got != expected:
+            problems.append(f"{name}: got {got}, expected {expected}")
+    conn.close()
+    return problems
+
+
+def main():
+    expected_path, fresh_path, upgraded_path = (os.path.join(_workdir, f"{n}.db") for n in ("expected", "fresh", "upgraded"))
+    engine = create_engine(f"sqlite:///{expected_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    expected = schema(expected_path)
+
+    build_baseline(upgraded_path)
+    results = {}
+    for name, path in (("fresh", fresh_path), ("upgraded", upgraded_path)):
+        migrate(path)
+        problems = schema_differences(schema(path), expected)
+        if migrate(path):
+            problems.append("a second run applied migrations again")
+        results[name] = problems
+    results["upgraded rows"] = value_differences(upgraded_path)
+
+    for name, problems in results.items():
+        print(f"{name:<16} {'ok' if not problems else 'FAIL'}")
+        for problem in problems:
+            print(f"    {problem}")
+    sys.exit(1 if any(results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
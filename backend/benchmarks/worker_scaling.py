@@ -0,0 +1,83 @@
+"""Request throughput of the gunicorn deployment at 1, 2 and 4 workers.
+
+Starts gunicorn against a fresh database for each worker count, logs in once
+and drives a fixed mix of read endpoints with concurrent clients. Needs httpx.
+
+    cd backend && python -m benchmarks.worker_scaling --workers 1 2 4 --seconds 10
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+import signal
+import tempfile
+import time
+import httpx
+from benchmarks.server import free_port, percentile, start_server, wait_ready
+
+PATHS = [
+    "/api/dashboard",
+    "/api/loans",
+    "/api/loans/strategies",
+    "/api/transactions?per_page=50",
+    "/api/plan/calendar",
+]
+
+
+async def drive(base_url: str, seconds: float, concurrency: int) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        await wait_ready(client)
+        login = await client.post("/api/auth/login", json={"username": "admin", "password": "changeme"})
+        login.raise_for_status()
+
+        latencies: list[float] = []
+        errors = 0
+        deadline = time.monotonic() + seconds
+
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.get(PATHS[i % len(PATHS)])
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code >= 400
+                i += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.concurrency} concurrent clients, {args.seconds:.0f}s per run")
+    print(f"{'workers':>8} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for workers in args.workers:
+        port = free_port()
+        with tempfile.TemporaryDirectory() as workdir:
+            server = start_server(workers, port, workdir)
+            try:
+                result = asyncio.run(drive(f"http://127.0.0.1:{port}", args.seconds, args.concurrency))
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=30)
+        print(f"{workers:>8} {result['requests']:>9} {result['rps']:>8.1f} "
+              f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Multi-worker deployment: several uvicorn workers sharing the SQLite database.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Set WORKERS in .env to choose the process count.
+"""
+import os
+from app.config import get_settings
+
+settings = get_settings()
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = settings.WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 120  # CSV imports run inside the request
+graceful_timeout = 30
+keepalive = 5
+# Client addresses (used by the login throttle) come from nginx's X-Forwarded-For, not the bridge gateway
+forwarded_allow_ips = settings.FORWARDED_ALLOW_IPS
+
+
+def on_starting(server):
+    # Migrate once in the master so workers don't race for the schema on boot
+    from app.database import engine
+    from app.seed.init_db import init_database
+
+    os.makedirs("data", exist_ok=True)
+    init_database()
+    # Workers are forked from this process and must not inherit its open SQLite handles
+    engine.dispose()